@@ -1,6 +1,8 @@
 from __future__ import absolute_import, unicode_literals
 import os
+import logging
 from celery import Celery
+from celery.signals import beat_init, worker_init
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blackbox.settings')
@@ -17,6 +19,38 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+logger = logging.getLogger(__name__)
+
+
+def check_shared_cache(**kwargs):
+    """
+    Refuse to start a worker or beat on a per-process cache.
+
+    Version bumps, locks, matcher invalidation and metrics all go through the
+    cache; on ``locmem`` they never reach the web processes or other workers.
+    Set ``CELERY_REQUIRE_SHARED_CACHE=False`` to only warn, e.g. for a solo
+    local worker.
+
+    Raises:
+        ImproperlyConfigured: If the default cache is process-local
+    """
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+
+    backend = settings.CACHES['default']['BACKEND']
+    if not backend.endswith(('LocMemCache', 'DummyCache')):
+        return
+    message = (f"Celery is running on the process-local cache {backend}; set CACHE_URL "
+               f"(e.g. redis://redis:6379/1) to the cache the web processes use")
+    if settings.CELERY_REQUIRE_SHARED_CACHE:
+        raise ImproperlyConfigured(message)
+    logger.warning(message)
+
+
+worker_init.connect(check_shared_cache)
+beat_init.connect(check_shared_cache)
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
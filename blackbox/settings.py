@@ -41,6 +41,15 @@ GEMINI_API_KEYS = [value for _, value in GEMINI_API_KEYS]
 # For backward compatibility if needed
 GEMINI_API_KEY = GEMINI_API_KEYS[0] if GEMINI_API_KEYS else None
 
+# Override the Gemini API endpoint, e.g. to point at the local stand-in
+# started with `python manage.py run_gemini_stub` for load testing.
+GEMINI_BASE_URL = env('GEMINI_BASE_URL', default=None)
+
+# Model used for news analysis, e.g. gemini-2.5-flash or gemini-3-pro-preview.
+# Changing it (or the prompt version) makes finished analyses eligible for
+# re-analysis the next time they are searched.
+GEMINI_MODEL = env('GEMINI_MODEL', default='gemini-flash-lite-latest')
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -167,6 +176,116 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Kolkata'
+# Enable task priorities on the Redis broker (0 = highest, 9 = lowest)
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+# Browser-based content extraction runs on its own queue and workers
+CELERY_TASK_ROUTES = {
+    'news_analyser.tasks.browser_extract_content_task': {'queue': 'content'},
+}
+# Browser contexts kept open per content worker process; run the content
+# worker with --pool=threads and a matching --concurrency
+CONTENT_BROWSER_POOL_SIZE = env.int('CONTENT_BROWSER_POOL_SIZE', default=3)
+CONTENT_EXTRACTION_TIMEOUT = env.int('CONTENT_EXTRACTION_TIMEOUT', default=180)
+# Plain-HTTP extraction, tried before the browser agent
+CONTENT_FETCH_TIMEOUT = env.int('CONTENT_FETCH_TIMEOUT', default=10)
+CONTENT_MIN_CHARS = env.int('CONTENT_MIN_CHARS', default=400)
+# Per-host politeness for publisher fetches, shared through the cache
+POLITE_HOST_CONCURRENCY = env.int('POLITE_HOST_CONCURRENCY', default=2)
+POLITE_MIN_DELAY = env.float('POLITE_MIN_DELAY', default=1.0)
+POLITE_MAX_CRAWL_DELAY = env.float('POLITE_MAX_CRAWL_DELAY', default=30.0)
+POLITE_MAX_WAIT = env.float('POLITE_MAX_WAIT', default=10.0)
+POLITE_BACKOFF_BASE = env.int('POLITE_BACKOFF_BASE', default=30)
+POLITE_BACKOFF_MAX = env.int('POLITE_BACKOFF_MAX', default=900)
+POLITE_ROBOTS_TTL = env.int('POLITE_ROBOTS_TTL', default=24 * 60 * 60)
+# Stored article pages and text, shared across fetches and re-analyses
+CONTENT_STORE_TTL_DAYS = env.int('CONTENT_STORE_TTL_DAYS', default=30)
+CONTENT_STORE_MAX_MB = env.int('CONTENT_STORE_MAX_MB', default=512)
+CELERY_BEAT_SCHEDULE = {
+    'evict-article-content': {
+        'task': 'news_analyser.tasks.evict_article_content',
+        'schedule': 6 * 60 * 60,
+    },
+}
+
+# Redis used for pub/sub push of search progress to the browser
+REDIS_URL = env('REDIS_URL', default=CELERY_BROKER_URL)
+
+# News relevance pre-filter
+# Articles scoring below the threshold against the finance lexicon and NSE
+# ticker list are marked as not market-relevant. They are either skipped
+# entirely or queued for analysis at the lowest priority.
+NSE_TICKER_CSV = env('NSE_TICKER_CSV', default=os.path.join(BASE_DIR, 'Ticker_List_NSE_India.csv'))
+RELEVANCE_THRESHOLD = env.float('RELEVANCE_THRESHOLD', default=1.0)
+RELEVANCE_SKIP_IRRELEVANT = env.bool('RELEVANCE_SKIP_IRRELEVANT', default=True)
+
+# Cache: Redis in production (e.g. CACHE_URL=redis://redis:6379/1), falling
+# back to per-process memory. Result data is cached per keyword and
+# invalidated by bumping a version when its news or analyses change.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+# Workers and beat refuse to start on the per-process fallback, since their
+# cache writes would never reach the web processes
+CELERY_REQUIRE_SHARED_CACHE = env.bool('CELERY_REQUIRE_SHARED_CACHE', default=True)
+RESULTS_CACHE_TIMEOUT = env.int('RESULTS_CACHE_TIMEOUT', default=600)
+STOCK_LIST_CACHE_TIMEOUT = env.int('STOCK_LIST_CACHE_TIMEOUT', default=3600)
+# How often each process checks whether its stock typeahead index is stale
+STOCK_INDEX_REFRESH_SECONDS = env.int('STOCK_INDEX_REFRESH_SECONDS', default=30)
+# How often each process checks whether its ticker entity matcher is stale
+ENTITY_MATCHER_REFRESH_SECONDS = env.int('ENTITY_MATCHER_REFRESH_SECONDS', default=60)
+# How often each process checks whether its saved-query percolator is stale
+PERCOLATOR_REFRESH_SECONDS = env.int('PERCOLATOR_REFRESH_SECONDS', default=60)
+# Alerts shown per inbox page
+ALERTS_PAGE_SIZE = env.int('ALERTS_PAGE_SIZE', default=25)
+# How often each process checks whether its sector matcher is stale
+SECTOR_MATCHER_REFRESH_SECONDS = env.int('SECTOR_MATCHER_REFRESH_SECONDS', default=60)
+# Days of daily sentiment shown on the sector page
+SECTOR_SENTIMENT_DAYS = env.int('SECTOR_SENTIMENT_DAYS', default=30)
+# Portfolio dashboard: score window, days of trend shown, movers listed
+PORTFOLIO_WINDOW_DAYS = env.int('PORTFOLIO_WINDOW_DAYS', default=7)
+PORTFOLIO_TOP_MOVERS = env.int('PORTFOLIO_TOP_MOVERS', default=5)
+PORTFOLIO_CACHE_TIMEOUT = env.int('PORTFOLIO_CACHE_TIMEOUT', default=300)
+# Decayed stock scores: a mention's weight halves every half-life; mentions
+# older than the lookback are ignored. Scores are recomputed on the interval.
+SENTIMENT_HALF_LIFE_HOURS = env.float('SENTIMENT_HALF_LIFE_HOURS', default=48.0)
+SENTIMENT_LOOKBACK_DAYS = env.int('SENTIMENT_LOOKBACK_DAYS', default=30)
+SENTIMENT_SCORES_INTERVAL = env.int('SENTIMENT_SCORES_INTERVAL', default=900)
+SENTIMENT_SCORES_CACHE_TIMEOUT = env.int('SENTIMENT_SCORES_CACHE_TIMEOUT', default=2 * SENTIMENT_SCORES_INTERVAL)
+CELERY_BEAT_SCHEDULE['refresh-stock-scores'] = {
+    'task': 'news_analyser.tasks.refresh_stock_scores_task',
+    'schedule': SENTIMENT_SCORES_INTERVAL,
+}
+
+# Google Sheets sync: spreadsheet, service-account key and retries after a
+# rate-limit response. SHEETS_BASE_URL points the client elsewhere, e.g. at
+# the local stand-in started with `python manage.py run_sheets_stub`.
+GOOGLE_SHEET_ID = env('GOOGLE_SHEET_ID', default=None)
+GOOGLE_SHEETS_CREDENTIALS = env('GOOGLE_SHEETS_CREDENTIALS', default=os.path.join(BASE_DIR, 'creds.json'))
+SHEETS_BASE_URL = env('SHEETS_BASE_URL', default=None)
+SHEETS_MAX_RETRIES = env.int('SHEETS_MAX_RETRIES', default=3)
+
+# Parquet export for analytics: changed news is appended to EXPORT_DIR in
+# batches of EXPORT_BATCH_SIZE rows every EXPORT_INTERVAL seconds
+EXPORT_DIR = env('EXPORT_DIR', default=os.path.join(BASE_DIR, 'exports'))
+EXPORT_BATCH_SIZE = env.int('EXPORT_BATCH_SIZE', default=5000)
+EXPORT_INTERVAL = env.int('EXPORT_INTERVAL', default=60 * 60)
+# Seconds re-read behind the watermark, for rows whose transaction committed late
+EXPORT_OVERLAP_SECONDS = env.int('EXPORT_OVERLAP_SECONDS', default=5 * 60)
+CELERY_BEAT_SCHEDULE['export-news'] = {
+    'task': 'news_analyser.tasks.export_news_task',
+    'schedule': EXPORT_INTERVAL,
+}
+
+# Most articles a boolean query returns
+BOOLEAN_QUERY_LIMIT = env.int('BOOLEAN_QUERY_LIMIT', default=100)
+
+# Result pagination: articles per keyword page and keywords per history page
+RESULTS_PAGE_SIZE = env.int('RESULTS_PAGE_SIZE', default=25)
+HISTORY_PAGE_SIZE = env.int('HISTORY_PAGE_SIZE', default=10)
 
 # Static files
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
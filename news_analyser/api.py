@@ -0,0 +1,280 @@
+"""
+Read-only JSON API, version 1.
+
+Endpoints (mounted under ``/api/v1/``):
+
+- ``news/``: news filtered by keyword, ticker, source and time range, with
+  field selection (``fields=id,title,sentiment``) and cursor pagination
+- ``news/<id>/``: one article with its full analysis
+- ``sentiment/``: aggregate sentiment of analysed news, optionally grouped
+  by keyword, source or day
+
+Every response carries an ETag and Last-Modified derived from
+``News.updated_at`` over the rows it covers, so clients polling with
+``If-None-Match``/``If-Modified-Since`` get a 304 without the payload being
+built.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, time as dt_time
+from functools import wraps
+
+from django.db import connection
+from django.db.models import Avg, Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.http import JsonResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import condition, require_GET
+
+from .exceptions import InvalidCursorError
+from .models import News
+from .pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Public field name -> ORM path
+NEWS_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'summary': 'content_summary',
+    'link': 'link',
+    'date': 'date',
+    'keyword': 'keyword__name',
+    'source': 'source__name',
+    'sentiment': 'impact_rating',
+    'confidence': 'sentiment_confidence',
+    'explanation': 'sentiment_explanation',
+    'tickers': 'mentioned_tickers',
+    'analysis_status': 'analysis_status',
+    'analysed_at': 'analysed_at',
+    'relevance_score': 'relevance_score',
+    'is_market_relevant': 'is_market_relevant',
+    'updated_at': 'updated_at',
+}
+
+GROUP_BY = {
+    'keyword': 'keyword__name',
+    'source': 'source__name',
+    'day': 'day',
+}
+
+
+class APIError(Exception):
+    """A client error reported as a JSON body with an HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_view(view):
+    """Require a logged-in user and turn ``APIError`` into JSON responses."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        try:
+            return view(request, *args, **kwargs)
+        except APIError as e:
+            return JsonResponse({'error': str(e)}, status=e.status)
+    return require_GET(wrapper)
+
+
+def _parse_time(value, name):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value) or parse_date(value)
+    except ValueError as e:
+        raise APIError(f"Invalid {name}: {e}")
+    if parsed is None:
+        raise APIError(f"Invalid {name}: expected an ISO 8601 date or datetime")
+    if not isinstance(parsed, datetime):
+        # A date means its midnight in the project time zone
+        parsed = datetime.combine(parsed, dt_time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def ticker_filter(ticker):
+    """Match news whose analysis mentions ``ticker``."""
+    ticker = ticker.upper()
+    if connection.features.supports_json_field_contains:
+        return Q(mentioned_tickers__contains=[ticker])
+    # SQLite has no JSON containment; match the quoted element instead
+    return Q(mentioned_tickers__icontains=f'"{ticker}"')
+
+
+def filtered_news(request):
+    """
+    News matching the request's filters.
+
+    Supported query parameters: ``keyword``, ``ticker``, ``source`` (name or
+    short id), ``since`` and ``until`` (ISO 8601).
+
+    Raises:
+        APIError: If a filter value is invalid
+    """
+    params = request.GET
+    news = News.objects.all()
+    if params.get('keyword'):
+        news = news.filter(keyword__name__iexact=params['keyword'])
+    if params.get('ticker'):
+        news = news.filter(ticker_filter(params['ticker']))
+    if params.get('source'):
+        news = news.filter(Q(source__name__iexact=params['source']) | Q(source__id_name__iexact=params['source']))
+    since = _parse_time(params.get('since'), 'since')
+    if since:
+        news = news.filter(date__gte=since)
+    until = _parse_time(params.get('until'), 'until')
+    if until:
+        news = news.filter(date__lt=until)
+    return news
+
+
+def _selected_fields(request):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(NEWS_FIELDS)
+    fields = [f.strip() for f in requested.split(',') if f.strip()]
+    unknown = sorted(set(fields) - set(NEWS_FIELDS))
+    if unknown:
+        raise APIError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _limit(request):
+    try:
+        return max(1, min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+    except ValueError:
+        raise APIError("limit must be an integer")
+
+
+def _freshness(queryset):
+    """Latest ``updated_at`` and row count of a queryset, in one query."""
+    return queryset.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+
+
+def _etag(request, freshness):
+    # Row count catches deletions, which do not move max(updated_at)
+    stamp = freshness['last_modified'].isoformat() if freshness['last_modified'] else ''
+    raw = f"{request.path}?{request.GET.urlencode()}|{stamp}|{freshness['count']}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _collection_freshness(request):
+    if not hasattr(request, '_api_freshness'):
+        try:
+            request._api_freshness = _freshness(filtered_news(request))
+        except APIError:
+            request._api_freshness = None
+    return request._api_freshness
+
+
+def _collection_etag(request, *args, **kwargs):
+    freshness = _collection_freshness(request)
+    return _etag(request, freshness) if freshness else None
+
+
+def _collection_last_modified(request, *args, **kwargs):
+    freshness = _collection_freshness(request)
+    return freshness['last_modified'] if freshness else None
+
+
+def _article_updated_at(request, news_id):
+    return News.objects.filter(pk=news_id).values_list('updated_at', flat=True).first()
+
+
+def _article_etag(request, news_id):
+    updated_at = _article_updated_at(request, news_id)
+    return hashlib.sha1(f"{news_id}|{updated_at.isoformat()}".encode('utf-8')).hexdigest() if updated_at else None
+
+
+def _serialise(row, fields):
+    item = {}
+    for name in fields:
+        value = row[NEWS_FIELDS[name]]
+        item[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return item
+
+
+@api_view
+@condition(etag_func=_collection_etag, last_modified_func=_collection_last_modified)
+def news_list(request):
+    """List news, newest first, one page per request."""
+    fields = _selected_fields(request)
+    paths = {NEWS_FIELDS[name] for name in fields} | {'id', 'date'}
+    rows = filtered_news(request).values(*paths)
+    try:
+        page = paginate(rows, request.GET.get('cursor'), _limit(request))
+    except InvalidCursorError:
+        raise APIError("Invalid cursor")
+
+    next_url = None
+    if page.next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = page.next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+    return JsonResponse({
+        'results': [_serialise(row, fields) for row in page.object_list],
+        'next_cursor': page.next_cursor,
+        'next': next_url,
+    })
+
+
+@api_view
+@condition(etag_func=_article_etag, last_modified_func=_article_updated_at)
+def news_detail(request, news_id):
+    """One article with its full analysis."""
+    row = News.objects.filter(pk=news_id).values(*NEWS_FIELDS.values(), 'raw_gemini_response').first()
+    if row is None:
+        raise APIError("News not found", status=404)
+    item = _serialise(row, NEWS_FIELDS)
+    item['impact_timeline'] = (row['raw_gemini_response'] or {}).get('impact_timeline')
+    return JsonResponse(item)
+
+
+@api_view
+@condition(etag_func=_collection_etag, last_modified_func=_collection_last_modified)
+def sentiment_summary(request):
+    """Aggregate sentiment of analysed news matching the filters."""
+    group_by = request.GET.get('group_by')
+    if group_by and group_by not in GROUP_BY:
+        raise APIError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+
+    news = filtered_news(request).filter(analysis_status=News.AnalysisStatus.DONE)
+    aggregates = {
+        'count': Count('id'),
+        'avg_sentiment': Avg('impact_rating'),
+        'avg_confidence': Avg('sentiment_confidence'),
+        'positive': Count('id', filter=Q(impact_rating__gt=0.3)),
+        'negative': Count('id', filter=Q(impact_rating__lt=-0.3)),
+    }
+    if not group_by:
+        return JsonResponse(news.aggregate(**aggregates))
+
+    key = GROUP_BY[group_by]
+    if group_by == 'day':
+        news = news.annotate(day=TruncDate('date'))
+    rows = news.values(key).annotate(**aggregates).order_by(key)
+    return JsonResponse({
+        'group_by': group_by,
+        'results': [
+            {'key': row.pop(key).isoformat() if group_by == 'day' else row.pop(key), **row}
+            for row in rows
+        ],
+    })
+
+
+urlpatterns = [
+    path("news/", news_list, name="news_list"),
+    path("news/<int:news_id>/", news_detail, name="news_detail"),
+    path("sentiment/", sentiment_summary, name="sentiment_summary"),
+]
@@ -1,4 +1,5 @@
 import json
+import logging
 from dotenv import load_dotenv
 from typing import List
 import asyncio
@@ -8,6 +9,8 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 import os
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 task = """
     Find the 1 most recent news articles on tariff war between US and China on google news. For each article:
@@ -17,7 +20,22 @@ task = """
 """
 
 
-async def get_news(link):
+async def get_news(link, browser=None, browser_context=None):
+    """
+    Extract an article's main content with a browser agent.
+
+    Args:
+        link (str): Article URL
+        browser (Browser): Shared browser to reuse instead of starting one
+        browser_context (BrowserContext): Pooled context to run the agent in
+
+    Returns:
+        dict: Extracted ``content`` and ``keywords``, None if the agent found nothing
+
+    Raises:
+        Exception: Whatever the agent run raised, so a pooled context that
+            failed is replaced rather than reused
+    """
     task = " grab the main content of the open tab."
     initial_actions = [
         {"open_tab": {"url": link}}
@@ -27,11 +45,8 @@ async def get_news(link):
         content: str
         keywords: List[str]
 
-    config = BrowserConfig(
-        headless=True,
-    )
-
-    browser = Browser(config=config)
+    if browser is None:
+        browser = Browser(config=BrowserConfig(headless=True))
 
     controller = Controller(output_model=News)
     agent = Agent(
@@ -40,32 +55,36 @@ async def get_news(link):
         llm=ChatGoogleGenerativeAI(
             model="gemini-2.0-flash-lite", api_key=SecretStr(os.getenv('GEMINI_API_KEY_3') or os.getenv('GEMINI_API_KEY')), controller=controller),
         browser=browser,
+        browser_context=browser_context,
         controller=controller
     )
+    # The agent closes only a context it created; tabs opened in a pooled one stay open
+    known_pages = await _open_pages(browser_context) if browser_context else None
     try:
         history = await agent.run(max_steps=20)
-        if history.extracted_content:
-            content = history.final_result()
-            content_dict = json.loads(content)
-            print(type(content_dict))
-            print(content_dict['content'])
-            return content_dict
-            # Try to parse the result as JSON first
-            # try:
-            #     # Clean the result string if it contains markdown code blocks
-            #         "```json", "").replace("```", "").strip()
-            #     json_result = json.loads(cleaned_result)
-            #     parsed: NewsList = NewsList.model_validate(json_result)
-            #     for news in parsed.news:
-            #         print(f"Title: {news.news_title}")
-            #         print(f"Content: {news.news_content}")
-            #         print(f"URL: {news.news_url}")
-            #         print(f"Date Posted: {news.date_posted}")
-            #         print("\n")
-            # except json.JSONDecodeError as e:
-            #     print(f"Error parsing JSON: {e}")
-            #     print("Cleaned result:", cleaned_result)
-            # except Exception as e:
-            #     print(f"Error processing result: {e}")
+    finally:
+        if browser_context:
+            await _close_new_pages(browser_context, known_pages)
+    content = history.final_result()
+    if not content:
+        logger.info(f"Browser agent extracted nothing from {link}")
+        return None
+    content_dict = json.loads(content)
+    logger.debug(f"Browser agent extracted {len(content_dict['content'])} characters from {link}")
+    return content_dict
+
+
+async def _open_pages(browser_context):
+    session = await browser_context.get_session()
+    return list(session.context.pages)
+
+
+async def _close_new_pages(browser_context, known_pages):
+    """Close the tabs a run opened, leaving the context as it was borrowed."""
+    try:
+        for page in await _open_pages(browser_context):
+            if page not in known_pages:
+                await page.close()
     except Exception as e:
-        print(f"Error running agent: {e}")
+        # The pool replaces a context whose run failed, so this only loses a tab
+        logger.warning(f"Closing browser tabs failed: {e}")
@@ -0,0 +1,155 @@
+"""
+Long-lived headless browser contexts for content extraction workers.
+
+Starting Chromium costs seconds, so a worker process starts one browser the
+first time it needs it and keeps a fixed pool of browser contexts open for
+the life of the process. Each extraction borrows a context, runs the
+``browser_use`` agent in it and hands it back.
+
+Celery runs tasks synchronously, but the browser and its contexts are bound
+to the asyncio loop they were created on. The pool therefore owns one event
+loop on a background thread; ``run_with_context`` submits a coroutine to that
+loop and waits for the result.
+
+Throughput of the ``content`` queue scales with ``CONTENT_BROWSER_POOL_SIZE``
+(contexts per process) times the worker's concurrency.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a broken context to close before abandoning it
+CONTEXT_CLOSE_TIMEOUT = 10
+
+
+class BrowserPool:
+    """
+    A fixed-size pool of browser contexts sharing one headless browser.
+
+    Args:
+        size (int): Number of contexts, i.e. concurrent extractions
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="browser-pool", daemon=True)
+        self._thread.start()
+        self._browser = None
+        self._contexts = None
+        self._started = None
+
+    async def _start(self):
+        from browser_use import Browser, BrowserConfig
+
+        self._browser = Browser(config=BrowserConfig(headless=True))
+        self._contexts = asyncio.Queue()
+        for _ in range(self.size):
+            self._contexts.put_nowait(self._new_context())
+        logger.info(f"Started browser pool with {self.size} contexts")
+
+    def _new_context(self):
+        from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+        return BrowserContext(browser=self._browser, config=BrowserContextConfig())
+
+    async def _replace(self, ctx):
+        """Close a context that failed or was cancelled mid-use and make a fresh one."""
+        try:
+            await asyncio.wait_for(ctx.close(), CONTEXT_CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Closing a broken browser context failed: {e}")
+        return self._new_context()
+
+    async def _ensure_started(self):
+        # Start lazily, once, on the pool's own loop
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._start())
+        await self._started
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow a browser context, waiting if all are in use."""
+        await self._ensure_started()
+        ctx = await self._contexts.get()
+        healthy = False
+        try:
+            yield self._browser, ctx
+            healthy = True
+        finally:
+            try:
+                if not healthy:
+                    # A timed-out or failed page may be left hung; never reuse it
+                    ctx = await self._replace(ctx)
+            finally:
+                self._contexts.put_nowait(ctx)
+
+    def run_with_context(self, func, *args, timeout=None):
+        """
+        Run ``func(browser, context, *args)`` on a pooled context.
+
+        Args:
+            func (coroutine function): Receives the browser and a context
+            *args: Extra arguments for ``func``
+            timeout (float): Seconds to wait for the result
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            TimeoutError: If ``func`` did not finish in time; it is cancelled
+                and its context replaced, so the pool does not leak contexts
+        """
+        async def runner():
+            async with self.context() as (browser, ctx):
+                return await func(browser, ctx, *args)
+
+        future = asyncio.run_coroutine_threadsafe(runner(), self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        """Close every context and the browser, then stop the loop."""
+        async def shutdown():
+            if self._contexts is not None:
+                while not self._contexts.empty():
+                    await self._contexts.get_nowait().close()
+            if self._browser is not None:
+                await self._browser.close()
+
+        if self._started is not None:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(30)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return this process's browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(settings.CONTENT_BROWSER_POOL_SIZE)
+        return _pool
+
+
+def close_browser_pool(**kwargs):
+    """Shut down this process's pool; connected to ``worker_process_shutdown``."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
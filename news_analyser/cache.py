@@ -0,0 +1,239 @@
+"""
+Cached reads for result pages and reference data.
+
+Result data is cached per keyword under a version number. Anything that
+changes what a keyword's results look like (new articles, a finished or
+failed analysis) bumps that keyword's version, which orphans every cached
+entry for it at once; stale entries simply expire. Nothing has to find and
+delete individual keys, so invalidation stays correct across processes.
+
+Every lookup counts a hit or a miss in ``metrics`` so cache effectiveness
+can be read from ``/metrics/``.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "kw_version:{keyword_id}"
+RESULTS_KEY = "kw_results:{keyword_id}:v{version}"
+STOCK_LIST_VERSION_KEY = "stock_list_version"
+STOCK_LIST_KEY = "stock_list:v{version}"
+SECTOR_VERSION_KEY = "sector_version"
+PERCOLATOR_VERSION_KEY = "percolator_version"
+PORTFOLIO_VERSION_KEY = "portfolio_version:{user_id}"
+STOCK_SENTIMENT_VERSION_KEY = "stock_sentiment_version"
+PORTFOLIO_KEY = "portfolio:{user_id}:v{version}:s{sentiment_version}"
+
+
+def _count(hit_counter, miss_counter, hits, misses):
+    if hits:
+        metrics.increment(hit_counter, hits)
+    if misses:
+        metrics.increment(miss_counter, misses)
+
+
+def keyword_versions(keyword_ids):
+    """
+    Read the current cache version of several keywords.
+
+    Args:
+        keyword_ids (iterable): Keyword primary keys
+
+    Returns:
+        dict: Keyword ID to version (1 when never bumped)
+    """
+    keys = {VERSION_KEY.format(keyword_id=kid): kid for kid in keyword_ids}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Could not read keyword cache versions: {e}")
+        found = {}
+    return {kid: found.get(key, 1) for key, kid in keys.items()}
+
+
+def bump_keyword_version(keyword_id):
+    """
+    Invalidate everything cached for a keyword.
+
+    Args:
+        keyword_id (int): Keyword primary key
+    """
+    key = VERSION_KEY.format(keyword_id=keyword_id)
+    try:
+        # Start at 1 so the first bump moves readers off the implicit version
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cache for keyword {keyword_id}: {e}")
+
+
+def get_keyword_results(keywords, build):
+    """
+    Fetch per-keyword result data, building only what is not cached.
+
+    Args:
+        keywords (list): Keyword objects
+        build (callable): Called with the keywords that missed; returns a
+            dict of Keyword to picklable result data
+
+    Returns:
+        dict: Keyword to result data, in the order of ``keywords``
+    """
+    versions = keyword_versions(kwd.id for kwd in keywords)
+    keys = {
+        kwd: RESULTS_KEY.format(keyword_id=kwd.id, version=versions[kwd.id])
+        for kwd in keywords
+    }
+    try:
+        found = cache.get_many(list(keys.values()))
+    except Exception as e:
+        logger.warning(f"Could not read cached results: {e}")
+        found = {}
+
+    results = {kwd: found[key] for kwd, key in keys.items() if key in found}
+    missing = [kwd for kwd in keywords if kwd not in results]
+    _count(metrics.CACHE_RESULTS_HIT, metrics.CACHE_RESULTS_MISS, len(results), len(missing))
+
+    if missing:
+        built = build(missing)
+        results.update(built)
+        try:
+            cache.set_many(
+                {keys[kwd]: data for kwd, data in built.items()},
+                timeout=settings.RESULTS_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Could not cache results: {e}")
+
+    return {kwd: results[kwd] for kwd in keywords}
+
+
+def stock_list_version():
+    """Current version of the stock list, bumped whenever a stock changes."""
+    try:
+        return cache.get(STOCK_LIST_VERSION_KEY, 1)
+    except Exception as e:
+        logger.warning(f"Could not read stock list version: {e}")
+        return None
+
+
+def get_stock_list(build):
+    """
+    Fetch the list of all stocks, cached until a stock changes.
+
+    Args:
+        build (callable): Returns the stock list on a miss
+
+    Returns:
+        list: Stocks
+    """
+    key = STOCK_LIST_KEY.format(version=stock_list_version())
+    stocks = cache.get(key)
+    if stocks is not None:
+        _count(metrics.CACHE_STOCKS_HIT, metrics.CACHE_STOCKS_MISS, 1, 0)
+        return stocks
+    _count(metrics.CACHE_STOCKS_HIT, metrics.CACHE_STOCKS_MISS, 0, 1)
+    stocks = build()
+    cache.set(key, stocks, timeout=settings.STOCK_LIST_CACHE_TIMEOUT)
+    return stocks
+
+
+def invalidate_stock_list():
+    """Drop the cached stock list after a stock is added, changed or removed."""
+    try:
+        cache.add(STOCK_LIST_VERSION_KEY, 1, timeout=None)
+        cache.incr(STOCK_LIST_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not invalidate stock list: {e}")
+
+
+def sector_version():
+    """Current version of sector definitions, bumped when a sector or its stocks change."""
+    try:
+        return cache.get(SECTOR_VERSION_KEY, 1)
+    except Exception as e:
+        logger.warning(f"Could not read sector version: {e}")
+        return None
+
+
+def invalidate_sectors():
+    """Make every process rebuild its sector matcher."""
+    try:
+        cache.add(SECTOR_VERSION_KEY, 1, timeout=None)
+        cache.incr(SECTOR_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not invalidate sectors: {e}")
+
+
+def percolator_version():
+    """Current version of saved queries, bumped when a query or a watchlist changes."""
+    try:
+        return cache.get(PERCOLATOR_VERSION_KEY, 1)
+    except Exception as e:
+        logger.warning(f"Could not read percolator version: {e}")
+        return None
+
+
+def invalidate_percolator():
+    """Make every process recompile its saved-query percolator."""
+    _bump(PERCOLATOR_VERSION_KEY)
+
+
+def _bump(key):
+    try:
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not bump {key}: {e}")
+
+
+def bump_portfolio_version(user_id):
+    """Drop a user's cached portfolio after their watchlist changes."""
+    _bump(PORTFOLIO_VERSION_KEY.format(user_id=user_id))
+
+
+def bump_stock_sentiment_version():
+    """Drop every cached portfolio after a stock's daily sentiment changes."""
+    _bump(STOCK_SENTIMENT_VERSION_KEY)
+
+
+def get_portfolio(user_id, build):
+    """
+    Fetch a user's portfolio summary, cached until their watchlist or any
+    stock sentiment changes.
+
+    Both versions are read in one round trip; a hit costs no database query.
+
+    Args:
+        user_id (int): The user
+        build (callable): Returns the summary on a miss
+
+    Returns:
+        dict: Portfolio summary
+    """
+    version_key = PORTFOLIO_VERSION_KEY.format(user_id=user_id)
+    try:
+        versions = cache.get_many([version_key, STOCK_SENTIMENT_VERSION_KEY])
+    except Exception as e:
+        logger.warning(f"Could not read portfolio versions: {e}")
+        return build()
+    key = PORTFOLIO_KEY.format(
+        user_id=user_id, version=versions.get(version_key, 1),
+        sentiment_version=versions.get(STOCK_SENTIMENT_VERSION_KEY, 1))
+
+    summary = cache.get(key)
+    if summary is not None:
+        _count(metrics.CACHE_PORTFOLIO_HIT, metrics.CACHE_PORTFOLIO_MISS, 1, 0)
+        return summary
+    _count(metrics.CACHE_PORTFOLIO_HIT, metrics.CACHE_PORTFOLIO_MISS, 0, 1)
+    summary = build()
+    try:
+        cache.set(key, summary, timeout=settings.PORTFOLIO_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Could not cache portfolio for user {user_id}: {e}")
+    return summary
@@ -0,0 +1,194 @@
+"""
+URL-keyed store of fetched article pages and their extracted text.
+
+Articles are keyed by a canonical form of their URL (tracking parameters,
+fragments and scheme differences removed), so every News row and every
+fetch of the same story shares one ``ArticleContent`` entry.
+
+- A fresh entry whose text came from the current extractor is returned as is.
+- A fresh entry from an older extractor is re-extracted from its stored HTML,
+  without a network request.
+- Anything else is fetched from the publisher and stored.
+
+Entries expire ``CONTENT_STORE_TTL_DAYS`` after they were fetched, and
+``evict`` trims the least recently read entries once the store grows past
+``CONTENT_STORE_MAX_MB``.
+"""
+
+import logging
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from . import metrics
+from .exceptions import ContentExtractionError
+from .extractors import EXTRACTOR_VERSION, ExtractedArticle, extract_from_html, fetch_html
+from .models import ArticleContent
+
+logger = logging.getLogger(__name__)
+
+BROWSER_METHOD = "browser"
+
+# Query parameters that identify a campaign or referrer, not the article
+TRACKING_PARAMS = {"fbclid", "gclid", "from", "ref", "cmp", "src", "source", "ito"}
+TRACKING_PREFIXES = ("utm_",)
+
+EVICTION_BATCH = 500
+
+
+def canonical_url(url):
+    """
+    Normalise an article URL for use as a store key.
+
+    Args:
+        url (str): Article URL as linked from a feed
+
+    Returns:
+        str: URL with https scheme, lower-case host, no fragment, no tracking
+        parameters, sorted query and no trailing slash
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def _ttl():
+    return timedelta(days=settings.CONTENT_STORE_TTL_DAYS)
+
+
+def _fresh_entry(key):
+    return ArticleContent.objects.filter(
+        url=key, fetched_at__gte=timezone.now() - _ttl()).first()
+
+
+def _is_current(entry):
+    # Browser extractions do not depend on the HTML extractor version
+    return bool(entry.content) and (
+        entry.extraction_method == BROWSER_METHOD or entry.extractor_version == EXTRACTOR_VERSION)
+
+
+def stored_content(url):
+    """
+    Return stored article text without fetching anything.
+
+    Args:
+        url (str): Article URL
+
+    Returns:
+        str: The extracted text, or None if no fresh entry has any
+    """
+    entry = _fresh_entry(canonical_url(url))
+    if entry is None or not entry.content:
+        return None
+    ArticleContent.objects.filter(pk=entry.pk).update(accessed_at=timezone.now())
+    return entry.content
+
+
+def fetch_article(url, refresh=False):
+    """
+    Return an article's text from the store, extracting it if needed.
+
+    Args:
+        url (str): Article URL
+        refresh (bool): Ignore any stored copy and fetch the page again
+
+    Returns:
+        ExtractedArticle: Article text and the method that extracted it
+
+    Raises:
+        ContentExtractionError: If the page cannot be fetched or has no
+            extractable body
+    """
+    key = canonical_url(url)
+    entry = None if refresh else _fresh_entry(key)
+
+    if entry is not None and _is_current(entry):
+        metrics.increment(metrics.CONTENT_STORE_HIT)
+        ArticleContent.objects.filter(pk=entry.pk).update(accessed_at=timezone.now())
+        return ExtractedArticle(entry.content, entry.extraction_method)
+
+    if entry is not None and entry.html:
+        # Extractor upgraded since this page was fetched: reuse its HTML
+        metrics.increment(metrics.CONTENT_STORE_HIT)
+        html, page_url, fetched_at = entry.get_html(), key, entry.fetched_at
+    else:
+        metrics.increment(metrics.CONTENT_STORE_MISS)
+        page_url, html = fetch_html(url)
+        fetched_at = timezone.now()
+
+    try:
+        article = extract_from_html(html, page_url)
+    except ContentExtractionError:
+        # Keep the page so a later extractor can retry without a fetch
+        _save(key, html, "", "", fetched_at)
+        raise
+    _save(key, html, article.content, article.method, fetched_at)
+    return article
+
+
+def _save(key, html, content, method, fetched_at):
+    entry = ArticleContent(
+        url=key, content=content, extraction_method=method,
+        extractor_version=EXTRACTOR_VERSION, fetched_at=fetched_at,
+        accessed_at=timezone.now())
+    entry.set_html(html)
+    ArticleContent.objects.update_or_create(url=key, defaults={
+        field: getattr(entry, field)
+        for field in ('html', 'html_bytes', 'content', 'extraction_method',
+                      'extractor_version', 'fetched_at', 'accessed_at')
+    })
+
+
+def store_browser_content(url, content):
+    """
+    Record text extracted by the browser agent, keeping any stored HTML.
+
+    Args:
+        url (str): Article URL
+        content (str): Extracted article text
+    """
+    now = timezone.now()
+    ArticleContent.objects.update_or_create(url=canonical_url(url), defaults={
+        'content': content,
+        'extraction_method': BROWSER_METHOD,
+        'extractor_version': EXTRACTOR_VERSION,
+        'fetched_at': now,
+        'accessed_at': now,
+    })
+
+
+def evict():
+    """
+    Drop expired entries, then the least recently read ones over the size cap.
+
+    Returns:
+        int: Number of entries deleted
+    """
+    deleted, _ = ArticleContent.objects.filter(
+        fetched_at__lt=timezone.now() - _ttl()).delete()
+
+    max_bytes = settings.CONTENT_STORE_MAX_MB * 1024 * 1024
+    entries = ArticleContent.objects.annotate(size=F('html_bytes') + Length('content'))
+    excess = (entries.aggregate(total=Sum('size'))['total'] or 0) - max_bytes
+    if excess > 0:
+        victims = []
+        for pk, entry_size in entries.order_by('accessed_at').values_list('pk', 'size').iterator():
+            victims.append(pk)
+            excess -= entry_size
+            if excess <= 0:
+                break
+        for start in range(0, len(victims), EVICTION_BATCH):
+            deleted += ArticleContent.objects.filter(
+                pk__in=victims[start:start + EVICTION_BATCH]).delete()[0]
+
+    if deleted:
+        logger.info(f"Evicted {deleted} stored articles")
+    return deleted
@@ -0,0 +1,416 @@
+"""
+Local NSE ticker and company-name extraction.
+
+Tickers used to come only from the Gemini analysis, so an article had none
+until it was analysed. This module finds them locally at ingest, using the
+bundled NSE ticker list and the ``Stock`` table:
+
+- symbols are matched case-sensitively as whole upper-case words
+  (``TCS``, ``M&M``), skipping ``AMBIGUOUS_SYMBOLS``
+- company names are normalised into aliases ("Tata Consultancy Services
+  Limited" becomes ``tata consultancy services``) and compiled into a
+  token trie, which is walked once over the article's tokens taking the
+  longest match at each position
+
+Matching costs one regex scan plus one trie walk, whatever the number of
+companies. Gemini's tickers are then cross-checked against the same symbol
+list instead of being stored as given (see ``cross_check_tickers``).
+"""
+
+import csv
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from . import metrics
+from .cache import stock_list_version
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:&[a-z0-9]+)*|&")
+_TICKER_RE = re.compile(r"\b[A-Z][A-Z0-9&\-]{1,19}\b")
+# NSE symbols that are also ordinary English words or common acronyms and
+# would otherwise produce false positives in upper-case headlines.
+AMBIGUOUS_SYMBOLS = frozenset({
+    "ACE", "APEX", "BANG", "FACT", "IDEA", "JASH", "KAYA", "LASA", "MEGH",
+    "RAIN", "RUPA", "STAR", "TAKE", "UFO", "URJA", "VETO", "ZOTA", "NH",
+    "TI", "GNA", "DEN", "SIS",
+})
+# Exchange decorations Gemini sometimes adds to symbols
+_EXCHANGE_RE = re.compile(r"^(?:NSE|BSE)\s*:\s*|\.(?:NS|BO)$")
+# Legal suffixes that never appear in how news refers to a company
+_NAME_SUFFIXES = {"ltd", "limited", "pvt", "private", "co", "corp", "corporation", "inc", "plc", "india"}
+# Words that make a trailing "India" part of the name ("State Bank of India")
+_CONNECTIVES = {"of", "and", "for", "the"}
+# Single-word aliases shorter than this are too ambiguous to match
+MIN_SINGLE_WORD_ALIAS = 5
+# Company names that are also ordinary words or phrases in business news
+AMBIGUOUS_ALIASES = frozenset({
+    ("alchemist",), ("atlanta",), ("birla",), ("chromatic",), ("cupid",),
+    ("delta",), ("engineers",), ("goodluck",), ("graphite",), ("hitech",),
+    ("insecticides",), ("kwality",), ("mazda",), ("premier",), ("sangam",),
+    ("skipper",), ("symphony",), ("trident",), ("wheels",),
+    ("indian", "bank"), ("bank", "of", "india"),
+})
+# Short forms news uses for large companies, on top of their registered names
+CURATED_ALIASES = {
+    "BHARTIARTL": ["Airtel"],
+    "DRREDDY": ["Dr Reddy's", "Dr Reddys"],
+    "HCLTECH": ["HCL Tech", "HCLTech"],
+    "HINDUNILVR": ["HUL"],
+    "KOTAKBANK": ["Kotak Bank"],
+    "LT": ["L&T", "Larsen"],
+    "MARUTI": ["Maruti"],
+    "POWERGRID": ["Power Grid"],
+    "RELIANCE": ["RIL"],
+    "SBIN": ["SBI", "State Bank"],
+    "SUNPHARMA": ["Sun Pharma"],
+    "TATAMOTORS": ["Tata Motors"],
+    "TCS": ["Tata Consultancy"],
+    "ULTRACEMCO": ["UltraTech"],
+}
+# The key marking the end of an alias in a trie node
+_END = ""
+
+
+def tokenize(text) -> List[str]:
+    """Lower-case word tokens of some text, with "&" read as "and"."""
+    return ["and" if token == "&" else token for token in _WORD_RE.findall(text.lower())]
+
+
+def symbol_words(text) -> List[str]:
+    """Upper-case words of some text that could be NSE symbols."""
+    return _TICKER_RE.findall(text or "")
+
+
+def company_aliases(name) -> List[Tuple[str, ...]]:
+    """
+    Token sequences a company is referred to by in news.
+
+    The full name without its legal suffix is always an alias; dropping a
+    trailing "India" gives a shorter one ("Maruti Suzuki India Limited" is
+    also ``maruti suzuki``). Aliases that would be a short single word are
+    left out.
+
+    Args:
+        name (str): Registered company name
+
+    Returns:
+        list: Token tuples, longest first
+    """
+    tokens = tokenize(name)
+    if tokens and tokens[0] == "the":
+        tokens = tokens[1:]
+    aliases = []
+    while tokens:
+        if tokens[-1] in _NAME_SUFFIXES:
+            if tokens[-1] == "india" and tokens[:-1]:
+                # "india" is part of the name as well as a common suffix
+                aliases.append(tuple(tokens))
+                if tokens[-2] in _CONNECTIVES:
+                    break
+            tokens = tokens[:-1]
+            continue
+        aliases.append(tuple(tokens))
+        break
+    return [
+        alias for alias in dict.fromkeys(aliases)
+        if len(alias) > 1 or len(alias[0]) >= MIN_SINGLE_WORD_ALIAS
+    ]
+
+
+def normalize_symbol(symbol) -> str:
+    """Upper-case a symbol and strip exchange prefixes and suffixes."""
+    return _EXCHANGE_RE.sub("", (symbol or "").strip().upper())
+
+
+class PhraseTrie:
+    """
+    Token trie mapping phrases to values, matched in one pass over a text.
+
+    At each position the longest phrase starting there wins, and matching
+    resumes after it, so "Tata Power Company" is not also read as "Tata".
+    """
+
+    def __init__(self):
+        self._root: Dict = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, tokens, value):
+        """
+        Map a phrase to a value.
+
+        Args:
+            tokens (tuple): Phrase tokens, as produced by ``tokenize``
+            value: Value reported when the phrase is found
+        """
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            node[_END] = set()
+            self.size += 1
+        node[_END].add(value)
+
+    def find(self, tokens) -> set:
+        """
+        Values of every phrase found in a token sequence.
+
+        Args:
+            tokens (list): Text tokens, as produced by ``tokenize``
+
+        Returns:
+            set: Values
+        """
+        found = set()
+        start = 0
+        while start < len(tokens):
+            node = self._root
+            longest = None
+            position = start
+            while position < len(tokens) and tokens[position] in node:
+                node = node[tokens[position]]
+                position += 1
+                if _END in node:
+                    longest = (position, node[_END])
+            if longest:
+                found.update(longest[1])
+                start = longest[0]
+            else:
+                start += 1
+        return found
+
+
+class EntityMatcher:
+    """
+    Finds NSE symbols and company names in text.
+
+    Args:
+        companies (iterable): ``(symbol, name)`` pairs
+        aliases (dict): Symbol to extra names it is known by, such as
+            ``CURATED_ALIASES``; these are used as given and take
+            precedence over registered names
+    """
+
+    def __init__(self, companies, aliases=None):
+        owners: Dict[Tuple[str, ...], set] = {}
+        symbols = set()
+        for symbol, name in companies:
+            symbol = normalize_symbol(symbol)
+            if not symbol:
+                continue
+            symbols.add(symbol)
+            for alias in company_aliases(name or ""):
+                if alias not in AMBIGUOUS_ALIASES:
+                    owners.setdefault(alias, set()).add(symbol)
+        # Curated aliases settle names that registered names leave ambiguous
+        curated: Dict[Tuple[str, ...], set] = {}
+        for symbol, names in (aliases or {}).items():
+            symbol = normalize_symbol(symbol)
+            if symbol not in symbols:
+                continue
+            for name in names:
+                curated.setdefault(tuple(tokenize(name)), set()).add(symbol)
+        owners.update(curated)
+        self.symbols = frozenset(symbols)
+
+        self._names = PhraseTrie()
+        self._aliases: Dict[str, List[str]] = {}
+        for alias, alias_symbols in owners.items():
+            # A name shared by several listings says nothing about which one
+            if len(alias_symbols) != 1 or not alias:
+                continue
+            symbol = next(iter(alias_symbols))
+            self._names.add(alias, symbol)
+            self._aliases.setdefault(symbol, []).append(" ".join(alias))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def names(self):
+        """Number of company names and aliases the matcher knows."""
+        return len(self._names)
+
+    def aliases_for(self, symbol) -> List[str]:
+        """
+        Names a symbol is known by, longest first.
+
+        Args:
+            symbol (str): NSE symbol
+
+        Returns:
+            list: Normalised aliases, empty for unknown symbols
+        """
+        return sorted(self._aliases.get(normalize_symbol(symbol), ()), key=lambda alias: (-len(alias), alias))
+
+    def match_names(self, text) -> set:
+        """
+        Symbols of the companies named in some text.
+
+        Args:
+            text (str): Free text
+
+        Returns:
+            set: Symbols
+        """
+        return self._names.find(tokenize(text or ""))
+
+    def match_symbols(self, text) -> set:
+        """
+        Known symbols written as upper-case words in some text.
+
+        Args:
+            text (str): Free text
+
+        Returns:
+            set: Symbols
+        """
+        return {
+            match for match in symbol_words(text)
+            if match in self.symbols and match not in AMBIGUOUS_SYMBOLS
+        }
+
+    def extract(self, text) -> List[str]:
+        """
+        All symbols an article mentions, by symbol or company name.
+
+        Args:
+            text (str): Free text
+
+        Returns:
+            list: Sorted symbols
+        """
+        return sorted(self.match_symbols(text) | self.match_names(text))
+
+
+@lru_cache(maxsize=1)
+def get_nse_companies() -> Tuple[Tuple[str, str], ...]:
+    """
+    Load ``(symbol, company name)`` pairs from the bundled NSE ticker list.
+
+    Returns:
+        tuple: Pairs, empty if the file is missing
+    """
+    path = settings.NSE_TICKER_CSV
+    try:
+        with open(path, newline="", encoding="utf-8") as fh:
+            reader = csv.reader(fh)
+            next(reader, None)  # Skip header row
+            return tuple(
+                (row[0].strip(), row[1].strip() if len(row) > 1 else "")
+                for row in reader if row and row[0].strip()
+            )
+    except OSError as e:
+        logger.error(f"Could not load NSE company list from {path}: {e}")
+        return ()
+
+
+_matcher: Optional[EntityMatcher] = None
+_matcher_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _load_matcher():
+    from .models import Stock
+    companies = list(get_nse_companies())
+    aliases = {symbol: list(names) for symbol, names in CURATED_ALIASES.items()}
+    for symbol, name, stock_aliases in Stock.objects.values_list('symbol', 'name', 'aliases'):
+        companies.append((symbol, name))
+        aliases.setdefault(symbol, []).extend(stock_aliases or ())
+    return EntityMatcher(companies, aliases)
+
+
+def get_entity_matcher():
+    """
+    Return this process's entity matcher, rebuilding it after stock changes.
+
+    Returns:
+        EntityMatcher: The current matcher
+    """
+    global _matcher, _matcher_version, _checked_at
+    now = time.monotonic()
+    matcher = _matcher
+    if matcher is not None and now - _checked_at < settings.ENTITY_MATCHER_REFRESH_SECONDS:
+        return matcher
+
+    with _lock:
+        version = stock_list_version()
+        _checked_at = now
+        if _matcher is None or version != _matcher_version:
+            _matcher = _load_matcher()
+            _matcher_version = version
+            logger.info(f"Built entity matcher with {len(_matcher)} symbols and {_matcher.names} names")
+        return _matcher
+
+
+def invalidate_entity_matcher():
+    """Drop this process's matcher so the next match rebuilds it from the stock list."""
+    global _matcher
+    _matcher = None
+
+
+def extract_tickers(*texts) -> List[str]:
+    """
+    Symbols mentioned in an article.
+
+    Args:
+        *texts (str): Article parts, e.g. title, summary and content
+
+    Returns:
+        list: Sorted symbols
+    """
+    return get_entity_matcher().extract("\n".join(filter(None, texts)))
+
+
+def search_aliases(symbols) -> Dict[str, List[str]]:
+    """
+    Expand stock symbols into the names headlines use for them.
+
+    Args:
+        symbols (iterable): NSE symbols
+
+    Returns:
+        dict: Symbol to its aliases, for symbols that have any
+    """
+    matcher = get_entity_matcher()
+    expanded = {symbol: matcher.aliases_for(symbol) for symbol in symbols}
+    return {symbol: aliases for symbol, aliases in expanded.items() if aliases}
+
+
+def cross_check_tickers(model_tickers, local_tickers) -> List[str]:
+    """
+    Combine the tickers from an analysis with the locally extracted ones.
+
+    Tickers the model returned that are not known symbols are dropped;
+    known ones are kept even when the local extractor missed them, since
+    the model reads context the extractor cannot.
+
+    Args:
+        model_tickers (list): Tickers from the Gemini analysis
+        local_tickers (list): Tickers from ``extract_tickers``
+
+    Returns:
+        list: Sorted symbols
+    """
+    known = get_entity_matcher().symbols
+    model = {normalize_symbol(ticker) for ticker in model_tickers or ()} - {""}
+    confirmed = model & known
+    unknown = model - known
+    if confirmed:
+        metrics.increment(metrics.TICKERS_CONFIRMED, len(confirmed))
+    if unknown:
+        metrics.increment(metrics.TICKERS_UNKNOWN, len(unknown))
+        logger.debug(f"Dropped unknown tickers from analysis: {sorted(unknown)}")
+    return sorted(confirmed | set(local_tickers or ()))
@@ -0,0 +1,122 @@
+"""
+Push channels for search progress and article content.
+
+Celery workers publish events to a Redis pub/sub channel per search job
+(analysis progress) or per article (content extraction), and the web tier
+relays them to the browser as server-sent events. Nothing is stored: a
+page that connects late first receives a snapshot from the database and
+then live events from that point on.
+
+Publishing is best effort. If Redis is unavailable the event is dropped
+and the page falls back to polling.
+"""
+
+import json
+import logging
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "search_job:"
+NEWS_CHANNEL_PREFIX = "news:"
+
+# Events sent on a search job channel
+ARTICLE_EVENT = "article"
+PROGRESS_EVENT = "progress"
+DONE_EVENT = "done"
+
+# Events sent on an article's channel
+CONTENT_EVENT = "content"
+
+_client = None
+
+
+def channel_name(job_id):
+    """Redis channel carrying events for one search job."""
+    return f"{CHANNEL_PREFIX}{job_id}"
+
+
+def news_channel_name(news_id):
+    """Redis channel carrying events for one article."""
+    return f"{NEWS_CHANNEL_PREFIX}{news_id}"
+
+
+def get_redis():
+    """Shared synchronous Redis client used by publishers."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+    return _client
+
+
+def publish_channel(channel, event, data):
+    """
+    Publish an event to a channel's subscribers.
+
+    Args:
+        channel (str): Redis channel name
+        event (str): Event name, e.g. ``ARTICLE_EVENT``
+        data (dict): JSON-serialisable payload
+
+    Returns:
+        int: Number of subscribers that received it, 0 on failure
+    """
+    message = json.dumps({"event": event, "data": data})
+    try:
+        return get_redis().publish(channel, message)
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish {event} to {channel}: {e}")
+        return 0
+
+
+def publish(job_id, event, data):
+    """Publish an event to a search job's subscribers."""
+    return publish_channel(channel_name(job_id), event, data)
+
+
+def publish_news(news_id, event, data):
+    """Publish an event to an article's subscribers."""
+    return publish_channel(news_channel_name(news_id), event, data)
+
+
+def format_sse(event, data):
+    """Encode one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def subscribe(channel, heartbeat=15):
+    """
+    Yield events published on a channel.
+
+    ``None`` is yielded once the subscription is active and again after
+    every ``heartbeat`` seconds of silence. Callers re-read the job state at
+    those points, so nothing published between a snapshot and the
+    subscription is lost.
+
+    Args:
+        channel (str): Channel name, e.g. from ``channel_name``
+        heartbeat (float): Seconds of silence between keep-alives
+
+    Yields:
+        tuple: ``(event, data)`` pairs, or ``None`` on a heartbeat
+    """
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        yield None
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=heartbeat)
+            if message is None:
+                yield None
+                continue
+            payload = json.loads(message["data"])
+            yield payload["event"], payload["data"]
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
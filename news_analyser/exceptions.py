@@ -36,6 +36,14 @@ class ContentExtractionError(NewsAnalyserException):
     pass
 
 
+class HostThrottledError(ContentExtractionError):
+    """Raised when a publisher host is rate limiting us or is too busy to fetch from now."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class NewsParsingError(NewsAnalyserException):
     """Raised when news parsing fails."""
     pass
@@ -44,3 +52,31 @@ class NewsParsingError(NewsAnalyserException):
 class InvalidSentimentScoreError(NewsAnalyserException):
     """Raised when sentiment score is invalid or out of range."""
     pass
+
+
+class AnalysisParseError(NewsAnalyserException):
+    """Raised when a Gemini analysis response does not match the schema."""
+    pass
+
+
+class InvalidCursorError(NewsAnalyserException):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+class QuerySyntaxError(NewsAnalyserException):
+    """Raised when a boolean news query cannot be parsed."""
+    pass
+
+
+class SheetsAPIError(NewsAnalyserException):
+    """Raised when the Google Sheets API rejects a request."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SheetsRateLimitError(SheetsAPIError):
+    """Raised when the Google Sheets API keeps rate limiting us after retries."""
+    pass
@@ -0,0 +1,218 @@
+"""
+Columnar Parquet export of news, analyses and ticker mentions.
+
+Analysts used to pull sentiment through the admin or raw SQL, scanning the
+production tables. ``export_news`` instead streams changed ``News`` rows
+into a Hive-partitioned Parquet dataset that can be read with pandas,
+DuckDB or Spark without touching the database:
+
+    EXPORT_DIR/day=2025-11-15/source=economic_times/part-<run>-<batch>-0.parquet
+
+Rows are read in ``(updated_at, id)`` order through a server-side cursor and
+written one batch at a time, so memory stays constant however large the
+table is. After each batch the position reached is saved to
+``EXPORT_DIR/_watermark.json``, and the next run starts from there.
+
+``updated_at`` is stamped when a row is saved, not when its transaction
+commits, so a slow transaction can make a row visible with a stamp older
+than the watermark. Each run therefore re-reads ``EXPORT_OVERLAP_SECONDS``
+behind the watermark; the watermark remembers the rows it already exported
+in that window, so only the late arrivals are written. A transaction that
+commits more than the overlap after its stamp is still missed; run with
+``--full`` after such an incident.
+
+An article that changes after it was exported, for example when it is
+analysed, is exported again in a later file. Readers should keep the row
+with the latest ``updated_at`` for each ``id``. A run that stops between
+writing a batch and saving the watermark exports that batch again, with
+the same result.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = "_watermark.json"
+
+# Columns read from News, in the order rows come out of the cursor
+_FIELDS = (
+    'id', 'date', 'title', 'link', 'content_summary', 'keyword__name', 'source__id_name',
+    'impact_rating', 'sentiment_confidence', 'sentiment_explanation', 'relevance_score',
+    'is_market_relevant', 'analysis_status', 'analysed_at', 'analysis_version',
+    'mentioned_tickers', 'extracted_tickers', 'updated_at',
+)
+
+_TIMESTAMP = pa.timestamp('us', tz='UTC')
+SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('date', _TIMESTAMP),
+    ('title', pa.string()),
+    ('link', pa.string()),
+    ('content_summary', pa.string()),
+    ('keyword', pa.string()),
+    ('impact_rating', pa.float64()),
+    ('sentiment_confidence', pa.float64()),
+    ('sentiment_explanation', pa.string()),
+    ('relevance_score', pa.float64()),
+    ('is_market_relevant', pa.bool_()),
+    ('analysis_status', pa.string()),
+    ('analysed_at', _TIMESTAMP),
+    ('analysis_version', pa.string()),
+    ('mentioned_tickers', pa.list_(pa.string())),
+    ('extracted_tickers', pa.list_(pa.string())),
+    ('stocks', pa.list_(pa.string())),
+    ('updated_at', _TIMESTAMP),
+    # Partition columns; stored in the directory names, not the files
+    ('day', pa.string()),
+    ('source', pa.string()),
+])
+PARTITION_COLS = ['day', 'source']
+# Directory name for articles without a source
+UNKNOWN_SOURCE = "unknown"
+
+
+def read_watermark(root):
+    """
+    Read the position the last export reached.
+
+    Args:
+        root (str): Export directory
+
+    Returns:
+        tuple: ``(updated_at, recent)``, where ``recent`` holds the
+        ``(news_id, updated_at)`` pairs exported inside the overlap window;
+        None before the first export
+    """
+    try:
+        with open(os.path.join(root, WATERMARK_FILE)) as handle:
+            data = json.load(handle)
+    except FileNotFoundError:
+        return None
+    recent = {(news_id, datetime.fromisoformat(updated_at)) for news_id, updated_at in data.get('recent', [])}
+    return datetime.fromisoformat(data['updated_at']), recent
+
+
+def write_watermark(root, updated_at, recent):
+    """
+    Save the export position atomically, so a crash never leaves half a file.
+
+    Args:
+        root (str): Export directory
+        updated_at (datetime): ``updated_at`` of the last exported row
+        recent (set): ``(news_id, updated_at)`` of rows exported inside the overlap window
+    """
+    path = os.path.join(root, WATERMARK_FILE)
+    with open(path + ".tmp", "w") as handle:
+        json.dump({
+            'updated_at': updated_at.isoformat(),
+            'recent': sorted([news_id, stamp.isoformat()] for news_id, stamp in recent),
+        }, handle)
+    os.replace(path + ".tmp", path)
+
+
+def _tickers(values):
+    return [str(value) for value in values] if isinstance(values, list) else []
+
+
+def _batch_table(rows):
+    from .models import NewsStock
+
+    stocks = {}
+    for news_id, symbol in NewsStock.objects.filter(
+            news_id__in=[row[0] for row in rows]).values_list('news_id', 'stock__symbol'):
+        stocks.setdefault(news_id, []).append(symbol)
+
+    columns = {field.name: [] for field in SCHEMA}
+    for (news_id, date, title, link, summary, keyword, source, impact, confidence, explanation,
+         relevance, relevant, status, analysed_at, version, mentioned, extracted, updated_at) in rows:
+        columns['id'].append(news_id)
+        columns['date'].append(date)
+        columns['title'].append(title)
+        columns['link'].append(link)
+        columns['content_summary'].append(summary)
+        columns['keyword'].append(keyword)
+        columns['impact_rating'].append(impact)
+        columns['sentiment_confidence'].append(confidence)
+        columns['sentiment_explanation'].append(explanation)
+        columns['relevance_score'].append(relevance)
+        columns['is_market_relevant'].append(relevant)
+        columns['analysis_status'].append(status)
+        columns['analysed_at'].append(analysed_at)
+        columns['analysis_version'].append(version)
+        columns['mentioned_tickers'].append(_tickers(mentioned))
+        columns['extracted_tickers'].append(_tickers(extracted))
+        columns['stocks'].append(sorted(stocks.get(news_id, [])))
+        columns['updated_at'].append(updated_at)
+        columns['day'].append(timezone.localdate(date).isoformat())
+        columns['source'].append(source or UNKNOWN_SOURCE)
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def _write_batch(root, rows, run, batch, recent):
+    pq.write_to_dataset(
+        _batch_table(rows), root_path=root, partition_cols=PARTITION_COLS,
+        basename_template=f"part-{run}-{batch:05d}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+    )
+    watermark = rows[-1][-1]
+    horizon = watermark - timedelta(seconds=settings.EXPORT_OVERLAP_SECONDS)
+    recent |= {(row[0], row[-1]) for row in rows}
+    recent -= {entry for entry in recent if entry[1] < horizon}
+    write_watermark(root, watermark, recent)
+
+
+def export_news(root=None, batch_size=None, full=False):
+    """
+    Export news changed since the last run to the Parquet dataset.
+
+    Args:
+        root (str): Export directory; defaults to ``EXPORT_DIR``
+        batch_size (int): Rows per written batch; defaults to ``EXPORT_BATCH_SIZE``
+        full (bool): Ignore the watermark and export everything
+
+    Returns:
+        int: Number of articles exported
+    """
+    from .models import News
+
+    root = root or settings.EXPORT_DIR
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    os.makedirs(root, exist_ok=True)
+
+    started = timezone.now()
+    # Rows saved from here on wait for the next run
+    queryset = News.objects.filter(updated_at__lte=started)
+    watermark = None if full else read_watermark(root)
+    recent = set()
+    if watermark:
+        updated_at, recent = watermark
+        queryset = queryset.filter(
+            updated_at__gte=updated_at - timedelta(seconds=settings.EXPORT_OVERLAP_SECONDS))
+
+    run = started.strftime('%Y%m%dT%H%M%S%f')
+    exported = batches = 0
+    rows = []
+    for row in queryset.order_by('updated_at', 'id').values_list(*_FIELDS).iterator(chunk_size=batch_size):
+        if (row[0], row[-1]) in recent:
+            continue
+        rows.append(row)
+        if len(rows) >= batch_size:
+            _write_batch(root, rows, run, batches, recent)
+            exported += len(rows)
+            batches += 1
+            rows = []
+    if rows:
+        _write_batch(root, rows, run, batches, recent)
+        exported += len(rows)
+        batches += 1
+
+    logger.info(f"Exported {exported} articles in {batches} batches to {root}")
+    return exported
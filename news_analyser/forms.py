@@ -1,5 +1,6 @@
 from django import forms
 from django.contrib.auth.models import User
+from .models import SavedQuery
 
 class UserRegistrationForm(forms.ModelForm):
     password = forms.CharField(widget=forms.PasswordInput)
@@ -11,3 +12,30 @@ class UserRegistrationForm(forms.ModelForm):
 
 class UserSettingsForm(forms.Form):
     gemini_api_key = forms.CharField(max_length=100, required=False)
+
+
+class SavedQueryForm(forms.ModelForm):
+    symbols = forms.CharField(max_length=500, required=False, help_text="Comma-separated NSE symbols")
+    keywords = forms.CharField(max_length=500, required=False, help_text="Comma-separated words or phrases")
+
+    class Meta:
+        model = SavedQuery
+        fields = ['name', 'symbols', 'keywords', 'sector', 'include_watchlist',
+                  'sentiment_above', 'sentiment_below']
+
+    def clean_symbols(self):
+        return [s.strip().upper() for s in self.cleaned_data['symbols'].split(",") if s.strip()]
+
+    def clean_keywords(self):
+        return [k.strip() for k in self.cleaned_data['keywords'].split(",") if k.strip()]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not (cleaned_data.get('symbols') or cleaned_data.get('keywords')
+                or cleaned_data.get('sector') or cleaned_data.get('include_watchlist')):
+            raise forms.ValidationError("Choose at least one symbol, keyword, sector or your watchlist.")
+        for field in ('sentiment_above', 'sentiment_below'):
+            value = cleaned_data.get(field)
+            if value is not None and not -1 <= value <= 1:
+                self.add_error(field, "Sentiment bounds must be between -1 and 1.")
+        return cleaned_data
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from news_analyser.export import export_news
+
+
+class Command(BaseCommand):
+    help = 'Append news changed since the last export to the Parquet dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Export directory (default: EXPORT_DIR)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per written batch (default: EXPORT_BATCH_SIZE)')
+        parser.add_argument('--full', action='store_true',
+                            help='Ignore the watermark and export every article')
+
+    def handle(self, *args, **options):
+        exported = export_news(root=options['output'], batch_size=options['batch_size'], full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Exported {exported} articles'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from news_analyser.query import rebuild_news_terms
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the postings index used by boolean news queries'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_news_terms()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} articles'))
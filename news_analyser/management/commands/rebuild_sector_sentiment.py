@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+from news_analyser.sectors import rebuild_sector_sentiment
+
+
+class Command(BaseCommand):
+    help = 'Re-match analysed news to sectors and recompute daily sector sentiment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=parse_date, default=None,
+                            help='Only rebuild from this day on (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        matched = rebuild_sector_sentiment(since=options['since'])
+        self.stdout.write(self.style.SUCCESS(f'Matched {matched} articles to sectors'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+from news_analyser.portfolio import rebuild_stock_sentiment
+
+
+class Command(BaseCommand):
+    help = 'Re-link analysed news to stocks and recompute daily stock sentiment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=parse_date, default=None,
+                            help='Only rebuild from this day on (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        linked = rebuild_stock_sentiment(since=options['since'])
+        self.stdout.write(self.style.SUCCESS(f'Linked {linked} articles to stocks'))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from news_analyser.utils.gemini_stub import (
+    GeminiStubConfig,
+    GeminiStubServer,
+    LATENCY_DISTRIBUTIONS,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run a local Gemini generateContent stand-in with latency and error injection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8089, help='Port to bind')
+        parser.add_argument('--latency', choices=LATENCY_DISTRIBUTIONS, default='fixed',
+                            help='Latency distribution')
+        parser.add_argument('--latency-ms', type=float, default=0.0,
+                            help='Fixed latency or distribution mean in milliseconds')
+        parser.add_argument('--latency-jitter-ms', type=float, default=0.0,
+                            help='Uniform half-width or standard deviation in milliseconds')
+        parser.add_argument('--rate-429', type=float, default=0.0, help='Quota error rate')
+        parser.add_argument('--rate-403', type=float, default=0.0, help='Auth error rate')
+        parser.add_argument('--rate-500', type=float, default=0.0, help='Server error rate')
+        parser.add_argument('--rate-malformed', type=float, default=0.0,
+                            help='Rate of unparseable model output')
+        parser.add_argument('--exhausted-key', action='append', default=[],
+                            help='API key that is always rate limited (repeatable)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed')
+
+    def handle(self, *args, **options):
+        config = GeminiStubConfig(
+            latency=options['latency'],
+            latency_ms=options['latency_ms'],
+            latency_jitter_ms=options['latency_jitter_ms'],
+            rate_429=options['rate_429'],
+            rate_403=options['rate_403'],
+            rate_500=options['rate_500'],
+            rate_malformed=options['rate_malformed'],
+            exhausted_keys=frozenset(options['exhausted_key']),
+            seed=options['seed'],
+        )
+        server = GeminiStubServer((options['host'], options['port']), config)
+        self.stdout.write(self.style.SUCCESS(
+            f'Gemini stub listening on {server.base_url} '
+            f'(set GEMINI_BASE_URL={server.base_url}); stats at {server.base_url}/stats'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Responses served: {dict(server.stats)}')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from news_analyser.utils.sheets_stub import SheetsStubServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local Google Sheets values API stand-in'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8090, help='Port to bind')
+
+    def handle(self, *args, **options):
+        server = SheetsStubServer((options['host'], options['port']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Sheets stub listening on {server.base_url} '
+            f'(set SHEETS_BASE_URL={server.base_url}); stats at {server.base_url}/stats'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Requests served: {dict(server.stats)}')
@@ -0,0 +1,100 @@
+"""
+Lightweight application counters.
+
+Counters live in the Django cache so every web and Celery process sharing a
+cache backend sees the same totals. They are intended for operational
+signals such as Gemini parse failures, not for exact accounting.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "metrics:"
+
+# Gemini structured-output counters
+ANALYSIS_PARSE_SUCCESS = "analysis.parse_success"
+ANALYSIS_PARSE_FAILURE = "analysis.parse_failure"
+
+# Cache effectiveness counters
+CACHE_RESULTS_HIT = "cache.results.hit"
+CACHE_RESULTS_MISS = "cache.results.miss"
+CACHE_STOCKS_HIT = "cache.stocks.hit"
+CACHE_STOCKS_MISS = "cache.stocks.miss"
+CACHE_PORTFOLIO_HIT = "cache.portfolio.hit"
+CACHE_PORTFOLIO_MISS = "cache.portfolio.miss"
+
+# Article content extraction paths
+CONTENT_FAST_SUCCESS = "content.fast_success"
+CONTENT_BROWSER_FALLBACK = "content.browser_fallback"
+CONTENT_STORE_HIT = "content.store.hit"
+CONTENT_STORE_MISS = "content.store.miss"
+
+# Analysis tickers checked against the NSE symbol list
+TICKERS_CONFIRMED = "tickers.confirmed"
+TICKERS_UNKNOWN = "tickers.unknown"
+
+# Saved-query matches written to alert inboxes
+ALERTS_MATCHED = "alerts.matched"
+
+# Counters reported by the metrics endpoint
+ALL_COUNTERS = [
+    ANALYSIS_PARSE_SUCCESS,
+    ANALYSIS_PARSE_FAILURE,
+    CACHE_RESULTS_HIT,
+    CACHE_RESULTS_MISS,
+    CACHE_STOCKS_HIT,
+    CACHE_STOCKS_MISS,
+    CACHE_PORTFOLIO_HIT,
+    CACHE_PORTFOLIO_MISS,
+    CONTENT_FAST_SUCCESS,
+    CONTENT_BROWSER_FALLBACK,
+    CONTENT_STORE_HIT,
+    CONTENT_STORE_MISS,
+    TICKERS_CONFIRMED,
+    TICKERS_UNKNOWN,
+    ALERTS_MATCHED,
+]
+
+
+def increment(name, amount=1):
+    """
+    Increase a counter, creating it if needed.
+
+    Args:
+        name (str): Counter name
+        amount (int): Amount to add
+
+    Returns:
+        int: The new value, or None if the cache is unavailable
+    """
+    key = KEY_PREFIX + name
+    try:
+        # add() is a no-op when the key exists, so concurrent callers never
+        # reset a counter another process has already started.
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, amount)
+    except Exception as e:
+        logger.warning(f"Could not increment metric {name}: {e}")
+        return None
+
+
+def get_counts(*names):
+    """
+    Read several counters at once.
+
+    Args:
+        *names (str): Counter names
+
+    Returns:
+        dict: Counter name to current value (0 when unset)
+    """
+    keys = {KEY_PREFIX + name: name for name in names}
+    try:
+        values = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Could not read metrics {names}: {e}")
+        values = {}
+    return {name: values.get(key, 0) for key, name in keys.items()}
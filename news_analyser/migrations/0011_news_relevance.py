@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0010_alter_news_link_alter_news_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='is_market_relevant',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='relevance_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:16
+
+from django.db import migrations, models
+
+
+def backfill_analysis_status(apps, schema_editor):
+    """
+    Derive the status of existing rows from the old implicit signal.
+
+    Before this migration a non-zero impact_rating was the only evidence of
+    an analysis, so rows with a rating are marked done and everything else
+    stays pending (or skipped when the relevance filter rejected it).
+    """
+    News = apps.get_model('news_analyser', 'News')
+    News.objects.exclude(impact_rating=0).update(
+        analysis_status='done', analysed_at=models.F('updated_at'))
+    News.objects.filter(impact_rating=0, is_market_relevant=False).update(
+        analysis_status='skipped')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0011_news_relevance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='analysed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='analysis_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='analysis_version',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(backfill_analysis_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('analysis_status__in', ['pending', 'queued', 'running'])), fields=['keyword', 'analysis_status'], name='news_unfinished_analysis_idx'),
+        ),
+    ]
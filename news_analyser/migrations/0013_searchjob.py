@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0012_news_analysis_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(blank=True, max_length=500)),
+                ('search_type', models.CharField(default='keyword', max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('total_news', models.PositiveIntegerField(default=0)),
+                ('completed_news', models.PositiveIntegerField(default=0)),
+                ('failed_news', models.PositiveIntegerField(default=0)),
+                ('celery_group_id', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('keywords', models.ManyToManyField(blank=True, related_name='search_jobs', to='news_analyser.keyword')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='news_analys_user_id_e8cdd6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0013_searchjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('html', models.BinaryField(blank=True, default=b'')),
+                ('html_bytes', models.PositiveIntegerField(default=0)),
+                ('content', models.TextField(blank=True)),
+                ('extraction_method', models.CharField(blank=True, max_length=50)),
+                ('extractor_version', models.PositiveSmallIntegerField(default=0)),
+                ('fetched_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('accessed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
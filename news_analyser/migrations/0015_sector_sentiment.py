@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0014_articlecontent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsSector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hits', models.PositiveSmallIntegerField(default=1)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sector_matches', to='news_analyser.news')),
+                ('sector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='news_matches', to='news_analyser.sector')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sector', 'news'], name='news_analys_sector__74325e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('news', 'sector'), name='unique_news_sector')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SectorSentimentDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('news_count', models.PositiveIntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0)),
+                ('positive', models.PositiveIntegerField(default=0)),
+                ('negative', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sentiment', to='news_analyser.sector')),
+            ],
+            options={
+                'ordering': ['sector', 'day'],
+                'constraints': [models.UniqueConstraint(fields=('sector', 'day'), name='unique_sector_day')],
+            },
+        ),
+    ]
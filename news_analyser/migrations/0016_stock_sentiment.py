@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0015_sector_sentiment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_matches', to='news_analyser.news')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='news_matches', to='news_analyser.stock')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stock', 'news'], name='news_analys_stock_i_f663ed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('news', 'stock'), name='unique_news_stock')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSentimentDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('news_count', models.PositiveIntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0)),
+                ('positive', models.PositiveIntegerField(default=0)),
+                ('negative', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sentiment', to='news_analyser.stock')),
+            ],
+            options={
+                'ordering': ['stock', 'day'],
+                'constraints': [models.UniqueConstraint(fields=('stock', 'day'), name='unique_stock_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0016_stock_sentiment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='extracted_tickers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0017_news_extracted_tickers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='aliases',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
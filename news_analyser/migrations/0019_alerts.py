@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0018_stock_aliases'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('symbols', models.JSONField(blank=True, default=list)),
+                ('keywords', models.JSONField(blank=True, default=list)),
+                ('include_watchlist', models.BooleanField(default=False)),
+                ('sentiment_above', models.FloatField(blank=True, null=True)),
+                ('sentiment_below', models.FloatField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sector', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_queries', to='news_analyser.sector')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_queries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Saved queries',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Alert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='news_analyser.news')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to=settings.AUTH_USER_MODEL)),
+                ('saved_query', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='news_analyser.savedquery')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='news_analys_user_id_988393_idx'), models.Index(condition=models.Q(('read_at__isnull', True)), fields=['user'], name='alert_unread_idx')],
+                'constraints': [models.UniqueConstraint(fields=('saved_query', 'news'), name='unique_alert_per_query')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_analyser', '0019_alerts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50)),
+                ('tf', models.PositiveSmallIntegerField(default=1)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='news_analyser.news')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('term', 'news'), name='unique_news_term')],
+            },
+        ),
+    ]
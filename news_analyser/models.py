@@ -5,11 +5,15 @@ keywords, stocks, user profiles, and related metadata.
 """
 
 from .prompts import news_analysis_prompt
+from .relevance import score_article
+from .entities import extract_tickers
+from .query import index_news_terms
 from django.utils import timezone
 from django.db import models
 from email.utils import parsedate_to_datetime
 from blackbox.settings import GEMINI_API_KEY
 import logging
+import zlib
 
 logger = logging.getLogger(__name__)
 
@@ -85,8 +89,30 @@ class News(models.Model):
         sentiment_explanation (str): Why this sentiment was assigned
         sentiment_confidence (float): Model confidence in sentiment (0-1)
         mentioned_tickers (list): Stock symbols mentioned in article
+        extracted_tickers (list): Symbols found locally at ingest
         raw_gemini_response (dict): Full API response for debugging
+        relevance_score (float): Local finance-lexicon relevance score
+        is_market_relevant (bool): Whether the pre-filter passed the article
+        analysis_status (str): Where the article is in the analysis pipeline
+        analysed_at (datetime): When the last successful analysis finished
+        analysis_version (str): Prompt and model version of that analysis
     """
+
+    class AnalysisStatus(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+        SKIPPED = 'skipped', 'Skipped'
+
+    # Statuses that still expect an analysis result
+    UNFINISHED_STATUSES = [
+        AnalysisStatus.PENDING,
+        AnalysisStatus.QUEUED,
+        AnalysisStatus.RUNNING,
+    ]
+
     title = models.CharField(max_length=500)
     content_summary = models.TextField()
     content = models.TextField(null=True, blank=True)
@@ -102,8 +128,19 @@ class News(models.Model):
     sentiment_explanation = models.TextField(null=True, blank=True)
     sentiment_confidence = models.FloatField(default=0, null=True, blank=True)
     mentioned_tickers = models.JSONField(default=list, blank=True)
+    extracted_tickers = models.JSONField(default=list, blank=True)
     raw_gemini_response = models.JSONField(default=dict, blank=True)
 
+    # Local relevance pre-filter
+    relevance_score = models.FloatField(null=True, blank=True)
+    is_market_relevant = models.BooleanField(default=True, db_index=True)
+
+    # Analysis pipeline state
+    analysis_status = models.CharField(
+        max_length=10, choices=AnalysisStatus.choices, default=AnalysisStatus.PENDING)
+    analysed_at = models.DateTimeField(null=True, blank=True)
+    analysis_version = models.CharField(max_length=100, blank=True, default='')
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -116,11 +153,23 @@ class News(models.Model):
             models.Index(fields=['impact_rating']),
             models.Index(fields=['-date']),
             models.Index(fields=['source', 'date']),
+            # Small partial index so progress polling only touches rows
+            # that are still waiting on an analysis
+            models.Index(
+                fields=['keyword', 'analysis_status'],
+                name='news_unfinished_analysis_idx',
+                condition=models.Q(analysis_status__in=['pending', 'queued', 'running']),
+            ),
         ]
 
     def __str__(self):
         return self.title
 
+    @property
+    def is_analysis_finished(self):
+        """Whether the article has reached a terminal analysis status."""
+        return self.analysis_status not in self.UNFINISHED_STATUSES
+
     @staticmethod
     def parse_news(news, kwd):
         """
@@ -229,9 +278,23 @@ class News(models.Model):
                     defaults={'name': 'Other Source', 'url': ''}
                 )[0]
 
+            # Score market relevance locally before any Gemini call is spent
+            relevance = score_article(obj.title, obj.content_summary, kwd.name)
+            obj.relevance_score = relevance.score
+            obj.is_market_relevant = relevance.is_relevant
+            if not relevance.is_relevant:
+                logger.debug(
+                    f"Marked as not market-relevant (score {relevance.score}): {obj.link}"
+                )
+
+            # Tickers are known before analysis and cross-checked after it
+            obj.extracted_tickers = extract_tickers(obj.title, obj.content_summary)
+            obj.mentioned_tickers = list(obj.extracted_tickers)
+
             obj.keyword = kwd
             obj.date = date
             obj.save()
+            index_news_terms(obj)
             logger.info(f"Created new news entry: {obj.title[:50]}...")
             return obj
 
@@ -239,21 +302,6 @@ class News(models.Model):
             logger.error(f"Error parsing news: {e}", exc_info=True)
             raise
 
-    async def get_content(self):
-        """
-        Extract full article content using browser automation.
-
-        Returns:
-            dict: Content extraction result
-        """
-        from .br_use import get_news
-        try:
-            content = await get_news(self.link)
-            return content
-        except Exception as e:
-            logger.error(f"Failed to extract content from {self.link}: {e}")
-            return {'content': '', 'error': str(e)}
-
 
 class Sector(models.Model):
     """
@@ -273,6 +321,66 @@ class Sector(models.Model):
         return self.name
 
 
+class NewsSector(models.Model):
+    """
+    A sector an article was matched to by ``sectors.SectorMatcher``.
+
+    Attributes:
+        news (News): The matched article
+        sector (Sector): The sector it matched
+        hits (int): Number of sector terms and member stocks found
+    """
+    news = models.ForeignKey('News', on_delete=models.CASCADE, related_name='sector_matches')
+    sector = models.ForeignKey(Sector, on_delete=models.CASCADE, related_name='news_matches')
+    hits = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'sector'], name='unique_news_sector'),
+        ]
+        indexes = [
+            models.Index(fields=['sector', 'news']),
+        ]
+
+    def __str__(self):
+        return f"{self.sector} <- news {self.news_id}"
+
+
+class SectorSentimentDaily(models.Model):
+    """
+    Precomputed sentiment of a sector's analysed news for one day.
+
+    Attributes:
+        sector (Sector): The sector
+        day (date): Publication day of the news, in the project time zone
+        news_count (int): Analysed articles matched to the sector that day
+        sentiment_sum (float): Sum of their impact ratings
+        positive (int): Articles rated above +0.3
+        negative (int): Articles rated below -0.3
+        updated_at (datetime): When the row was last recomputed
+    """
+    sector = models.ForeignKey(Sector, on_delete=models.CASCADE, related_name='daily_sentiment')
+    day = models.DateField()
+    news_count = models.PositiveIntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0)
+    positive = models.PositiveIntegerField(default=0)
+    negative = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['sector', 'day']
+        constraints = [
+            models.UniqueConstraint(fields=['sector', 'day'], name='unique_sector_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.sector} {self.day}: {self.avg_sentiment:.2f}"
+
+    @property
+    def avg_sentiment(self):
+        return self.sentiment_sum / self.news_count if self.news_count else 0.0
+
+
 class Stock(models.Model):
     """
     NSE-listed stock information.
@@ -282,9 +390,11 @@ class Stock(models.Model):
         symbol (str): NSE stock symbol (e.g., RELIANCE, TCS)
         sector (ForeignKey): Associated sector
         keywords (ManyToMany): Related search keywords
+        aliases (list): Extra names the company goes by in news (e.g. "RIL")
     """
     name = models.CharField(max_length=200)
     symbol = models.CharField(max_length=20, unique=True, db_index=True)
+    aliases = models.JSONField(default=list, blank=True)
     sector = models.ForeignKey(
         Sector, on_delete=models.CASCADE, related_name="stocks", null=True, blank=True)
     keywords = models.ManyToManyField(
@@ -301,6 +411,89 @@ class Stock(models.Model):
         return f"{self.symbol} - {self.name}"
 
 
+class NewsStock(models.Model):
+    """
+    A stock an analysed article is about.
+
+    Attributes:
+        news (News): The article
+        stock (Stock): A stock it mentions or was searched for
+    """
+    news = models.ForeignKey('News', on_delete=models.CASCADE, related_name='stock_matches')
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='news_matches')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['news', 'stock'], name='unique_news_stock'),
+        ]
+        indexes = [
+            models.Index(fields=['stock', 'news']),
+        ]
+
+    def __str__(self):
+        return f"{self.stock} <- news {self.news_id}"
+
+
+class NewsTerm(models.Model):
+    """
+    Postings entry: a word and how often it occurs in an article.
+
+    Built from the title, summary and content at ingest (see
+    ``query.index_news_terms``) and read by boolean queries.
+
+    Attributes:
+        term (str): Lower-case word
+        news (ForeignKey): Article containing the word
+        tf (int): Occurrences of the word in the article
+    """
+    term = models.CharField(max_length=50)
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name="terms")
+    tf = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'news'], name='unique_news_term'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} in {self.news_id}"
+
+
+class StockSentimentDaily(models.Model):
+    """
+    Precomputed sentiment of a stock's analysed news for one day.
+
+    Attributes:
+        stock (Stock): The stock
+        day (date): Publication day of the news, in the project time zone
+        news_count (int): Analysed articles about the stock that day
+        sentiment_sum (float): Sum of their impact ratings
+        positive (int): Articles rated above +0.3
+        negative (int): Articles rated below -0.3
+        updated_at (datetime): When the row was last recomputed
+    """
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='daily_sentiment')
+    day = models.DateField()
+    news_count = models.PositiveIntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0)
+    positive = models.PositiveIntegerField(default=0)
+    negative = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['stock', 'day']
+        constraints = [
+            models.UniqueConstraint(fields=['stock', 'day'], name='unique_stock_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.stock.symbol} {self.day}: {self.avg_sentiment:.2f}"
+
+    @property
+    def avg_sentiment(self):
+        return self.sentiment_sum / self.news_count if self.news_count else 0.0
+
+
 class Source(models.Model):
     """
     News source metadata.
@@ -319,3 +512,231 @@ class Source(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class SearchJob(models.Model):
+    """
+    A single search submission and the analyses it dispatched.
+
+    Progress counters live on this row and are updated atomically with F()
+    expressions as each analysis finishes, so status polling is a single
+    primary-key read instead of COUNT queries over the keyword's news.
+
+    Attributes:
+        user (User): User who submitted the search
+        query (str): Raw search input (keywords or stock symbols)
+        search_type (str): "keyword" or "stock"
+        keywords (ManyToMany): Keywords the search resolved to
+        status (str): Lifecycle state of the search
+        total_news (int): Number of analyses dispatched for this search
+        completed_news (int): Analyses finished, successfully or not
+        failed_news (int): Analyses that finished with an error
+        celery_group_id (str): ID of the Celery group running the analyses
+        created_at (datetime): When the search was submitted
+        finished_at (datetime): When the last analysis finished
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    user = models.ForeignKey(
+        'auth.User', on_delete=models.CASCADE, related_name='search_jobs',
+        null=True, blank=True)
+    query = models.CharField(max_length=500, blank=True)
+    search_type = models.CharField(max_length=10, default='keyword')
+    keywords = models.ManyToManyField(Keyword, blank=True, related_name='search_jobs')
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING)
+    total_news = models.PositiveIntegerField(default=0)
+    completed_news = models.PositiveIntegerField(default=0)
+    failed_news = models.PositiveIntegerField(default=0)
+    celery_group_id = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Search #{self.pk}: {self.query}"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    def as_status_dict(self):
+        """Progress payload for status polling and push updates."""
+        return {
+            'job_id': self.pk,
+            'status': self.status,
+            'total_news': self.total_news,
+            'analysed_news': self.completed_news,
+            'failed_news': self.failed_news,
+            'done': self.is_finished,
+        }
+
+    @classmethod
+    def record_analysis(cls, job_id, succeeded):
+        """
+        Count one finished analysis against a search job.
+
+        Args:
+            job_id (int): SearchJob primary key
+            succeeded (bool): Whether the analysis produced a result
+
+        Returns:
+            bool: True if this call completed the job
+        """
+        cls.objects.filter(pk=job_id).update(
+            completed_news=models.F('completed_news') + 1,
+            failed_news=models.F('failed_news') + (0 if succeeded else 1),
+        )
+        # Failed analyses never reach the chord callback, so the last
+        # counter update also completes the job.
+        return cls.objects.filter(
+            pk=job_id, completed_news__gte=models.F('total_news')
+        ).exists() and cls.finish(job_id)
+
+    @classmethod
+    def finish(cls, job_id, status=None):
+        """
+        Move a job to a terminal status exactly once.
+
+        Args:
+            job_id (int): SearchJob primary key
+            status (str): Terminal status, defaults to DONE
+
+        Returns:
+            bool: True if this call performed the transition
+        """
+        return bool(cls.objects.filter(
+            pk=job_id, status__in=[cls.Status.PENDING, cls.Status.RUNNING]
+        ).update(status=status or cls.Status.DONE, finished_at=timezone.now()))
+
+
+class ArticleContent(models.Model):
+    """
+    Fetched article page and its extracted text, keyed by canonical URL.
+
+    Shared by every News row pointing at the same article, so re-fetches and
+    re-analyses read from here instead of hitting the publisher again. The
+    raw HTML is kept zlib-compressed so a newer extractor can re-run over it
+    without a network request.
+
+    Attributes:
+        url (str): Canonical article URL
+        html (bytes): zlib-compressed page HTML, empty for browser extractions
+        html_bytes (int): Size of ``html`` as stored, used for eviction
+        content (str): Extracted article text, empty if extraction failed
+        extraction_method (str): Extractor that produced ``content``
+        extractor_version (int): ``extractors.EXTRACTOR_VERSION`` at extraction
+        fetched_at (datetime): When the page was downloaded
+        accessed_at (datetime): Last time the entry was read
+    """
+
+    url = models.CharField(max_length=500, unique=True)
+    html = models.BinaryField(blank=True, default=b'')
+    html_bytes = models.PositiveIntegerField(default=0)
+    content = models.TextField(blank=True)
+    extraction_method = models.CharField(max_length=50, blank=True)
+    extractor_version = models.PositiveSmallIntegerField(default=0)
+    fetched_at = models.DateTimeField(default=timezone.now, db_index=True)
+    accessed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.url
+
+    def get_html(self):
+        """Return the decompressed page HTML, or an empty string."""
+        return zlib.decompress(bytes(self.html)).decode('utf-8') if self.html else ''
+
+    def set_html(self, html):
+        """Compress and store page HTML."""
+        self.html = zlib.compress(html.encode('utf-8'), 6) if html else b''
+        self.html_bytes = len(self.html)
+
+
+class SavedQuery(models.Model):
+    """
+    A standing query that raises alerts when new articles match it.
+
+    An article matches when it mentions one of the query's symbols (or, with
+    ``include_watchlist``, one of the user's watchlist stocks), contains one
+    of its keywords, or belongs to its sector; and, when sentiment bounds
+    are set, its analysed sentiment is at or above ``sentiment_above`` or at
+    or below ``sentiment_below``.
+
+    Attributes:
+        user (User): Owner of the query and its alerts
+        name (str): Label shown in the alert inbox
+        symbols (list): NSE symbols to watch
+        keywords (list): Words or phrases to look for, matched on whole words
+        sector (ForeignKey): Sector to watch
+        include_watchlist (bool): Also watch the user's portfolio stocks
+        sentiment_above (float): Alert only on sentiment at or above this
+        sentiment_below (float): Alert only on sentiment at or below this
+        is_active (bool): Whether the query is evaluated
+        created_at (datetime): When the query was saved
+    """
+
+    user = models.ForeignKey('auth.User', on_delete=models.CASCADE, related_name='saved_queries')
+    name = models.CharField(max_length=100)
+    symbols = models.JSONField(default=list, blank=True)
+    keywords = models.JSONField(default=list, blank=True)
+    sector = models.ForeignKey(
+        Sector, on_delete=models.CASCADE, related_name='saved_queries', null=True, blank=True)
+    include_watchlist = models.BooleanField(default=False)
+    sentiment_above = models.FloatField(null=True, blank=True)
+    sentiment_below = models.FloatField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = "Saved queries"
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def has_sentiment_filter(self):
+        return self.sentiment_above is not None or self.sentiment_below is not None
+
+
+class Alert(models.Model):
+    """
+    An article that matched one of a user's saved queries.
+
+    Attributes:
+        user (User): Recipient, denormalised from the query for the inbox
+        saved_query (ForeignKey): Query that matched
+        news (ForeignKey): Matching article
+        created_at (datetime): When the match was found
+        read_at (datetime): When the user marked it read
+    """
+
+    user = models.ForeignKey('auth.User', on_delete=models.CASCADE, related_name='alerts')
+    saved_query = models.ForeignKey(SavedQuery, on_delete=models.CASCADE, related_name='alerts')
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='alerts')
+    created_at = models.DateTimeField(default=timezone.now)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['saved_query', 'news'], name='unique_alert_per_query'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(
+                fields=['user'], name='alert_unread_idx', condition=models.Q(read_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.saved_query}: {self.news}"
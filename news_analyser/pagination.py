@@ -0,0 +1,111 @@
+"""
+Keyset (cursor) pagination, newest first.
+
+Offset pagination gets slower the deeper a user pages and shifts rows when
+new news arrives. Here a page is instead "rows strictly older than the last
+one shown", ordered by a timestamp with the primary key as tie-breaker, so
+every page is a bounded index range scan (e.g. over ``(keyword, date)``) and
+cursors stay stable while new rows are inserted at the head.
+
+Cursors are opaque URL-safe strings encoding the timestamp and primary key
+of the last row on the previous page.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional
+
+from django.db.models import Q
+
+from .exceptions import InvalidCursorError
+
+
+class Page(NamedTuple):
+    """One page of results and the cursor for the next one, if any."""
+    object_list: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(timestamp, pk):
+    """
+    Build an opaque cursor pointing after a row.
+
+    Args:
+        timestamp (datetime): Ordering value of the row
+        pk (int): Primary key of the row
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = f"{timestamp.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): Cursor from a previous page
+
+    Returns:
+        tuple: ``(timestamp, pk)``
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, pk = base64.urlsafe_b64decode(padded).decode('utf-8').split('|')
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}") from e
+
+
+def cursor_for(obj, field):
+    """Cursor pointing after ``obj`` (a model or ``values()`` row) when ordered by ``field``."""
+    if isinstance(obj, dict):
+        return encode_cursor(obj[field], obj['id'])
+    return encode_cursor(getattr(obj, field), obj.pk)
+
+
+def after_cursor(cursor, field):
+    """
+    Filter selecting rows that come after a cursor, newest first.
+
+    Args:
+        cursor (str): Cursor from a previous page
+        field (str): Timestamp field the rows are ordered by
+
+    Returns:
+        Q: Filter for rows older than the cursor
+    """
+    timestamp, pk = decode_cursor(cursor)
+    return Q(**{f"{field}__lt": timestamp}) | Q(**{field: timestamp, 'pk__lt': pk})
+
+
+def paginate(queryset, cursor=None, page_size=25, field='date'):
+    """
+    Fetch one page of a queryset ordered newest first.
+
+    Args:
+        queryset (QuerySet): Rows to page through
+        cursor (str): Cursor from the previous page, None for the first page
+        page_size (int): Maximum rows per page
+        field (str): Timestamp field to order by
+
+    Returns:
+        Page: The rows and the cursor for the next page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    if cursor:
+        queryset = queryset.filter(after_cursor(cursor, field))
+    # One extra row tells us whether another page exists
+    rows = list(queryset.order_by(f"-{field}", "-pk")[:page_size + 1])
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return Page(rows, cursor_for(rows[-1], field))
+    return Page(rows, None)
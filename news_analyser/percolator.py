@@ -0,0 +1,191 @@
+"""
+Standing-query percolator for watchlist alerts.
+
+Instead of running every user's saved queries against the news, all active
+``SavedQuery`` rows are compiled into one ``Percolator``: inverted indexes
+from symbol and sector to query, and a phrase trie over every query's
+keywords. An article is then evaluated once, by looking up its tickers and
+sectors and walking its tokens through the trie; only the few candidate
+queries that come out are checked against their sentiment bounds. The cost
+follows article volume, not the number of users or queries.
+
+Articles are percolated when ingested and again when analysed. Queries with
+sentiment bounds can only match after analysis; ``Alert`` is unique per
+query and article, so the second pass never duplicates the first.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+
+from . import metrics
+from .cache import percolator_version
+from .entities import PhraseTrie, normalize_symbol, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class QuerySpec(NamedTuple):
+    """The parts of a saved query the percolator needs."""
+    id: int
+    user_id: int
+    symbols: frozenset
+    keywords: tuple
+    sector_id: Optional[int]
+    sentiment_above: Optional[float]
+    sentiment_below: Optional[float]
+
+    def accepts_sentiment(self, sentiment):
+        """Whether an article's sentiment (None before analysis) passes the bounds."""
+        if self.sentiment_above is None and self.sentiment_below is None:
+            return True
+        if sentiment is None:
+            return False
+        return ((self.sentiment_above is not None and sentiment >= self.sentiment_above)
+                or (self.sentiment_below is not None and sentiment <= self.sentiment_below))
+
+
+class Percolator:
+    """
+    Every active saved query, compiled for matching one article at a time.
+
+    Args:
+        specs (iterable): ``QuerySpec`` for each query
+    """
+
+    def __init__(self, specs):
+        self._specs: Dict[int, QuerySpec] = {}
+        self._by_symbol: Dict[str, set] = {}
+        self._by_sector: Dict[int, set] = {}
+        self._keywords = PhraseTrie()
+        for spec in specs:
+            self._specs[spec.id] = spec
+            for symbol in spec.symbols:
+                self._by_symbol.setdefault(symbol, set()).add(spec.id)
+            if spec.sector_id is not None:
+                self._by_sector.setdefault(spec.sector_id, set()).add(spec.id)
+            for keyword in spec.keywords:
+                self._keywords.add(tuple(tokenize(keyword)), spec.id)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def match(self, text, tickers=(), sector_ids=(), sentiment=None) -> List[QuerySpec]:
+        """
+        Saved queries an article matches.
+
+        Args:
+            text (str): Article text
+            tickers (iterable): Symbols the article mentions
+            sector_ids (iterable): Sectors the article belongs to
+            sentiment (float): Analysed sentiment, None if not analysed yet
+
+        Returns:
+            list: Matching ``QuerySpec``, ordered by query ID
+        """
+        candidates = set()
+        for ticker in tickers:
+            candidates |= self._by_symbol.get(normalize_symbol(ticker), set())
+        for sector_id in sector_ids:
+            candidates |= self._by_sector.get(sector_id, set())
+        if self._keywords:
+            candidates |= self._keywords.find(tokenize(text or ""))
+        return [
+            self._specs[query_id] for query_id in sorted(candidates)
+            if self._specs[query_id].accepts_sentiment(sentiment)
+        ]
+
+
+_percolator: Optional[Percolator] = None
+_percolator_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _load_specs():
+    from .models import SavedQuery, Stock
+
+    queries = list(SavedQuery.objects.filter(is_active=True))
+    watchlists = {}
+    watchers = {query.user_id for query in queries if query.include_watchlist}
+    if watchers:
+        for user_id, symbol in Stock.objects.filter(
+                users__user_id__in=watchers).values_list('users__user_id', 'symbol'):
+            watchlists.setdefault(user_id, set()).add(symbol)
+
+    specs = []
+    for query in queries:
+        symbols = {normalize_symbol(symbol) for symbol in query.symbols or ()}
+        if query.include_watchlist:
+            symbols |= watchlists.get(query.user_id, set())
+        specs.append(QuerySpec(
+            id=query.id, user_id=query.user_id, symbols=frozenset(symbols - {""}),
+            keywords=tuple(keyword for keyword in query.keywords or () if keyword.strip()),
+            sector_id=query.sector_id, sentiment_above=query.sentiment_above,
+            sentiment_below=query.sentiment_below,
+        ))
+    return specs
+
+
+def get_percolator():
+    """
+    Return this process's percolator, recompiling it after query changes.
+
+    Returns:
+        Percolator: The current percolator
+    """
+    global _percolator, _percolator_version, _checked_at
+    now = time.monotonic()
+    percolator = _percolator
+    if percolator is not None and now - _checked_at < settings.PERCOLATOR_REFRESH_SECONDS:
+        return percolator
+
+    with _lock:
+        version = percolator_version()
+        _checked_at = now
+        if _percolator is None or version != _percolator_version:
+            _percolator = Percolator(_load_specs())
+            _percolator_version = version
+            logger.info(f"Compiled percolator with {len(_percolator)} saved queries")
+        return _percolator
+
+
+def invalidate_local_percolator():
+    """Drop this process's percolator so the next match recompiles it."""
+    global _percolator
+    _percolator = None
+
+
+def percolate(news):
+    """
+    Raise alerts for every saved query an article matches.
+
+    Args:
+        news (News): A newly ingested or analysed article
+
+    Returns:
+        int: Number of matching queries
+    """
+    from .models import Alert, News
+    from .sectors import match_news
+
+    percolator = get_percolator()
+    if not len(percolator):
+        return 0
+    analysed = news.analysis_status == News.AnalysisStatus.DONE
+    matches = percolator.match(
+        "\n".join(filter(None, [news.title, news.content_summary, news.content])),
+        tickers=set(news.mentioned_tickers or ()) | set(news.extracted_tickers or ()),
+        sector_ids=match_news(news),
+        sentiment=news.impact_rating if analysed else None,
+    )
+    if matches:
+        Alert.objects.bulk_create(
+            [Alert(user_id=spec.user_id, saved_query_id=spec.id, news=news) for spec in matches],
+            ignore_conflicts=True)
+        metrics.increment(metrics.ALERTS_MATCHED, len(matches))
+        logger.debug(f"News ID {news.id} matched saved queries {[spec.id for spec in matches]}")
+    return len(matches)
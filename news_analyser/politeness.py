@@ -0,0 +1,219 @@
+"""
+Per-host politeness for fetching publisher pages.
+
+Bulk content extraction tends to hit a handful of publisher hosts at once.
+Every plain-HTTP article fetch goes through ``polite_get``, which for each
+host enforces:
+
+- a cap on concurrent requests (``POLITE_HOST_CONCURRENCY``),
+- a minimum gap between request starts: ``POLITE_MIN_DELAY`` or the host's
+  robots.txt ``Crawl-delay`` if larger (cached for ``POLITE_ROBOTS_TTL``),
+- adaptive backoff after 429/503 responses, honouring ``Retry-After`` and
+  doubling on each consecutive throttle up to ``POLITE_BACKOFF_MAX``.
+
+State lives in the Django cache, so the limits are only global when every
+web and Celery process uses the same Redis cache (``CACHE_URL``); workers
+refuse to start on the per-process fallback. Slots are leased with a
+timeout so a crashed worker cannot hold one forever, and each lease carries
+a token so a fetch that outlives its lease never frees a slot another
+request has since taken.
+
+A fetch that cannot start within ``POLITE_MAX_WAIT`` seconds raises
+``HostThrottledError`` with a suggested delay; tasks retry later instead of
+tying up a worker.
+"""
+
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from urllib import robotparser
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+
+from .exceptions import HostThrottledError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "polite:"
+THROTTLE_STATUSES = {429, 503}
+NO_CRAWL_DELAY = -1
+POLL_INTERVAL = 0.25
+
+
+def host_of(url):
+    """Lower-case host name of a URL."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _key(kind, host, *extra):
+    return ":".join([KEY_PREFIX + kind, host, *map(str, extra)])
+
+
+def crawl_delay(host, user_agent="*"):
+    """
+    The host's robots.txt ``Crawl-delay``, fetched once and cached.
+
+    Args:
+        host (str): Host name
+        user_agent (str): User agent to read the delay for
+
+    Returns:
+        float: Seconds between requests, or None if the host sets none
+    """
+    key = _key("robots", host)
+    delay = cache.get(key)
+    if delay is None:
+        parser = robotparser.RobotFileParser()
+        try:
+            response = requests.get(f"https://{host}/robots.txt", timeout=5)
+            parser.parse(response.text.splitlines() if response.ok else [])
+            delay = parser.crawl_delay(user_agent) or NO_CRAWL_DELAY
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"Could not read robots.txt for {host}: {e}")
+            delay = NO_CRAWL_DELAY
+        cache.set(key, delay, timeout=settings.POLITE_ROBOTS_TTL)
+    return None if delay == NO_CRAWL_DELAY else float(delay)
+
+
+def min_delay(host):
+    """Minimum seconds between request starts for a host."""
+    delay = max(settings.POLITE_MIN_DELAY, crawl_delay(host) or 0)
+    return min(delay, settings.POLITE_MAX_CRAWL_DELAY)
+
+
+def backoff_remaining(host):
+    """Seconds left on the host's backoff, 0 if it is not backing off."""
+    until = cache.get(_key("backoff", host))
+    return max(0.0, until - time.time()) if until else 0.0
+
+
+def record_response(host, status_code, retry_after=None):
+    """
+    Adapt a host's backoff to the status of a response from it.
+
+    Args:
+        host (str): Host name
+        status_code (int): HTTP status of the response
+        retry_after (str): ``Retry-After`` header value, if any
+    """
+    level_key = _key("level", host)
+    if status_code not in THROTTLE_STATUSES:
+        cache.delete(level_key)
+        return
+
+    cache.add(level_key, 0, timeout=settings.POLITE_BACKOFF_MAX * 4)
+    level = cache.incr(level_key)
+    delay = min(settings.POLITE_BACKOFF_BASE * 2 ** (level - 1), settings.POLITE_BACKOFF_MAX)
+    if retry_after and retry_after.strip().isdigit():
+        delay = min(max(delay, int(retry_after)), settings.POLITE_BACKOFF_MAX)
+    cache.set(_key("backoff", host), time.time() + delay, timeout=math.ceil(delay))
+    logger.warning(f"{host} answered {status_code}; backing off for {delay}s")
+
+
+# Delete a key only while it still holds our token
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _acquire_slot(host, lease):
+    """Lease a free slot for the host, returning ``(key, token)`` or None."""
+    token = uuid.uuid4().hex
+    for slot in range(settings.POLITE_HOST_CONCURRENCY):
+        key = _key("slot", host, slot)
+        if cache.add(key, token, timeout=lease):
+            return key, token
+    return None
+
+
+def _release_slot(slot):
+    """
+    Free a slot, unless its lease ran out and another request now holds it.
+
+    On Redis the check and delete are one atomic script; other backends
+    check then delete, which leaves only a tiny window for the same race.
+    """
+    key, token = slot
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        redis_key = backend.make_and_validate_key(key)
+        client = backend._cache.get_client(redis_key, write=True)
+        client.eval(_RELEASE_SCRIPT, 1, redis_key, backend._cache._serializer.dumps(token))
+    elif backend.get(key) == token:
+        backend.delete(key)
+
+
+@contextmanager
+def host_slot(url, max_wait=None):
+    """
+    Wait for permission to send one request to a URL's host.
+
+    Args:
+        url (str): URL about to be fetched
+        max_wait (float): Seconds to wait; defaults to ``POLITE_MAX_WAIT``
+
+    Raises:
+        HostThrottledError: If the host is backing off or stays busy
+    """
+    host = host_of(url)
+    max_wait = settings.POLITE_MAX_WAIT if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+    delay = min_delay(host)
+    # Leases outlive any single fetch so crashed workers release their slot
+    lease = settings.CONTENT_FETCH_TIMEOUT * 2
+
+    slot = None
+    while True:
+        remaining = backoff_remaining(host)
+        if remaining > max_wait:
+            raise HostThrottledError(f"{host} is backing off", retry_after=remaining)
+        if not remaining:
+            slot = slot or _acquire_slot(host, lease)
+            # The gate key exists for ``delay`` seconds after each request start
+            if slot and cache.add(_key("gate", host), 1, timeout=max(1, math.ceil(delay))):
+                break
+        if time.monotonic() >= deadline:
+            if slot:
+                _release_slot(slot)
+            raise HostThrottledError(f"{host} is busy", retry_after=max(delay, remaining, 1))
+        time.sleep(max(POLL_INTERVAL, min(remaining, 1)))
+
+    try:
+        yield
+    finally:
+        _release_slot(slot)
+
+
+def polite_get(url, **kwargs):
+    """
+    ``requests.get`` that respects the host's limits.
+
+    Args:
+        url (str): URL to fetch
+        **kwargs: Passed to ``requests.get``
+
+    Returns:
+        requests.Response: The response, whatever its status
+
+    Raises:
+        HostThrottledError: If the host is backing off or stays busy
+        requests.RequestException: If the request fails
+    """
+    host = host_of(url)
+    with host_slot(url):
+        response = requests.get(url, **kwargs)
+    record_response(host, response.status_code, response.headers.get("Retry-After"))
+    if response.status_code in THROTTLE_STATUSES:
+        raise HostThrottledError(
+            f"{host} throttled the request with {response.status_code}",
+            retry_after=backoff_remaining(host))
+    return response
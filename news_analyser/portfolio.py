@@ -0,0 +1,219 @@
+"""
+Watchlist sentiment from precomputed per-stock aggregates.
+
+When an analysis finishes, ``index_news`` links the article to the stocks
+it is about and recomputes those stocks' ``StockSentimentDaily`` rows for
+the article's day. An article is about a stock when Gemini listed the
+symbol among its tickers, when local extraction found it (see
+``entities.cross_check_tickers``), or when the article came from a search
+for that symbol.
+
+``portfolio_summary`` builds a user's dashboard from those rows in a single
+query, whatever the size of the watchlist:
+
+- score: average sentiment over the last ``PORTFOLIO_WINDOW_DAYS``
+- trend: change against the window before it
+- top movers: the stocks with the largest absolute trend
+
+The summary is cached per user (see ``cache.get_portfolio``).
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, FilteredRelation, Q, Sum
+from django.utils import timezone
+
+from .cache import bump_stock_sentiment_version, get_portfolio
+from .entities import normalize_symbol
+from .sectors import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD, day_bounds
+
+logger = logging.getLogger(__name__)
+
+
+def stocks_for_news(news):
+    """
+    IDs of the stocks an article is about.
+
+    Args:
+        news (News): The article
+
+    Returns:
+        set: Stock IDs
+    """
+    from .models import Stock
+
+    tickers = set(news.mentioned_tickers or ()) | set(news.extracted_tickers or ())
+    symbols = {normalize_symbol(ticker) for ticker in tickers}
+    symbols.add(normalize_symbol(news.keyword.name))
+    return set(Stock.objects.filter(symbol__in=symbols).values_list('id', flat=True))
+
+
+def refresh_daily_sentiment(stock_ids, day):
+    """
+    Recompute the daily sentiment rows of some stocks for one day.
+
+    Args:
+        stock_ids (iterable): Stocks to recompute
+        day (date): Day to recompute, in the project time zone
+    """
+    from .models import News, NewsStock, StockSentimentDaily
+
+    stock_ids = set(stock_ids)
+    if not stock_ids:
+        return
+    start, end = day_bounds(day)
+    rows = (
+        NewsStock.objects
+        .filter(stock_id__in=stock_ids, news__date__gte=start, news__date__lt=end,
+                news__analysis_status=News.AnalysisStatus.DONE)
+        .values('stock_id')
+        .annotate(
+            news_count=Count('news_id'),
+            sentiment_sum=Sum('news__impact_rating'),
+            positive=Count('news_id', filter=Q(news__impact_rating__gt=POSITIVE_THRESHOLD)),
+            negative=Count('news_id', filter=Q(news__impact_rating__lt=NEGATIVE_THRESHOLD)),
+        )
+    )
+    seen = set()
+    for row in rows:
+        stock_id = row.pop('stock_id')
+        seen.add(stock_id)
+        StockSentimentDaily.objects.update_or_create(stock_id=stock_id, day=day, defaults=row)
+    StockSentimentDaily.objects.filter(stock_id__in=stock_ids - seen, day=day).delete()
+    # Bumping before the rows commit would let a reader cache the old ones under the new version
+    transaction.on_commit(bump_stock_sentiment_version)
+
+
+def index_news(news):
+    """
+    Link an analysed article to its stocks and refresh their sentiment for its day.
+
+    Args:
+        news (News): An analysed article
+
+    Returns:
+        list: IDs of the stocks the article is about
+    """
+    from .models import NewsStock
+
+    stock_ids = stocks_for_news(news)
+    with transaction.atomic():
+        previous = set(NewsStock.objects.filter(news=news).values_list('stock_id', flat=True))
+        NewsStock.objects.filter(news=news).exclude(stock_id__in=stock_ids).delete()
+        NewsStock.objects.bulk_create(
+            [NewsStock(news=news, stock_id=stock_id) for stock_id in stock_ids - previous],
+            ignore_conflicts=True)
+        refresh_daily_sentiment(previous | stock_ids, timezone.localdate(news.date))
+    return sorted(stock_ids)
+
+
+def rebuild_stock_sentiment(since=None):
+    """
+    Re-link every analysed article to its stocks and recompute all daily rows.
+
+    Args:
+        since (date): Only rebuild from this day on
+
+    Returns:
+        int: Number of articles linked to at least one stock
+    """
+    from .models import News, NewsStock, StockSentimentDaily
+
+    news = News.objects.filter(analysis_status=News.AnalysisStatus.DONE).select_related('keyword')
+    if since:
+        news = news.filter(date__gte=day_bounds(since)[0])
+    touched = {}
+    linked = 0
+    for item in news.only('id', 'mentioned_tickers', 'extracted_tickers', 'date', 'keyword__name').iterator():
+        stock_ids = stocks_for_news(item)
+        NewsStock.objects.filter(news=item).delete()
+        NewsStock.objects.bulk_create([NewsStock(news=item, stock_id=stock_id) for stock_id in stock_ids])
+        touched.setdefault(timezone.localdate(item.date), set()).update(stock_ids)
+        linked += bool(stock_ids)
+
+    stale = StockSentimentDaily.objects.all()
+    if since:
+        stale = stale.filter(day__gte=since)
+    stale.delete()
+    for day, stock_ids in sorted(touched.items()):
+        refresh_daily_sentiment(stock_ids, day)
+    return linked
+
+
+def _average(rows):
+    count = sum(row[0] for row in rows)
+    return round(sum(row[1] for row in rows) / count, 4) if count else None
+
+
+def _build_summary(user_id):
+    from .models import Stock
+
+    window = settings.PORTFOLIO_WINDOW_DAYS
+    today = timezone.localdate()
+    since = today - timedelta(days=2 * window - 1)
+    current_from = today - timedelta(days=window - 1)
+
+    # One LEFT JOIN: every watchlist stock, with its recent daily rows if any
+    rows = (
+        Stock.objects
+        .filter(users__user_id=user_id)
+        .annotate(recent=FilteredRelation('daily_sentiment', condition=Q(daily_sentiment__day__gte=since)))
+        .values_list('id', 'symbol', 'name', 'recent__day', 'recent__news_count', 'recent__sentiment_sum')
+        .order_by('symbol', 'recent__day')
+    )
+
+    stocks = {}
+    for stock_id, symbol, name, day, news_count, sentiment_sum in rows:
+        entry = stocks.setdefault(stock_id, {
+            'id': stock_id, 'symbol': symbol, 'name': name, 'current': [], 'previous': [], 'series': {},
+        })
+        if day is None:
+            continue
+        bucket = entry['current'] if day >= current_from else entry['previous']
+        bucket.append((news_count, sentiment_sum))
+        entry['series'][day.isoformat()] = round(sentiment_sum / news_count, 4)
+
+    days = [(since + timedelta(days=offset)).isoformat() for offset in range(2 * window)]
+    summary_stocks = []
+    for entry in stocks.values():
+        score = _average(entry['current'])
+        previous = _average(entry['previous'])
+        summary_stocks.append({
+            'id': entry['id'],
+            'symbol': entry['symbol'],
+            'name': entry['name'],
+            'score': score,
+            'previous_score': previous,
+            'trend': round(score - previous, 4) if score is not None and previous is not None else None,
+            'news_count': sum(count for count, _ in entry['current']),
+            'series': [entry['series'].get(day) for day in days],
+        })
+
+    movers = sorted(
+        (stock for stock in summary_stocks if stock['trend'] is not None),
+        key=lambda stock: abs(stock['trend']), reverse=True)
+    return {
+        'as_of': today.isoformat(),
+        'window_days': window,
+        'days': days,
+        'stocks': summary_stocks,
+        'top_movers': movers[:settings.PORTFOLIO_TOP_MOVERS],
+    }
+
+
+def portfolio_summary(user):
+    """
+    Sentiment dashboard for a user's watchlist.
+
+    Args:
+        user (User): The user
+
+    Returns:
+        dict: ``stocks`` (score, previous score, trend, article count and a
+        daily series for each watchlist stock), ``top_movers``, ``days`` and
+        ``window_days``
+    """
+    return get_portfolio(user.id, lambda: _build_summary(user.id))
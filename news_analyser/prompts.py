@@ -5,6 +5,10 @@ This module contains prompts for analyzing news articles
 and generating structured sentiment analysis output.
 """
 
+# Bump whenever news_analysis_prompt changes in a way that affects scores.
+# Stored on each analysed article together with the model name.
+NEWS_ANALYSIS_PROMPT_VERSION = "2"
+
 news_analysis_prompt = """
 You are an expert financial analyst specializing in the Indian stock market. Your task is to analyze news articles and provide comprehensive sentiment analysis with specific attention to market impact.
 
@@ -0,0 +1,330 @@
+"""
+Boolean news queries over a postings index.
+
+Comma-separated keywords used to run as independent searches, leaving users
+to intersect the results by hand. This module parses a small query
+language once and evaluates it against ``NewsTerm`` postings of all
+ingested news, returning a single ranked result set.
+
+Syntax:
+
+- words match whole words, case-insensitively: ``infosys``
+- ``"quoted phrases"`` match consecutive words: ``"order book"``
+- ``AND``, ``OR`` and ``NOT`` combine them (upper case); adjacent terms
+  without an operator are ANDed: ``tcs "deal win" NOT layoffs``
+- parentheses group: ``(tcs OR infosys) AND guidance``
+
+Evaluation fetches the postings of every word in the query in one read,
+combines document sets bottom-up, verifies phrases against the candidate
+articles' text, and ranks the result by tf-idf of the positive terms.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, NamedTuple, Tuple, Union
+
+from django.conf import settings
+from django.db import transaction
+
+from .entities import tokenize
+from .exceptions import QuerySyntaxError
+
+logger = logging.getLogger(__name__)
+
+# Words too common to be worth a postings row; still honoured inside phrases
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will", "with",
+})
+MAX_TERM_LENGTH = 50
+
+_LEXER_RE = re.compile(r'\s*(?:"(?P<phrase>[^"]*)"?|(?P<paren>[()])|(?P<word>[^\s()"]+))')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+class Term(NamedTuple):
+    """A word or phrase, as lower-case tokens."""
+    tokens: Tuple[str, ...]
+
+
+class And(NamedTuple):
+    children: tuple
+
+
+class Or(NamedTuple):
+    children: tuple
+
+
+class Not(NamedTuple):
+    child: "Node"
+
+
+Node = Union[Term, And, Or, Not]
+
+
+def _lex(text):
+    tokens = []
+    for match in _LEXER_RE.finditer(text):
+        if match.group('phrase') is not None:
+            tokens.append(('TERM', tuple(tokenize(match.group('phrase')))))
+        elif match.group('paren'):
+            tokens.append((match.group('paren'), None))
+        elif match.group('word'):
+            word = match.group('word')
+            if word in _OPERATORS:
+                tokens.append((word, None))
+            else:
+                tokens.append(('TERM', tuple(tokenize(word))))
+    # Words that were only punctuation carry no tokens
+    return [token for token in tokens if token[0] != 'TERM' or token[1]]
+
+
+class _Parser:
+    """Recursive-descent parser: or := and (OR and)*; and := not (AND? not)*; not := NOT not | atom."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()!r}")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() in ("AND", "NOT", "TERM", "("):
+            if self.peek() == "AND":
+                self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind = self.peek()
+        if kind == "TERM":
+            return Term(self.take()[1])
+        if kind == "(":
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.take()
+            return node
+        raise QuerySyntaxError("Expected a word or phrase" + (f" before {kind!r}" if kind else " at end of query"))
+
+
+def parse_query(text) -> Node:
+    """
+    Parse a boolean query.
+
+    Args:
+        text (str): Query text
+
+    Returns:
+        Node: Query tree of ``Term``, ``And``, ``Or`` and ``Not``
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    return _Parser(_lex(text or "")).parse()
+
+
+def is_boolean_query(text) -> bool:
+    """Whether search input uses operators, phrases or grouping rather than plain keywords."""
+    return bool(re.search(r'"|\(|\)|\b(?:AND|OR|NOT)\b', text or ""))
+
+
+def _index_terms(tokens):
+    return [token for token in tokens if token not in STOPWORDS and len(token) <= MAX_TERM_LENGTH]
+
+
+def _terms(node) -> set:
+    if isinstance(node, Term):
+        return set(_index_terms(node.tokens))
+    if isinstance(node, Not):
+        return _terms(node.child)
+    return set().union(*(_terms(child) for child in node.children))
+
+
+def _positive_terms(node) -> set:
+    if isinstance(node, Term):
+        return set(_index_terms(node.tokens))
+    if isinstance(node, Not):
+        return set()
+    return set().union(*(_positive_terms(child) for child in node.children))
+
+
+def news_text(news) -> str:
+    """The text of an article that is indexed and searched."""
+    return "\n".join(filter(None, [news.title, news.content_summary, news.content]))
+
+
+def index_news_terms(news):
+    """
+    Replace an article's postings with those of its current text.
+
+    Args:
+        news (News): The article
+
+    Returns:
+        int: Number of distinct terms indexed
+    """
+    from .models import NewsTerm
+
+    counts = Counter(_index_terms(tokenize(news_text(news))))
+    with transaction.atomic():
+        NewsTerm.objects.filter(news=news).delete()
+        NewsTerm.objects.bulk_create(
+            [NewsTerm(term=term, news=news, tf=min(tf, 32767)) for term, tf in counts.items()])
+    return len(counts)
+
+
+def _phrases(node) -> set:
+    if isinstance(node, Term):
+        return {node.tokens} if len(node.tokens) > 1 else set()
+    if isinstance(node, Not):
+        return _phrases(node.child)
+    return set().union(*(_phrases(child) for child in node.children))
+
+
+def _contains_phrase(tokens, phrase):
+    length = len(phrase)
+    return any(tuple(tokens[i:i + length]) == phrase for i in range(len(tokens) - length + 1))
+
+
+class _Evaluator:
+    """
+    Combines document sets bottom-up.
+
+    Args:
+        postings (dict): Term to ``{news_id: tf}``
+        phrase_docs (dict): Phrase tokens to the articles verified to contain it
+    """
+
+    def __init__(self, postings, phrase_docs):
+        self.postings = postings
+        self.phrase_docs = phrase_docs
+
+    def term_docs(self, tokens) -> set:
+        terms = _index_terms(tokens)
+        if not terms:
+            raise QuerySyntaxError(f"\"{' '.join(tokens)}\" is too common to search for")
+        return set.intersection(*(set(self.postings.get(term, ())) for term in terms))
+
+    def docs(self, node) -> set:
+        if isinstance(node, Term):
+            if len(node.tokens) > 1:
+                return self.phrase_docs[node.tokens]
+            return self.term_docs(node.tokens)
+        if isinstance(node, Or):
+            return set().union(*(self.docs(child) for child in node.children))
+        children = node.children if isinstance(node, And) else (node,)
+        positives = [self.docs(child) for child in children if not isinstance(child, Not)]
+        if not positives:
+            raise QuerySyntaxError("NOT needs something to exclude from, e.g. tcs NOT layoffs")
+        result = set.intersection(*positives)
+        for child in children:
+            if isinstance(child, Not):
+                result -= self.docs(child.child)
+        return result
+
+
+def search(text, queryset=None, limit=None):
+    """
+    Run a boolean query over ingested news.
+
+    Args:
+        text (str): Query text
+        queryset (QuerySet): News to search within; defaults to all
+        limit (int): Maximum results; defaults to ``BOOLEAN_QUERY_LIMIT``
+
+    Returns:
+        list: Matching News, best first
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    from .models import News, NewsTerm
+
+    node = parse_query(text)
+    limit = limit or settings.BOOLEAN_QUERY_LIMIT
+    queryset = News.objects.all() if queryset is None else queryset
+
+    postings: Dict[str, Dict[int, int]] = {}
+    for term, news_id, tf in NewsTerm.objects.filter(term__in=_terms(node)).values_list('term', 'news_id', 'tf'):
+        postings.setdefault(term, {})[news_id] = tf
+
+    # Postings say a phrase's words are present; the text says whether in order
+    evaluator = _Evaluator(postings, {})
+    candidates = {phrase: evaluator.term_docs(phrase) for phrase in _phrases(node)}
+    texts = {}
+    if candidates:
+        texts = {
+            item.id: tokenize(news_text(item))
+            for item in News.objects.filter(id__in=set().union(*candidates.values())).only(
+                'id', 'title', 'content_summary', 'content')
+        }
+    evaluator.phrase_docs = {
+        phrase: {news_id for news_id in docs if _contains_phrase(texts.get(news_id, ()), phrase)}
+        for phrase, docs in candidates.items()
+    }
+
+    matched = evaluator.docs(node)
+    if not matched:
+        return []
+
+    total = max(News.objects.count(), 1)
+    weights = {
+        term: math.log(1 + total / len(postings[term]))
+        for term in _positive_terms(node) if term in postings
+    }
+    scores = {
+        news_id: sum((1 + math.log(postings[term][news_id])) * weight
+                     for term, weight in weights.items() if news_id in postings[term])
+        for news_id in matched
+    }
+    news = {item.id: item for item in queryset.filter(id__in=matched).select_related('source')}
+    ranked = sorted(news, key=lambda news_id: (-scores[news_id], -news[news_id].date.timestamp()))
+    return [news[news_id] for news_id in ranked[:limit]]
+
+
+def rebuild_news_terms():
+    """
+    Re-index every article.
+
+    Returns:
+        int: Number of articles indexed
+    """
+    from .models import News
+
+    indexed = 0
+    for news in News.objects.only('id', 'title', 'content_summary', 'content').iterator():
+        index_news_terms(news)
+        indexed += 1
+    return indexed
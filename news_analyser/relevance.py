@@ -0,0 +1,151 @@
+"""
+Local market-relevance pre-filter for news articles.
+
+Every RSS hit used to cost a full Gemini call, even when the article only
+matched a keyword by accident (a world-news item that happens to mention a
+"budget"). This module scores an article against a weighted finance lexicon
+and the listed companies it mentions, so obviously off-topic items can be
+skipped or down-prioritised before they reach the analysis queue.
+
+A company counts whether it appears as an upper-case NSE symbol or by a
+name or alias the ``EntityMatcher`` knows ("Infosys", "Tata Motors"). When
+the article was found by searching for a company, writing that keyword in
+any case ("tcs shares") counts as mentioning the company; ordinary-word
+keywords only score through the lexicon, as they are exactly the
+accidental matches the filter exists for.
+
+Scoring is pure Python over a handful of set lookups and one trie walk.
+"""
+
+import logging
+from typing import List, NamedTuple
+
+from django.conf import settings
+
+from .entities import get_entity_matcher, normalize_symbol, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Single-word finance terms and their weights. Strong market vocabulary is
+# weighted 1.0, broad economic vocabulary that also shows up in general news
+# is weighted lower so it needs company or market context to pass.
+FINANCE_TERMS = {
+    # Markets and instruments
+    "sensex": 1.0, "nifty": 1.0, "stock": 1.0, "stocks": 1.0, "shares": 1.0,
+    "share": 0.5, "equity": 1.0, "equities": 1.0, "ipo": 1.0, "fpo": 1.0,
+    "nse": 1.0, "bse": 1.0, "sebi": 1.0, "rbi": 1.0, "bourses": 1.0,
+    "bond": 0.75, "bonds": 0.75, "yield": 0.5, "yields": 0.75,
+    "rupee": 0.75, "forex": 1.0, "derivatives": 1.0, "futures": 0.75,
+    "options": 0.25, "mutual": 0.5, "fund": 0.5, "funds": 0.5, "fii": 1.0,
+    "fiis": 1.0, "dii": 1.0, "diis": 1.0, "fpi": 1.0, "fpis": 1.0,
+    "investors": 0.75, "investor": 0.75, "trading": 0.5, "rally": 0.75,
+    "selloff": 1.0, "bullish": 1.0, "bearish": 1.0, "valuation": 0.75,
+    "brokerage": 1.0, "target": 0.25, "upgrade": 0.5, "downgrade": 0.75,
+    # Corporate results and actions
+    "earnings": 1.0, "profit": 0.75, "profits": 0.75, "revenue": 0.75,
+    "ebitda": 1.0, "margin": 0.5, "margins": 0.5, "quarter": 0.5,
+    "quarterly": 0.75, "q1": 0.75, "q2": 0.75, "q3": 0.75, "q4": 0.75,
+    "dividend": 1.0, "buyback": 1.0, "bonus": 0.5, "merger": 1.0,
+    "acquisition": 1.0, "stake": 0.75, "listing": 0.75, "delisting": 1.0,
+    "promoter": 1.0, "promoters": 1.0, "pledge": 0.5, "debt": 0.5,
+    "loan": 0.5, "loans": 0.5, "capex": 1.0, "guidance": 0.5, "order": 0.25,
+    "orders": 0.25, "contract": 0.25, "ltd": 0.5, "limited": 0.25,
+    # Macro
+    "inflation": 0.75, "gdp": 0.75, "repo": 0.75, "fiscal": 0.5,
+    "budget": 0.5, "tariff": 0.5, "tariffs": 0.5, "tax": 0.25, "gst": 0.75,
+    "economy": 0.5, "economic": 0.25, "crude": 0.75, "commodity": 0.75,
+    "commodities": 0.75, "bank": 0.5, "banks": 0.5, "banking": 0.75,
+    "nbfc": 1.0, "insurer": 0.75, "telecom": 0.25, "pharma": 0.5,
+}
+
+# Multi-word phrases, matched against adjacent lowercase tokens.
+FINANCE_PHRASES = {
+    ("stock", "market"): 1.0, ("share", "price"): 1.0,
+    ("market", "cap"): 1.0, ("net", "profit"): 1.0,
+    ("interest", "rate"): 0.75, ("interest", "rates"): 0.75,
+    ("rate", "cut"): 0.75, ("rate", "hike"): 0.75,
+    ("mutual", "fund"): 0.5, ("target", "price"): 1.0,
+    ("order", "book"): 1.0, ("record", "date"): 1.0,
+    ("dalal", "street"): 1.0, ("d", "street"): 1.0,
+}
+
+# Weight given to each distinct listed company found in the text.
+TICKER_WEIGHT = 1.5
+
+
+class RelevanceResult(NamedTuple):
+    """Outcome of scoring a single article."""
+    score: float
+    is_relevant: bool
+    terms: List[str]
+    tickers: List[str]
+
+
+def _keyword_symbols(keyword, tokens, entities):
+    """Symbols of the company a search keyword names, if the tokens contain the keyword."""
+    phrase = tokenize(keyword or "")
+    if not phrase:
+        return set()
+    size = len(phrase)
+    if not any(tokens[start:start + size] == phrase for start in range(len(tokens) - size + 1)):
+        return set()
+    symbol = normalize_symbol(keyword)
+    if symbol in entities.symbols:
+        return {symbol}
+    return entities.match_names(keyword)
+
+
+def score_text(text: str, keyword: str = "", entities=None) -> RelevanceResult:
+    """
+    Score free text for Indian stock-market relevance.
+
+    Args:
+        text (str): Article text, typically title plus RSS summary
+        keyword (str): Search keyword the article was found by
+        entities (EntityMatcher): Finds companies by name; defaults to this
+            process's entity matcher
+
+    Returns:
+        RelevanceResult: Score, relevance verdict and the matched evidence
+    """
+    threshold = settings.RELEVANCE_THRESHOLD
+    if not text:
+        return RelevanceResult(0.0, threshold <= 0, [], [])
+
+    tokens = tokenize(text)
+    score = 0.0
+    terms = []
+
+    for token in set(tokens):
+        weight = FINANCE_TERMS.get(token)
+        if weight:
+            score += weight
+            terms.append(token)
+
+    for bigram in set(zip(tokens, tokens[1:])):
+        weight = FINANCE_PHRASES.get(bigram)
+        if weight:
+            score += weight
+            terms.append(" ".join(bigram))
+
+    if entities is None:
+        entities = get_entity_matcher()
+    tickers = set(entities.extract(text)) | _keyword_symbols(keyword, tokens, entities)
+    score += TICKER_WEIGHT * len(tickers)
+
+    return RelevanceResult(round(score, 3), score >= threshold, sorted(terms), sorted(tickers))
+
+
+def score_article(title: str, summary: str = "", keyword: str = "") -> RelevanceResult:
+    """
+    Score an article from its headline and summary.
+
+    Args:
+        title (str): Article headline
+        summary (str): RSS summary or excerpt
+        keyword (str): Search keyword the article was found by
+
+    Returns:
+        RelevanceResult: Score, relevance verdict and the matched evidence
+    """
+    return score_text(f"{title or ''}\n{summary or ''}", keyword)
@@ -8,7 +8,8 @@ Business Standard, and LiveMint.
 
 import feedparser
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
+from .entities import PhraseTrie, tokenize
 from .exceptions import RSSFeedError
 
 logger = logging.getLogger(__name__)
@@ -74,13 +75,22 @@ cnbc_feeds = {
 }
 
 
-def check_keywords(keywords: List[str], max_per_feed: int = 50) -> Dict[str, List]:
+def check_keywords(
+    keywords: List[str], max_per_feed: int = 50, aliases: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, List]:
     """
     Search for keywords across all configured RSS feeds.
 
+    A keyword matches an entry when it appears in the title or summary, or
+    when any of its aliases does as whole words. All aliases are compiled
+    into one phrase trie, so each entry is scanned once however many
+    aliases are searched.
+
     Args:
         keywords (List[str]): List of keywords/stock symbols to search for
         max_per_feed (int): Maximum number of entries to check per feed (default: 50)
+        aliases (Dict[str, List[str]]): Keyword to other names it goes by,
+            e.g. from ``entities.search_aliases``
 
     Returns:
         Dict[str, List]: Dictionary mapping keywords to matching news entries
@@ -103,6 +113,11 @@ def check_keywords(keywords: List[str], max_per_feed: int = 50) -> Dict[str, Lis
         + list(cnbc_feeds.values())
     )
 
+    alias_trie = PhraseTrie()
+    for keyword, names in (aliases or {}).items():
+        for name in names:
+            alias_trie.add(tuple(tokenize(name)), keyword)
+
     successful_feeds = 0
     failed_feeds = 0
 
@@ -133,12 +148,17 @@ def check_keywords(keywords: List[str], max_per_feed: int = 50) -> Dict[str, Lis
                     summary = getattr(entry, 'summary', '')
 
                     # Search for keywords in title and summary
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        title_lower = title.lower()
-                        summary_lower = summary.lower()
+                    title_lower = title.lower()
+                    summary_lower = summary.lower()
+                    matched = {
+                        keyword for keyword in keywords
+                        if keyword.lower() in title_lower or keyword.lower() in summary_lower
+                    }
+                    if alias_trie:
+                        matched |= alias_trie.find(tokenize(f"{title}\n{summary}"))
 
-                        if keyword_lower in title_lower or keyword_lower in summary_lower:
+                    for keyword in keywords:
+                        if keyword in matched:
                             logger.debug(f"Keyword '{keyword}' found in: {title[:50]}...")
 
                             # Ensure entry has required fields
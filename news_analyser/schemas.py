@@ -0,0 +1,73 @@
+"""
+Typed schemas for structured Gemini output.
+
+The analysis schema is sent to Gemini as ``response_schema`` so the model is
+constrained to emit matching JSON, and the same model validates whatever
+comes back before it is written to the database.
+"""
+
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from .exceptions import AnalysisParseError
+
+
+class ImpactTimeline(str, Enum):
+    """How soon the news is expected to move the market."""
+    IMMEDIATE = "immediate"
+    SHORT_TERM = "short-term"
+    MEDIUM_TERM = "medium-term"
+    LONG_TERM = "long-term"
+
+
+class NewsAnalysis(BaseModel):
+    """
+    Structured sentiment analysis of a single news article.
+
+    Attributes:
+        sentiment (float): Market impact score (-1 to 1)
+        confidence (float): Model confidence in the score (0 to 1)
+        explanation (str): Short reasoning for the score
+        tickers (list): NSE symbols mentioned in the article
+        impact_timeline (ImpactTimeline): Expected horizon of the impact
+    """
+    sentiment: float = Field(ge=-1, le=1)
+    confidence: float = Field(ge=0, le=1)
+    explanation: str
+    tickers: List[str] = Field(default_factory=list)
+    impact_timeline: ImpactTimeline
+
+    @field_validator("tickers")
+    @classmethod
+    def normalise_tickers(cls, value):
+        """Upper-case, strip and de-duplicate ticker symbols, keeping order."""
+        seen = []
+        for ticker in value:
+            ticker = ticker.strip().upper()
+            if ticker and ticker not in seen:
+                seen.append(ticker)
+        return seen
+
+
+def parse_news_analysis(text):
+    """
+    Validate a Gemini response against the analysis schema.
+
+    Args:
+        text (str): Raw JSON text returned by the model
+
+    Returns:
+        NewsAnalysis: The validated analysis
+
+    Raises:
+        AnalysisParseError: If the text is not JSON or does not match the schema
+    """
+    try:
+        return NewsAnalysis.model_validate_json(text)
+    except ValidationError as e:
+        raise AnalysisParseError(
+            f"Response does not match analysis schema: {e.error_count()} error(s); "
+            f"{e.errors()[0]['msg'] if e.errors() else ''}"
+        ) from e
@@ -0,0 +1,148 @@
+"""
+Time-decayed sentiment scores for every stock at once.
+
+Each analysed article linked to a stock (``NewsStock``) is a mention with a
+sentiment (``impact_rating``) and a confidence. A stock's score is the
+weighted mean of its mentions' sentiment, where each weight is the
+confidence times an exponential decay on the article's age:
+
+    weight = confidence * 0.5 ** (age_hours / SENTIMENT_HALF_LIFE_HOURS)
+
+All mentions inside ``SENTIMENT_LOOKBACK_DAYS`` are loaded into flat NumPy
+arrays and reduced per stock with ``bincount``, so a universe-wide recompute
+is a single query plus a few vector operations. ``refresh_stock_scores``
+runs periodically and stores the result in the cache, where views read it
+with ``stock_scores``.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SCORES_KEY = "stock_scores"
+# Used for articles analysed before the model reported a confidence
+DEFAULT_CONFIDENCE = 0.5
+
+
+def decayed_scores(stock_ids, ratings, confidences, ages_hours, half_life_hours):
+    """
+    Reduce mention arrays to one decayed, confidence-weighted score per stock.
+
+    Args:
+        stock_ids (ndarray): Stock ID of each mention
+        ratings (ndarray): Sentiment of each mention, -1 to 1
+        confidences (ndarray): Confidence of each mention, 0 to 1; zero or
+            NaN falls back to ``DEFAULT_CONFIDENCE``
+        ages_hours (ndarray): Age of each mention in hours
+        half_life_hours (float): Hours for a mention's weight to halve
+
+    Returns:
+        tuple: ``(ids, scores, weights, mentions)`` arrays, one entry per stock
+            with at least one mention
+    """
+    ids, index = np.unique(stock_ids, return_inverse=True)
+    confidences = np.where(np.nan_to_num(confidences) > 0, confidences, DEFAULT_CONFIDENCE)
+    weights = np.clip(confidences, 0.0, 1.0) * np.exp2(-np.maximum(ages_hours, 0.0) / half_life_hours)
+
+    weight_sums = np.bincount(index, weights=weights, minlength=len(ids))
+    weighted = np.bincount(index, weights=weights * ratings, minlength=len(ids))
+    mentions = np.bincount(index, minlength=len(ids))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.where(weight_sums > 0, weighted / weight_sums, 0.0)
+    return ids, scores, weight_sums, mentions
+
+
+def load_mentions(now=None):
+    """
+    Load every recent mention as flat arrays.
+
+    Args:
+        now (datetime): Reference time; defaults to now
+
+    Returns:
+        tuple: ``(stock_ids, ratings, confidences, ages_hours)`` arrays
+    """
+    from .models import News, NewsStock
+
+    now = now or timezone.now()
+    rows = list(
+        NewsStock.objects
+        .filter(news__analysis_status=News.AnalysisStatus.DONE,
+                news__date__gte=now - timedelta(days=settings.SENTIMENT_LOOKBACK_DAYS))
+        .values_list('stock_id', 'news__impact_rating', 'news__sentiment_confidence', 'news__date')
+    )
+    stock_ids, ratings, confidences, dates = zip(*rows) if rows else ((), (), (), ())
+    now_ts = now.timestamp()
+    return (
+        np.array(stock_ids, dtype=np.int64),
+        np.array(ratings, dtype=np.float64),
+        np.array(confidences, dtype=np.float64),
+        np.fromiter((now_ts - date.timestamp() for date in dates), dtype=np.float64, count=len(dates)) / 3600.0,
+    )
+
+
+def compute_stock_scores(now=None):
+    """
+    Score every stock with recent mentions.
+
+    Args:
+        now (datetime): Reference time; defaults to now
+
+    Returns:
+        dict: Stock ID to ``{'score', 'weight', 'mentions'}``
+    """
+    stock_ids, ratings, confidences, ages = load_mentions(now)
+    started = time.perf_counter()
+    ids, scores, weights, mentions = decayed_scores(
+        stock_ids, ratings, confidences, ages, settings.SENTIMENT_HALF_LIFE_HOURS)
+    logger.debug(f"Scored {len(ids)} stocks from {len(stock_ids)} mentions "
+                 f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return {
+        int(stock_id): {'score': round(float(score), 4), 'weight': round(float(weight), 4), 'mentions': int(count)}
+        for stock_id, score, weight, count in zip(ids, scores, weights, mentions)
+    }
+
+
+def refresh_stock_scores():
+    """
+    Recompute all stock scores and publish them to the cache.
+
+    Returns:
+        dict: Stock ID to score data
+    """
+    scores = compute_stock_scores()
+    try:
+        cache.set(SCORES_KEY, scores, timeout=settings.SENTIMENT_SCORES_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Could not cache stock scores: {e}")
+    return scores
+
+
+def stock_scores(stock_ids=None):
+    """
+    Current decayed scores, computed on demand when none are cached.
+
+    Args:
+        stock_ids (iterable): Only return these stocks; defaults to all
+
+    Returns:
+        dict: Stock ID to ``{'score', 'weight', 'mentions'}``; stocks
+            without recent mentions are absent
+    """
+    try:
+        scores = cache.get(SCORES_KEY)
+    except Exception as e:
+        logger.warning(f"Could not read stock scores: {e}")
+        scores = None
+    if scores is None:
+        scores = refresh_stock_scores()
+    if stock_ids is None:
+        return scores
+    return {stock_id: scores[stock_id] for stock_id in stock_ids if stock_id in scores}
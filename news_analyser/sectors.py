@@ -0,0 +1,266 @@
+"""
+Sector sentiment engine.
+
+Each sector is described by its ``search_fields`` (comma, semicolon or
+newline separated terms) and its member stocks. All sectors are compiled
+into one ``SectorMatcher``: a ``PhraseTrie`` over the tokenised terms and a
+dictionary from member symbols to their sectors. Companies are found by the
+shared ``EntityMatcher``, by symbol or by any of their names and aliases, so
+a sector sees exactly the companies the rest of the app extracts. Matching
+an article is one trie walk plus one entity extraction, so the cost does not
+grow with the number of sectors.
+
+When an analysis finishes, ``index_news`` records the article's sectors in
+``NewsSector`` and recomputes the affected ``SectorSentimentDaily`` rows, so
+a sector page is a single indexed read over ``(sector, day)`` instead of a
+fan-out of RSS searches.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .cache import sector_version
+from .entities import PhraseTrie, get_entity_matcher, normalize_symbol, tokenize
+
+logger = logging.getLogger(__name__)
+
+POSITIVE_THRESHOLD = 0.3
+NEGATIVE_THRESHOLD = -0.3
+
+_TERM_SPLIT_RE = re.compile(r"[,;\n|]+")
+
+
+class SectorMatcher:
+    """
+    Matches text against every sector's terms and member stocks at once.
+
+    Args:
+        sectors (iterable): ``(sector_id, search_fields, symbols)`` tuples,
+            where ``symbols`` are the sector's member stocks
+    """
+
+    def __init__(self, sectors):
+        self._terms = PhraseTrie()
+        self._term_sectors: Dict[tuple, set] = {}
+        self._symbols: Dict[str, set] = {}
+        for sector_id, search_fields, symbols in sectors:
+            for term in _TERM_SPLIT_RE.split(search_fields or ""):
+                tokens = tuple(tokenize(term))
+                if tokens:
+                    self._terms.add(tokens, tokens)
+                    self._term_sectors.setdefault(tokens, set()).add(sector_id)
+            for symbol in symbols:
+                self._symbols.setdefault(normalize_symbol(symbol), set()).add(sector_id)
+
+    def __len__(self):
+        return len(self._terms) + len(self._symbols)
+
+    def match(self, text, tickers=(), entities=None):
+        """
+        Find the sectors an article belongs to.
+
+        Args:
+            text (str): Article text (title, summary and content)
+            tickers (iterable): Symbols already extracted, e.g. by the analysis
+            entities (EntityMatcher): Finds companies in the text; defaults
+                to this process's entity matcher
+
+        Returns:
+            Counter: Sector ID to number of distinct terms and companies found
+        """
+        if entities is None:
+            entities = get_entity_matcher()
+        symbols = {normalize_symbol(ticker) for ticker in tickers} | set(entities.extract(text or ""))
+        hits = Counter()
+        for term in self._terms.find(tokenize(text or "")):
+            hits.update(self._term_sectors[term])
+        for symbol in symbols & self._symbols.keys():
+            hits.update(self._symbols[symbol])
+        return hits
+
+
+_matcher: Optional[SectorMatcher] = None
+_matcher_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _load_sectors():
+    from .models import Sector, Stock
+    stocks = {}
+    for sector_id, symbol in Stock.objects.filter(sector__isnull=False).values_list('sector_id', 'symbol'):
+        stocks.setdefault(sector_id, []).append(symbol)
+    return [
+        (sector_id, search_fields, stocks.get(sector_id, []))
+        for sector_id, search_fields in Sector.objects.values_list('id', 'search_fields')
+    ]
+
+
+def get_sector_matcher():
+    """
+    Return this process's sector matcher, rebuilding it after sector changes.
+
+    Returns:
+        SectorMatcher: The current matcher
+    """
+    global _matcher, _matcher_version, _checked_at
+    now = time.monotonic()
+    if _matcher is not None and now - _checked_at < settings.SECTOR_MATCHER_REFRESH_SECONDS:
+        return _matcher
+
+    with _lock:
+        version = sector_version()
+        _checked_at = now
+        if _matcher is None or version != _matcher_version:
+            _matcher = SectorMatcher(_load_sectors())
+            _matcher_version = version
+            logger.info(f"Built sector matcher with {len(_matcher)} terms")
+        return _matcher
+
+
+def invalidate_sector_matcher():
+    """Force the next match in this process to re-check sector definitions."""
+    global _checked_at
+    _checked_at = 0.0
+
+
+def day_bounds(day):
+    """Aware start and end datetimes of a day in the project time zone."""
+    start = timezone.make_aware(datetime.combine(day, dt_time.min))
+    return start, start + timedelta(days=1)
+
+
+def refresh_daily_sentiment(sector_ids, day):
+    """
+    Recompute the daily sentiment rows of some sectors for one day.
+
+    Args:
+        sector_ids (iterable): Sectors to recompute
+        day (date): Day to recompute, in the project time zone
+    """
+    from .models import News, NewsSector, SectorSentimentDaily
+
+    sector_ids = set(sector_ids)
+    if not sector_ids:
+        return
+    start, end = day_bounds(day)
+    rows = (
+        NewsSector.objects
+        .filter(sector_id__in=sector_ids, news__date__gte=start, news__date__lt=end,
+                news__analysis_status=News.AnalysisStatus.DONE)
+        .values('sector_id')
+        .annotate(
+            news_count=Count('news_id'),
+            sentiment_sum=Sum('news__impact_rating'),
+            positive=Count('news_id', filter=Q(news__impact_rating__gt=POSITIVE_THRESHOLD)),
+            negative=Count('news_id', filter=Q(news__impact_rating__lt=NEGATIVE_THRESHOLD)),
+        )
+    )
+    seen = set()
+    for row in rows:
+        sector_id = row.pop('sector_id')
+        seen.add(sector_id)
+        SectorSentimentDaily.objects.update_or_create(sector_id=sector_id, day=day, defaults=row)
+    SectorSentimentDaily.objects.filter(sector_id__in=sector_ids - seen, day=day).delete()
+
+
+def match_news(news):
+    """
+    Sectors an article belongs to.
+
+    Args:
+        news (News): The article
+
+    Returns:
+        Counter: Sector ID to number of hits
+    """
+    text = "\n".join(filter(None, [news.title, news.content_summary, news.content]))
+    tickers = set(news.mentioned_tickers or ()) | set(news.extracted_tickers or ())
+    return get_sector_matcher().match(text, tickers)
+
+
+def index_news(news):
+    """
+    Record an article's sectors and refresh their sentiment for its day.
+
+    Args:
+        news (News): An analysed article
+
+    Returns:
+        list: IDs of the sectors the article matched
+    """
+    from .models import NewsSector, Sector
+
+    hits = match_news(news)
+    # Another process may have deleted a sector this matcher still knows
+    live = set(Sector.objects.filter(id__in=list(hits)).values_list('id', flat=True))
+    hits = Counter({sector_id: count for sector_id, count in hits.items() if sector_id in live})
+    with transaction.atomic():
+        previous = set(NewsSector.objects.filter(news=news).values_list('sector_id', flat=True))
+        NewsSector.objects.filter(news=news).exclude(sector_id__in=hits).delete()
+        for sector_id, count in hits.items():
+            NewsSector.objects.update_or_create(
+                news=news, sector_id=sector_id, defaults={'hits': count})
+        refresh_daily_sentiment(previous | set(hits), timezone.localdate(news.date))
+    return sorted(hits)
+
+
+def rebuild_sector_sentiment(since=None):
+    """
+    Re-match every analysed article and recompute all daily rows.
+
+    Args:
+        since (date): Only rebuild from this day on
+
+    Returns:
+        int: Number of articles matched
+    """
+    from .models import News, NewsSector, Sector, SectorSentimentDaily
+
+    news = News.objects.filter(analysis_status=News.AnalysisStatus.DONE)
+    if since:
+        news = news.filter(date__gte=day_bounds(since)[0])
+    days = set()
+    matched = 0
+    for item in news.only('id', 'title', 'content_summary', 'content', 'mentioned_tickers', 'extracted_tickers', 'date').iterator():
+        hits = match_news(item)
+        NewsSector.objects.filter(news=item).delete()
+        NewsSector.objects.bulk_create(
+            [NewsSector(news=item, sector_id=sector_id, hits=count) for sector_id, count in hits.items()])
+        days.add(timezone.localdate(item.date))
+        matched += bool(hits)
+
+    stale = SectorSentimentDaily.objects.all()
+    if since:
+        stale = stale.filter(day__gte=since)
+    stale.delete()
+    sector_ids = list(Sector.objects.values_list('id', flat=True))
+    for day in sorted(days):
+        refresh_daily_sentiment(sector_ids, day)
+    return matched
+
+
+def sector_sentiment(sector, days=None):
+    """
+    Daily sentiment of a sector, oldest first.
+
+    Args:
+        sector (Sector): The sector
+        days (int): How many days back; defaults to ``SECTOR_SENTIMENT_DAYS``
+
+    Returns:
+        QuerySet: ``SectorSentimentDaily`` rows
+    """
+    days = days or settings.SECTOR_SENTIMENT_DAYS
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return sector.daily_sentiment.filter(day__gte=since).order_by('day')
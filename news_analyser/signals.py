@@ -1,7 +1,14 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .models import UserProfile, News, SavedQuery, Sector, Stock
+from .cache import (
+    bump_keyword_version, bump_portfolio_version, invalidate_percolator, invalidate_sectors, invalidate_stock_list
+)
+from .stock_index import invalidate_stock_index
+from .sectors import invalidate_sector_matcher
+from .entities import invalidate_entity_matcher
+from .percolator import invalidate_local_percolator
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -11,3 +18,42 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+@receiver([post_save, post_delete], sender=News)
+def invalidate_keyword_results(sender, instance, **kwargs):
+    bump_keyword_version(instance.keyword_id)
+
+@receiver([post_save, post_delete], sender=Stock)
+def invalidate_stocks(sender, instance, **kwargs):
+    invalidate_stock_list()
+    invalidate_stock_index()
+    invalidate_entity_matcher()
+    invalidate_sectors()
+    invalidate_sector_matcher()
+
+@receiver([post_save, post_delete], sender=Sector)
+def invalidate_sector_definitions(sender, instance, **kwargs):
+    invalidate_sectors()
+    invalidate_sector_matcher()
+
+@receiver(m2m_changed, sender=UserProfile.stocks.through)
+def invalidate_portfolio(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # Clearing a stock's users: find them while the rows still exist
+        user_ids = UserProfile.objects.filter(stocks=instance).values_list('user_id', flat=True)
+    elif action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    elif reverse:
+        user_ids = UserProfile.objects.filter(pk__in=pk_set or ()).values_list('user_id', flat=True)
+    else:
+        user_ids = [instance.user_id]
+    for user_id in user_ids:
+        bump_portfolio_version(user_id)
+    # Queries that include the watchlist now watch different symbols
+    invalidate_percolator()
+    invalidate_local_percolator()
+
+@receiver([post_save, post_delete], sender=SavedQuery)
+def invalidate_saved_queries(sender, instance, **kwargs):
+    invalidate_percolator()
+    invalidate_local_percolator()
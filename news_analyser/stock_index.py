@@ -0,0 +1,137 @@
+"""
+In-memory prefix index over NSE stocks for typeahead.
+
+The whole universe is ~1,700 symbols, small enough to keep in every web
+process. Each stock is indexed under its symbol, its full name and each word
+of its name; the keys live in one sorted list, so a prefix lookup is a
+``bisect`` to the first candidate followed by a short scan.
+
+The index is built lazily from the cached stock list on first use. Stock
+changes bump the stock list version (see ``cache.invalidate_stock_list``);
+each process notices within ``STOCK_INDEX_REFRESH_SECONDS`` and rebuilds.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+from django.conf import settings
+
+from .cache import get_stock_list, stock_list_version
+from .entities import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Match kinds, best first
+EXACT_SYMBOL = 0
+SYMBOL_PREFIX = 1
+NAME_PREFIX = 2
+WORD_PREFIX = 3
+
+
+class StockEntry(NamedTuple):
+    """The fields of a stock the typeahead returns."""
+    id: int
+    symbol: str
+    name: str
+
+
+class StockPrefixIndex:
+    """
+    Sorted prefix index over stock symbols and names.
+
+    Args:
+        stocks (iterable): ``StockEntry`` tuples to index
+    """
+
+    def __init__(self, stocks):
+        self.stocks = list(stocks)
+        entries = []
+        for idx, stock in enumerate(self.stocks):
+            symbol = stock.symbol.lower()
+            name = stock.name.lower()
+            entries.append((symbol, SYMBOL_PREFIX, idx))
+            entries.append((name, NAME_PREFIX, idx))
+            for word in set(tokenize(name)[1:]):
+                entries.append((word, WORD_PREFIX, idx))
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._entries = entries
+
+    def __len__(self):
+        return len(self.stocks)
+
+    def search(self, query, limit=10):
+        """
+        Find stocks whose symbol, name or a name word starts with ``query``.
+
+        Results are ranked exact symbol first, then symbol prefixes, then
+        name prefixes, then name-word prefixes; ties go to shorter symbols.
+
+        Args:
+            query (str): Prefix typed by the user
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Matching ``StockEntry`` tuples, best first
+        """
+        prefix = query.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+
+        best = {}
+        start = bisect.bisect_left(self._keys, prefix)
+        for key, kind, idx in self._entries[start:]:
+            if not key.startswith(prefix):
+                break
+            if kind == SYMBOL_PREFIX and key == prefix:
+                kind = EXACT_SYMBOL
+            if kind < best.get(idx, WORD_PREFIX + 1):
+                best[idx] = kind
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1], len(self.stocks[item[0]].symbol), self.stocks[item[0]].symbol),
+        )
+        return [self.stocks[idx] for idx, _ in ranked[:limit]]
+
+
+_index: Optional[StockPrefixIndex] = None
+_index_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _load_stocks() -> List[StockEntry]:
+    from .models import Stock
+    return [StockEntry(*row) for row in Stock.objects.values_list('id', 'symbol', 'name')]
+
+
+def get_stock_index():
+    """
+    Return this process's stock index, building or refreshing it if needed.
+
+    Returns:
+        StockPrefixIndex: The current index
+    """
+    global _index, _index_version, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < settings.STOCK_INDEX_REFRESH_SECONDS:
+        return _index
+
+    with _lock:
+        version = stock_list_version()
+        _checked_at = now
+        if _index is None or version != _index_version:
+            _index = StockPrefixIndex(get_stock_list(_load_stocks))
+            _index_version = version
+            logger.info(f"Built stock prefix index with {len(_index)} stocks")
+        return _index
+
+
+def invalidate_stock_index():
+    """Force the next lookup in this process to re-check the stock list."""
+    global _checked_at
+    _checked_at = 0.0
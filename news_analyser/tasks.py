@@ -1,12 +1,31 @@
 from __future__ import absolute_import, unicode_literals
-from celery import shared_task
-from .models import News
+from celery import chord, shared_task
+from celery.exceptions import Retry
+from celery.signals import worker_process_shutdown, worker_shutdown
+from django.core.cache import cache
+from .models import News, Keyword, SearchJob
+from .rss import check_keywords
 from google import genai
+from google.genai import types
 import logging
-import json
+import math
+from django.conf import settings
 from blackbox.settings import GEMINI_API_KEYS
-from .prompts import news_analysis_prompt
+from django.db.models import Q
+from django.utils import timezone
+from .prompts import news_analysis_prompt, NEWS_ANALYSIS_PROMPT_VERSION
+from .schemas import NewsAnalysis, parse_news_analysis
+from . import events, metrics
+from .cache import bump_keyword_version
+from .browser_pool import close_browser_pool, get_browser_pool
+from . import percolator, portfolio, scoring, sectors
+from .entities import cross_check_tickers, extract_tickers, search_aliases
+from .query import index_news_terms
+from .content_store import evict, fetch_article, store_browser_content, stored_content
 from .exceptions import (
+    AnalysisParseError,
+    ContentExtractionError,
+    HostThrottledError,
     GeminiAPIError,
     GeminiRateLimitError,
     GeminiAuthenticationError,
@@ -15,6 +34,16 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Celery priority used for articles the relevance pre-filter rejected.
+# On the Redis broker 0 is the highest priority and 9 the lowest.
+LOW_PRIORITY = 9
+
+# Constrain Gemini to emit JSON matching the NewsAnalysis schema
+ANALYSIS_GENERATION_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=NewsAnalysis,
+)
+
 
 def strip_markdown_json(text):
     """
@@ -46,13 +75,78 @@ def strip_markdown_json(text):
     return text.strip()
 
 
+def current_analysis_version():
+    """Identify the prompt and model an analysis is produced with."""
+    return f"{NEWS_ANALYSIS_PROMPT_VERSION}:{settings.GEMINI_MODEL}"
+
+
+def set_analysis_status(news_id, status):
+    """Move a news row to a new analysis status without loading it."""
+    # Bulk updates skip auto_now; stamp updated_at so exports and API clients see the change
+    updated = News.objects.filter(id=news_id).update(analysis_status=status, updated_at=timezone.now())
+    if updated and status == News.AnalysisStatus.FAILED:
+        # Bulk updates skip post_save, so drop cached results explicitly
+        keyword_id = News.objects.filter(id=news_id).values_list('keyword_id', flat=True).first()
+        bump_keyword_version(keyword_id)
+    return updated
+
+
+def record_search_result(search_job_id, news_id, result=None):
+    """
+    Count a finished analysis against its search job and push it to the page.
+
+    Args:
+        search_job_id (int): SearchJob the analysis belongs to, or None
+        news_id (int): The analysed article
+        result (dict): Task result, None if the task raised
+    """
+    if search_job_id is None:
+        return
+    succeeded = bool(result) and result.get('status') == 'success'
+    finished = SearchJob.record_analysis(search_job_id, succeeded)
+
+    job = SearchJob.objects.get(pk=search_job_id)
+    events.publish(search_job_id, events.ARTICLE_EVENT, {
+        'news_id': news_id,
+        'title': News.objects.filter(pk=news_id).values_list('title', flat=True).first(),
+        'status': 'done' if succeeded else 'failed',
+        'sentiment': result.get('sentiment_score') if succeeded else None,
+        'progress': job.as_status_dict(),
+    })
+    if finished:
+        logger.info(f"Search job {search_job_id} finished")
+        events.publish(search_job_id, events.DONE_EVENT, job.as_status_dict())
+
+
+def get_gemini_client(api_key):
+    """
+    Build a Gemini client for the given API key.
+
+    Honours ``GEMINI_BASE_URL`` so workers can be pointed at a local
+    stand-in server instead of the real API.
+
+    Args:
+        api_key (str): Gemini API key
+
+    Returns:
+        genai.Client: Configured client
+    """
+    if settings.GEMINI_BASE_URL:
+        return genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(base_url=settings.GEMINI_BASE_URL)
+        )
+    return genai.Client(api_key=api_key)
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def analyse_news_task(self, news_id):
+def analyse_news_task(self, news_id, search_job_id=None):
     """
     Analyze news sentiment using Gemini API.
 
     Args:
         news_id (int): The ID of the News object to analyze
+        search_job_id (int): Optional SearchJob whose progress this counts towards
 
     Returns:
         dict: Analysis results including sentiment score and metadata
@@ -61,11 +155,61 @@ def analyse_news_task(self, news_id):
         GeminiAPIError: If API calls fail after retries
         InvalidSentimentScoreError: If sentiment score is out of range
     """
+    try:
+        result = _analyse_news(self, news_id)
+    except Retry:
+        raise
+    except Exception:
+        # Retries are exhausted, the article is finished for this search
+        record_search_result(search_job_id, news_id)
+        raise
+    if result and result.get('status') == 'success':
+        update_sentiment_rollups(news_id)
+        raise_alerts([news_id])
+    record_search_result(search_job_id, news_id, result)
+    return result
+
+
+def update_sentiment_rollups(news_id):
+    """Refresh the sector and stock daily sentiment an analysed article feeds."""
+    try:
+        news = News.objects.select_related('keyword').get(pk=news_id)
+        sector_ids = sectors.index_news(news)
+        stock_ids = portfolio.index_news(news)
+        logger.debug(f"News ID {news_id} matched sectors {sector_ids} and stocks {stock_ids}")
+    except Exception as e:
+        # Rollups are derived data; never fail the analysis over them
+        logger.error(f"Could not update sentiment rollups for news ID {news_id}: {e}", exc_info=True)
+
+
+def raise_alerts(news_ids):
+    """
+    Percolate articles through every saved query and write matching alerts.
+
+    Args:
+        news_ids (list): Articles to percolate
+
+    Returns:
+        int: Number of query matches
+    """
+    matched = 0
+    for news in News.objects.filter(pk__in=news_ids):
+        try:
+            matched += percolator.percolate(news)
+        except Exception as e:
+            # Alerts are best effort; never fail ingest or analysis over them
+            logger.error(f"Could not percolate news ID {news.id}: {e}", exc_info=True)
+    return matched
+
+
+def _analyse_news(task, news_id):
+    """Run one analysis attempt for ``analyse_news_task``."""
     logger.info(f"Starting sentiment analysis for news ID: {news_id}")
 
     try:
         news = News.objects.get(id=news_id)
         logger.debug(f"Retrieved news object: {news.title[:50]}...")
+        set_analysis_status(news_id, News.AnalysisStatus.RUNNING)
 
         # Try primary API key first
         api_keys = GEMINI_API_KEYS
@@ -78,97 +222,101 @@ def analyse_news_task(self, news_id):
         prompt = news_analysis_prompt.format(
             title=news.title,
             content_summary=news.content_summary,
-            content=news.content or ""
+            content=news.content or stored_content(news.link) or ""
         )
 
         last_error = None
         for idx, api_key in enumerate(api_keys):
             try:
                 logger.debug(f"Attempting analysis with API key #{idx + 1}")
-                client = genai.Client(api_key=api_key)
+                client = get_gemini_client(api_key)
 
                 # Update task state to show progress
-                self.update_state(
+                task.update_state(
                     state='PROGRESS',
                     meta={'current': idx + 1, 'total': len(api_keys), 'status': 'Analyzing...'}
                 )
 
                 analysis = client.models.generate_content(
-                    # model="gemini-2.5-flash",
-                    # model="gemini-3-pro-preview",
-                    model="gemini-flash-lite-latest",
-                    contents=prompt
+                    model=settings.GEMINI_MODEL,
+                    contents=prompt,
+                    config=ANALYSIS_GENERATION_CONFIG
                 )
 
-                # Parse structured JSON response
-                response_text = analysis.text.strip()
+                # Validate the structured JSON response against the schema
+                response_text = (analysis.text or "").strip()
                 logger.debug(f"Gemini response: {response_text[:200]}...")
 
                 try:
-                    # Strip markdown code blocks if present
-                    cleaned_response = strip_markdown_json(response_text)
-                    logger.debug(f"Cleaned response: {cleaned_response[:200]}...")
-                    
-                    # Try to parse as JSON
-                    analysis_data = json.loads(cleaned_response)
-
-                    # Extract and validate sentiment score
-                    sentiment_score = float(analysis_data.get('sentiment', 0))
+                    # JSON mode makes code fences unlikely, but strip them
+                    # defensively so a stray fence is not counted as a failure
+                    result = parse_news_analysis(strip_markdown_json(response_text))
+                except AnalysisParseError as parse_error:
+                    # Fallback: accept a bare sentiment number
+                    try:
+                        sentiment_score = float(response_text)
+                    except ValueError:
+                        metrics.increment(metrics.ANALYSIS_PARSE_FAILURE)
+                        logger.error(
+                            f"Unparseable analysis for news ID {news_id}: {parse_error}. "
+                            f"Response: {response_text[:200]}"
+                        )
+                        raise parse_error
+
                     if not -1 <= sentiment_score <= 1:
-                        logger.error(f"Sentiment score out of range: {sentiment_score}")
+                        metrics.increment(metrics.ANALYSIS_PARSE_FAILURE)
                         raise InvalidSentimentScoreError(f"Sentiment {sentiment_score} not in [-1, 1]")
 
-                    # Extract additional fields
-                    confidence = float(analysis_data.get('confidence', 0))
-                    explanation = analysis_data.get('explanation', '')
-                    tickers = analysis_data.get('tickers', [])
-                    impact_timeline = analysis_data.get('impact_timeline', '')
-
-                    # Update news object with all fields
+                    metrics.increment(metrics.ANALYSIS_PARSE_SUCCESS)
                     news.impact_rating = sentiment_score
-                    news.sentiment_confidence = confidence
-                    news.sentiment_explanation = explanation
-                    news.mentioned_tickers = tickers if isinstance(tickers, list) else []
-                    news.raw_gemini_response = analysis_data
+                    news.analysis_status = News.AnalysisStatus.DONE
+                    news.analysed_at = timezone.now()
+                    news.analysis_version = current_analysis_version()
                     news.save()
 
-                    logger.info(
-                        f"Successfully analyzed news ID {news_id}. "
-                        f"Sentiment: {sentiment_score:.3f}, Confidence: {confidence:.3f}, "
-                        f"Tickers: {tickers}"
-                    )
+                    logger.info(f"Successfully analyzed news ID {news_id} (simple mode). Sentiment: {sentiment_score:.3f}")
 
                     return {
                         'status': 'success',
                         'news_id': news_id,
                         'sentiment_score': sentiment_score,
-                        'confidence': confidence,
-                        'tickers': tickers,
                         'api_key_used': idx + 1
                     }
 
-                except json.JSONDecodeError:
-                    # Fallback: Try to parse as simple float
-                    logger.warning(f"Failed to parse JSON, trying simple float: {response_text[:100]}")
-                    try:
-                        sentiment_score = float(response_text)
-                        if not -1 <= sentiment_score <= 1:
-                            raise InvalidSentimentScoreError(f"Sentiment {sentiment_score} not in [-1, 1]")
-
-                        news.impact_rating = sentiment_score
-                        news.save()
+                metrics.increment(metrics.ANALYSIS_PARSE_SUCCESS)
+                analysis_data = result.model_dump(mode='json')
+
+                # Update news object with all fields
+                news.impact_rating = result.sentiment
+                news.sentiment_confidence = result.confidence
+                news.sentiment_explanation = result.explanation
+                news.extracted_tickers = extract_tickers(news.title, news.content_summary, news.content)
+                news.mentioned_tickers = cross_check_tickers(result.tickers, news.extracted_tickers)
+                news.raw_gemini_response = analysis_data
+                news.analysis_status = News.AnalysisStatus.DONE
+                news.analysed_at = timezone.now()
+                news.analysis_version = current_analysis_version()
+                news.save()
+
+                logger.info(
+                    f"Successfully analyzed news ID {news_id}. "
+                    f"Sentiment: {result.sentiment:.3f}, Confidence: {result.confidence:.3f}, "
+                    f"Tickers: {news.mentioned_tickers}"
+                )
 
-                        logger.info(f"Successfully analyzed news ID {news_id} (simple mode). Sentiment: {sentiment_score:.3f}")
+                return {
+                    'status': 'success',
+                    'news_id': news_id,
+                    'sentiment_score': result.sentiment,
+                    'confidence': result.confidence,
+                    'tickers': news.mentioned_tickers,
+                    'api_key_used': idx + 1
+                }
 
-                        return {
-                            'status': 'success',
-                            'news_id': news_id,
-                            'sentiment_score': sentiment_score,
-                            'api_key_used': idx + 1
-                        }
-                    except ValueError as e:
-                        logger.error(f"Failed to parse response as float: {response_text}")
-                        raise InvalidSentimentScoreError(f"Invalid response: {response_text}")
+            except (AnalysisParseError, InvalidSentimentScoreError):
+                # The key worked but the output was unusable; retrying the
+                # same prompt on another key would only waste quota.
+                raise
 
             except genai.errors.ClientError as e:
                 error_msg = str(e)
@@ -215,20 +363,387 @@ def analyse_news_task(self, news_id):
         }
 
     except (GeminiRateLimitError, GeminiAuthenticationError) as exc:
+        if task.request.retries >= task.max_retries:
+            set_analysis_status(news_id, News.AnalysisStatus.FAILED)
+        else:
+            set_analysis_status(news_id, News.AnalysisStatus.QUEUED)
         # Retry with exponential backoff
         logger.warning(
             f"Retrying task for news ID {news_id}. "
-            f"Attempt {self.request.retries + 1}/{self.max_retries}"
+            f"Attempt {task.request.retries + 1}/{task.max_retries}"
         )
-        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+        raise task.retry(exc=exc, countdown=2 ** task.request.retries)
 
     except Exception as e:
         logger.critical(
             f"Fatal error analyzing news ID {news_id}: {e}",
             exc_info=True
         )
+        set_analysis_status(news_id, News.AnalysisStatus.FAILED)
         return {
             'status': 'error',
             'news_id': news_id,
             'error': str(e)
         }
+
+
+def claim_analysis(news, force=False):
+    """
+    Claim a news article for sentiment analysis at most once.
+
+    The row is claimed by atomically moving it to ``queued``; only the
+    caller whose UPDATE matched gets to send the task, so repeated searches
+    never enqueue an article that is already queued, running or analysed
+    with the current prompt and model.
+
+    Articles the local relevance pre-filter marked as not market-relevant are
+    marked ``skipped`` when ``RELEVANCE_SKIP_IRRELEVANT`` is set, otherwise
+    they are claimed and later queued at the lowest priority so relevant
+    news is analysed first.
+
+    Args:
+        news (News): The article to analyse
+        force (bool): Re-analyse even if a current analysis exists
+
+    Returns:
+        bool: True if the caller now owns sending the task
+    """
+    status = News.AnalysisStatus
+
+    if not news.is_market_relevant and settings.RELEVANCE_SKIP_IRRELEVANT and not force:
+        if News.objects.filter(pk=news.pk, analysis_status=status.PENDING).update(
+                analysis_status=status.SKIPPED, updated_at=timezone.now()):
+            bump_keyword_version(news.keyword_id)
+        logger.debug(f"Skipping analysis of non-relevant news ID {news.id}")
+        return False
+
+    if force:
+        claimable = ~Q(analysis_status__in=[status.QUEUED, status.RUNNING])
+    else:
+        claimable = (
+            Q(analysis_status__in=[status.PENDING, status.FAILED, status.SKIPPED])
+            | (Q(analysis_status=status.DONE) & ~Q(analysis_version=current_analysis_version()))
+        )
+
+    if not News.objects.filter(claimable, pk=news.pk).update(
+            analysis_status=status.QUEUED, updated_at=timezone.now()):
+        logger.debug(f"News ID {news.id} already queued or analysed, not re-enqueueing")
+        return False
+    news.analysis_status = status.QUEUED
+    return True
+
+
+def enqueue_analysis(news, force=False):
+    """
+    Queue a news article for sentiment analysis at most once.
+
+    See ``claim_analysis`` for which articles are queued.
+
+    Args:
+        news (News): The article to analyse
+        force (bool): Re-analyse even if a current analysis exists
+
+    Returns:
+        bool: True if a task was queued
+    """
+    if not claim_analysis(news, force=force):
+        return False
+
+    if news.is_market_relevant:
+        analyse_news_task.delay(news.id)
+    else:
+        analyse_news_task.apply_async(args=[news.id], priority=LOW_PRIORITY)
+    return True
+
+
+@shared_task
+def finalize_search_job(results, search_job_id):
+    """
+    Chord callback run once every analysis of a search has finished.
+
+    Args:
+        results (list): Return values of the analysis tasks
+        search_job_id (int): The SearchJob to complete
+
+    Returns:
+        dict: Final progress of the search job
+    """
+    completed = SearchJob.finish(search_job_id)
+    job = SearchJob.objects.get(pk=search_job_id)
+    if completed:
+        logger.info(f"Search job {search_job_id} completed by chord callback")
+        events.publish(search_job_id, events.DONE_EVENT, job.as_status_dict())
+    return job.as_status_dict()
+
+
+def dispatch_search_job(job, news_items):
+    """
+    Analyse a search's articles as one Celery chord.
+
+    Every article this search claims becomes a header task that counts its
+    outcome on the job row; ``finalize_search_job`` runs once the group has
+    finished. Articles already queued by another search or analysed with the
+    current prompt and model are not part of the group.
+
+    Args:
+        job (SearchJob): The search being processed
+        news_items (iterable): News articles the search found
+
+    Returns:
+        SearchJob: The job, with ``total_news`` and ``status`` set
+    """
+    claimed = [news for news in news_items if claim_analysis(news)]
+
+    job.total_news = len(claimed)
+    if not claimed:
+        job.status = SearchJob.Status.DONE
+        job.finished_at = timezone.now()
+        job.save(update_fields=['total_news', 'status', 'finished_at'])
+        logger.info(f"Search job {job.id} has nothing to analyse")
+        events.publish(job.id, events.DONE_EVENT, job.as_status_dict())
+        return job
+
+    job.status = SearchJob.Status.RUNNING
+    job.save(update_fields=['total_news', 'status'])
+    events.publish(job.id, events.PROGRESS_EVENT, job.as_status_dict())
+
+    header = [
+        analyse_news_task.signature(
+            (news.id,), {'search_job_id': job.id},
+            priority=None if news.is_market_relevant else LOW_PRIORITY
+        )
+        for news in claimed
+    ]
+    result = chord(header)(finalize_search_job.s(job.id))
+    if result.parent is not None:
+        job.celery_group_id = result.parent.id
+        SearchJob.objects.filter(pk=job.pk).update(celery_group_id=job.celery_group_id)
+    logger.info(f"Search job {job.id} dispatched {len(claimed)} analyses")
+    return job
+
+
+@shared_task
+def run_search_job(search_job_id, keywords):
+    """
+    Fetch, ingest and analyse the news for a submitted search.
+
+    Feed fetching runs here rather than in the web request, so a search
+    returns as soon as its job is created and slow RSS sources only occupy
+    a Celery worker.
+
+    Args:
+        search_job_id (int): The SearchJob created for the search
+        keywords (list): Keywords or stock symbols to search for
+
+    Returns:
+        dict: Progress of the search job after dispatching its analyses
+    """
+    job = SearchJob.objects.select_related('user__profile').get(pk=search_job_id)
+    logger.info(f"Running search job {job.id} for keywords: {keywords}")
+
+    try:
+        # Stock searches also match the names headlines use for each stock
+        aliases = search_aliases(keywords) if job.search_type == 'stock' else None
+        news = check_keywords(keywords, aliases=aliases)
+        found = []
+        for name, entries in news.items():
+            keyword, _ = Keyword.objects.get_or_create(name=name)
+            job.user.profile.searches.add(keyword)
+            job.keywords.add(keyword)
+            found.extend(News.parse_news(entry, keyword) for entry in entries)
+
+        if not news:
+            # Keep the searched terms on the job so results show what was asked
+            for name in keywords:
+                keyword, _ = Keyword.objects.get_or_create(name=name)
+                job.keywords.add(keyword)
+
+        logger.info(f"Search job {job.id} found {len(found)} news items")
+        # Queries without sentiment bounds can alert before any analysis
+        raise_alerts([item.id for item in found])
+        dispatch_search_job(job, found)
+    except Exception as e:
+        logger.error(f"Search job {job.id} failed: {e}", exc_info=True)
+        SearchJob.finish(job.id, SearchJob.Status.FAILED)
+        job.refresh_from_db()
+        events.publish(job.id, events.DONE_EVENT, job.as_status_dict())
+
+    return job.as_status_dict()
+
+
+CONTENT_LOCK_KEY = "content_fetch:{news_id}"
+EXPORT_LOCK_KEY = "news_export"
+
+# Release pooled browsers when a content worker exits
+worker_shutdown.connect(close_browser_pool)
+worker_process_shutdown.connect(close_browser_pool)
+
+
+def request_content_extraction(news):
+    """
+    Queue full-content extraction for an article unless it is already queued.
+
+    Args:
+        news (News): The article to extract
+
+    Returns:
+        bool: True if a task was queued
+    """
+    lock = CONTENT_LOCK_KEY.format(news_id=news.id)
+    if not cache.add(lock, 1, timeout=settings.CONTENT_EXTRACTION_TIMEOUT * 2):
+        logger.debug(f"Content extraction for news ID {news.id} already queued")
+        return False
+    extract_content_task.delay(news.id)
+    return True
+
+
+async def _extract_with_browser(browser, context, link):
+    from .br_use import get_news
+    return await get_news(link, browser=browser, browser_context=context)
+
+
+def _release_content_lock(news_id):
+    cache.delete(CONTENT_LOCK_KEY.format(news_id=news_id))
+
+
+def _store_content(news, content, method):
+    news.content = content
+    news.save(update_fields=['content', 'updated_at'])
+    index_news_terms(news)
+    events.publish_news(news.id, events.CONTENT_EVENT, {'status': 'done', 'length': len(content)})
+    return {'status': 'success', 'news_id': news.id, 'method': method, 'length': len(content)}
+
+
+def _content_failed(news_id, error):
+    events.publish_news(news_id, events.CONTENT_EVENT, {'status': 'failed', 'error': error})
+    return {'status': 'error', 'news_id': news_id, 'error': error}
+
+
+@shared_task(bind=True, max_retries=5)
+def extract_content_task(self, news_id):
+    """
+    Extract an article's full content over plain HTTP.
+
+    Reads the article store first, then tries the site profile and
+    readability extractors; only pages they cannot handle are passed on to
+    ``browser_extract_content_task``. Fetches the publisher's host is not
+    ready for are retried later rather than waited on.
+
+    Args:
+        news_id (int): The ID of the News object to extract
+
+    Returns:
+        dict: Extraction status, method and content length
+    """
+    try:
+        news = News.objects.get(id=news_id)
+    except News.DoesNotExist:
+        logger.error(f"News item with ID {news_id} not found in database")
+        _release_content_lock(news_id)
+        return {'status': 'error', 'news_id': news_id, 'error': 'News not found'}
+
+    try:
+        article = fetch_article(news.link)
+    except HostThrottledError as e:
+        # Keep the lock: the retry is still this extraction
+        if self.request.retries < self.max_retries:
+            logger.info(f"Deferring content fetch for news ID {news_id}: {e}")
+            raise self.retry(countdown=math.ceil(e.retry_after or 60))
+        _release_content_lock(news_id)
+        return _content_failed(news_id, str(e))
+    except ContentExtractionError as e:
+        logger.info(f"Fast extraction failed for news ID {news_id}, using browser: {e}")
+        metrics.increment(metrics.CONTENT_BROWSER_FALLBACK)
+        # The browser task releases the lock when it finishes
+        browser_extract_content_task.delay(news_id)
+        return {'status': 'escalated', 'news_id': news_id}
+    except Exception:
+        _release_content_lock(news_id)
+        raise
+
+    try:
+        metrics.increment(metrics.CONTENT_FAST_SUCCESS)
+        return _store_content(news, article.content, article.method)
+    finally:
+        _release_content_lock(news_id)
+
+
+@shared_task
+def browser_extract_content_task(news_id):
+    """
+    Extract an article's full content with the browser agent.
+
+    Runs on the ``content`` queue in a context borrowed from the worker's
+    browser pool, for pages the HTTP extractors could not handle.
+
+    Args:
+        news_id (int): The ID of the News object to extract
+
+    Returns:
+        dict: Extraction status and content length
+    """
+    try:
+        news = News.objects.get(id=news_id)
+        logger.info(f"Extracting content with browser for news ID {news_id}: {news.link}")
+        try:
+            result = get_browser_pool().run_with_context(
+                _extract_with_browser, news.link,
+                timeout=settings.CONTENT_EXTRACTION_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Content extraction failed for news ID {news_id}: {e}", exc_info=True)
+            return _content_failed(news_id, str(e))
+
+        content = (result or {}).get('content') or ''
+        if not content:
+            return _content_failed(news_id, 'No content found')
+        store_browser_content(news.link, content)
+        return _store_content(news, content, 'browser')
+
+    except News.DoesNotExist:
+        logger.error(f"News item with ID {news_id} not found in database")
+        return {'status': 'error', 'news_id': news_id, 'error': 'News not found'}
+
+    finally:
+        _release_content_lock(news_id)
+
+
+@shared_task
+def evict_article_content():
+    """
+    Trim the article store to its TTL and size limits.
+
+    Returns:
+        int: Number of stored articles deleted
+    """
+    return evict()
+
+
+@shared_task
+def refresh_stock_scores_task():
+    """
+    Recompute the decayed sentiment score of every stock.
+
+    Returns:
+        int: Number of stocks scored
+    """
+    return len(scoring.refresh_stock_scores())
+
+
+@shared_task
+def export_news_task():
+    """
+    Append news changed since the last export to the Parquet dataset.
+
+    Returns:
+        int: Number of articles exported, or None if an export is already running
+    """
+    # Imported here so web processes that import tasks do not load pyarrow
+    from .export import export_news
+
+    if not cache.add(EXPORT_LOCK_KEY, 1, timeout=settings.EXPORT_INTERVAL):
+        logger.info("News export already running, skipping")
+        return None
+    try:
+        return export_news()
+    finally:
+        cache.delete(EXPORT_LOCK_KEY)
@@ -0,0 +1,33 @@
+"""
+Shared builders for test data.
+
+Test modules create articles through ``make_news`` so the fields a ``News``
+row needs are filled in one place.
+"""
+
+from datetime import timedelta
+from django.utils import timezone
+from news_analyser.models import News
+
+
+def make_news(keyword, title, rating=None, days_ago=0, **fields):
+    """
+    Create an article found by a keyword search.
+
+    Args:
+        keyword (Keyword): Keyword the article was found by
+        title (str): Headline, also used for the link
+        rating (float): Impact rating; giving one marks the article analysed
+        days_ago (int): Age of the article, unless ``date`` is given
+        **fields: Any other ``News`` fields
+
+    Returns:
+        News: The saved article
+    """
+    fields.setdefault('content_summary', "")
+    fields.setdefault('link', f"https://example.com/{title}")
+    fields.setdefault('date', timezone.now() - timedelta(days=days_ago))
+    if rating is not None:
+        fields.update(impact_rating=rating, analysis_status=News.AnalysisStatus.DONE)
+        fields.setdefault('analysed_at', timezone.now())
+    return News.objects.create(title=title, keyword=keyword, **fields)
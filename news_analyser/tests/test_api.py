@@ -0,0 +1,138 @@
+"""
+Tests for the read-only JSON API.
+
+This module tests filtering, field selection, cursor pagination, aggregate
+sentiment and conditional (ETag / Last-Modified) requests.
+"""
+
+import warnings
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from news_analyser.models import News, Keyword, Source
+
+
+class NewsAPITest(TestCase):
+    """Test cases for the v1 news, article and sentiment endpoints."""
+
+    def setUp(self):
+        """Create analysed news across keywords and sources."""
+        User.objects.create_user('consumer', 'api@example.com', 'pass123')
+        self.client.login(username='consumer', password='pass123')
+        self.et = Source.objects.create(id_name="ET", name="Economic Times", url="https://et.example.com")
+        self.tcs = Keyword.objects.create(name="TCS")
+        self.infy = Keyword.objects.create(name="INFY")
+        now = timezone.now()
+        self.news = []
+        for i, (keyword, rating, tickers) in enumerate([
+            (self.tcs, 0.8, ["TCS"]),
+            (self.tcs, -0.5, ["TCS", "INFY"]),
+            (self.infy, 0.1, ["INFY"]),
+        ]):
+            self.news.append(News.objects.create(
+                title=f"Story {i}", content_summary="Summary", link=f"https://example.com/api/{i}",
+                keyword=keyword, source=self.et if i < 2 else None, impact_rating=rating,
+                mentioned_tickers=tickers, date=now - timedelta(days=i),
+                analysis_status=News.AnalysisStatus.DONE,
+                raw_gemini_response={"impact_timeline": "short-term"},
+            ))
+        self.list_url = reverse('news_analyser:api:news_list')
+
+    def test_requires_authentication(self):
+        """Test that anonymous requests get a JSON 401."""
+        self.client.logout()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_filters(self):
+        """Test keyword, ticker, source and time range filters."""
+        def titles(**params):
+            return [r['title'] for r in self.client.get(self.list_url, params).json()['results']]
+
+        self.assertEqual(titles(keyword="tcs"), ["Story 0", "Story 1"])
+        self.assertEqual(titles(ticker="infy"), ["Story 1", "Story 2"])
+        self.assertEqual(titles(source="ET"), ["Story 0", "Story 1"])
+        since = (timezone.now() - timedelta(days=1, hours=1)).isoformat()
+        self.assertEqual(titles(since=since), ["Story 0", "Story 1"])
+
+    def test_invalid_parameters(self):
+        """Test that bad input is a 400 with a JSON error."""
+        for params in ({'since': 'yesterday'}, {'fields': 'title,secret'}, {'cursor': 'bogus'}):
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_impossible_dates(self):
+        """Test that well-formed but impossible dates are a 400, not a server error."""
+        for since in ('2024-13-01', '2024-02-30T10:00', '2024-01-01T25:00:00'):
+            response = self.client.get(self.list_url, {'since': since})
+            self.assertEqual(response.status_code, 400, since)
+            self.assertIn('Invalid since', response.json()['error'])
+
+    def test_naive_times_are_local(self):
+        """Test that dates and naive datetimes are read in the project time zone."""
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response = self.client.get(self.list_url, {'until': tomorrow.isoformat()})
+            self.assertEqual(len(response.json()['results']), 3)
+            response = self.client.get(self.list_url, {'since': f"{tomorrow.isoformat()}T00:00:00"})
+            self.assertEqual(response.json()['results'], [])
+
+    def test_field_selection(self):
+        """Test that only the requested fields are returned."""
+        data = self.client.get(self.list_url, {'fields': 'title,sentiment,source'}).json()
+        self.assertEqual(data['results'][0], {'title': 'Story 0', 'sentiment': 0.8, 'source': 'Economic Times'})
+
+    def test_cursor_pagination(self):
+        """Test that following next walks every row once."""
+        seen, url, params = [], self.list_url, {'limit': 2, 'fields': 'id'}
+        while url:
+            data = self.client.get(url, params).json()
+            seen.extend(r['id'] for r in data['results'])
+            url, params = data['next'], None
+        self.assertEqual(seen, [n.id for n in self.news])
+
+    def test_article_detail(self):
+        """Test the per-article analysis payload."""
+        response = self.client.get(reverse('news_analyser:api:news_detail', args=[self.news[1].id]))
+        data = response.json()
+        self.assertEqual(data['tickers'], ["TCS", "INFY"])
+        self.assertEqual(data['impact_timeline'], "short-term")
+        missing = self.client.get(reverse('news_analyser:api:news_detail', args=[9999]))
+        self.assertEqual(missing.status_code, 404)
+
+    def test_sentiment_aggregates(self):
+        """Test overall and grouped sentiment aggregates."""
+        url = reverse('news_analyser:api:sentiment_summary')
+        overall = self.client.get(url, {'keyword': 'TCS'}).json()
+        self.assertEqual(overall['count'], 2)
+        self.assertAlmostEqual(overall['avg_sentiment'], 0.15)
+        self.assertEqual((overall['positive'], overall['negative']), (1, 1))
+
+        grouped = self.client.get(url, {'group_by': 'keyword'}).json()
+        self.assertEqual([(r['key'], r['count']) for r in grouped['results']], [("INFY", 1), ("TCS", 2)])
+        self.assertEqual(len(self.client.get(url, {'group_by': 'day'}).json()['results']), 3)
+        self.assertEqual(self.client.get(url, {'group_by': 'planet'}).status_code, 400)
+
+    def test_conditional_requests(self):
+        """Test that unchanged data returns 304 and changes invalidate the ETag."""
+        first = self.client.get(self.list_url, {'keyword': 'TCS'})
+        self.assertTrue(first.has_header('ETag'))
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        cached = self.client.get(self.list_url, {'keyword': 'TCS'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        self.news[0].impact_rating = 0.9
+        self.news[0].save()
+        changed = self.client.get(self.list_url, {'keyword': 'TCS'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_article_conditional_request(self):
+        """Test that an unchanged article returns 304."""
+        url = reverse('news_analyser:api:news_detail', args=[self.news[0].id])
+        first = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
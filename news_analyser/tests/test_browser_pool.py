@@ -0,0 +1,84 @@
+"""
+Unit tests for the pooled browser contexts.
+
+These use a pool whose contexts are plain objects, so the timeout and
+replacement logic runs on the real event loop without starting Chromium.
+"""
+
+import asyncio
+import itertools
+from django.test import SimpleTestCase
+from news_analyser.browser_pool import BrowserPool
+
+
+class FakeContext:
+    """A context that records whether it was closed."""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContextPool(BrowserPool):
+    """A pool of ``FakeContext`` instead of browser contexts."""
+
+    def __init__(self, size):
+        super().__init__(size)
+        self._numbers = itertools.count()
+
+    async def _start(self):
+        self._contexts = asyncio.Queue()
+        for _ in range(self.size):
+            self._contexts.put_nowait(self._new_context())
+
+    def _new_context(self):
+        return FakeContext(next(self._numbers))
+
+
+class BrowserPoolTest(SimpleTestCase):
+    """Test cases for borrowing and returning contexts."""
+
+    def setUp(self):
+        self.pool = FakeContextPool(1)
+        self.addCleanup(self.pool.loop.call_soon_threadsafe, self.pool.loop.stop)
+
+    def test_context_reused_after_success(self):
+        """Test that a context that finished cleanly goes back to the pool."""
+        async def number(browser, ctx):
+            return ctx.number
+
+        self.assertEqual(self.pool.run_with_context(number, timeout=5), 0)
+        self.assertEqual(self.pool.run_with_context(number, timeout=5), 0)
+
+    def test_timeout_cancels_and_replaces_context(self):
+        """Test that a hung run is cancelled and its context closed and replaced."""
+        seen = []
+
+        async def hang(browser, ctx):
+            seen.append(ctx)
+            await asyncio.sleep(60)
+
+        async def number(browser, ctx):
+            return ctx.number
+
+        with self.assertRaises(TimeoutError):
+            self.pool.run_with_context(hang, timeout=0.1)
+
+        # A pool of one would block forever if the hung context were never returned
+        self.assertEqual(self.pool.run_with_context(number, timeout=5), 1)
+        self.assertTrue(seen[0].closed)
+
+    def test_failure_replaces_context(self):
+        """Test that a context whose run raised is not reused."""
+        async def fail(browser, ctx):
+            raise RuntimeError("page crashed")
+
+        async def number(browser, ctx):
+            return ctx.number
+
+        with self.assertRaises(RuntimeError):
+            self.pool.run_with_context(fail, timeout=5)
+        self.assertEqual(self.pool.run_with_context(number, timeout=5), 1)
@@ -0,0 +1,147 @@
+"""
+Unit tests for the result and reference-data cache.
+
+This module tests versioned per-keyword result caching, invalidation when
+news or analyses change, the cached stock list and hit/miss counters.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from blackbox.celery import check_shared_cache
+from news_analyser import metrics
+from news_analyser.cache import get_stock_list, keyword_versions
+from news_analyser.models import News, Keyword, Stock
+from news_analyser.tasks import set_analysis_status
+
+
+class KeywordResultsCacheTest(TestCase):
+    """Test cases for cached result pages."""
+
+    def setUp(self):
+        """Set up a user with one searched keyword."""
+        cache.clear()
+        self.user = User.objects.create_user('cached', 'cached@example.com', 'pass123')
+        self.keyword = Keyword.objects.create(name="TCS")
+        self.user.profile.searches.add(self.keyword)
+        self.news = News.objects.create(
+            title="TCS wins deal", content_summary="", link="https://example.com/c/1",
+            keyword=self.keyword, impact_rating=0.6,
+            analysis_status=News.AnalysisStatus.DONE
+        )
+        self.client.login(username='cached', password='pass123')
+        self.url = reverse('news_analyser:search_results', args=[self.keyword.id])
+
+    def _news_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [q for q in ctx.captured_queries if 'news_analyser_news' in q['sql']], response
+
+    def test_second_view_skips_news_queries(self):
+        """Test that a repeated view is served from the cache."""
+        first, _ = self._news_queries()
+        second, response = self._news_queries()
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(second, [])
+        self.assertContains(response, "TCS wins deal")
+        self.assertContains(response, "Avg sentiment 0.60 across 1 analysed")
+        counts = metrics.get_counts(metrics.CACHE_RESULTS_HIT, metrics.CACHE_RESULTS_MISS)
+        self.assertEqual(counts, {metrics.CACHE_RESULTS_HIT: 1, metrics.CACHE_RESULTS_MISS: 1})
+
+    def test_new_news_invalidates(self):
+        """Test that ingesting an article invalidates the keyword's results."""
+        self._news_queries()
+        version = keyword_versions([self.keyword.id])[self.keyword.id]
+
+        News.objects.create(
+            title="TCS follow-up", content_summary="", link="https://example.com/c/2",
+            keyword=self.keyword
+        )
+
+        self.assertEqual(keyword_versions([self.keyword.id])[self.keyword.id], version + 1)
+        queries, response = self._news_queries()
+        self.assertTrue(queries)
+        self.assertContains(response, "TCS follow-up")
+
+    def test_failed_analysis_invalidates(self):
+        """Test that a status-only failure update still invalidates."""
+        self._news_queries()
+
+        set_analysis_status(self.news.id, News.AnalysisStatus.FAILED)
+
+        queries, _ = self._news_queries()
+        self.assertTrue(queries)
+
+
+class StockListCacheTest(TestCase):
+    """Test cases for the cached stock list."""
+
+    def setUp(self):
+        """Clear the cache."""
+        cache.clear()
+
+    def test_stock_list_cached_until_changed(self):
+        """Test that the stock list is cached and rebuilt after a change."""
+        Stock.objects.create(name="Tata Consultancy Services", symbol="TCS")
+        build = lambda: list(Stock.objects.values_list('symbol', flat=True))
+
+        self.assertEqual(get_stock_list(build), ['TCS'])
+        self.assertEqual(get_stock_list(build), ['TCS'])
+        self.assertEqual(metrics.get_counts(metrics.CACHE_STOCKS_HIT)[metrics.CACHE_STOCKS_HIT], 1)
+
+        Stock.objects.create(name="Infosys", symbol="INFY")
+        self.assertEqual(get_stock_list(build), ['INFY', 'TCS'])
+
+
+class MetricsViewTest(TestCase):
+    """Test cases for the metrics endpoint."""
+
+    def test_metrics_require_staff(self):
+        """Test that only staff can read counters."""
+        User.objects.create_user('plain', 'plain@example.com', 'pass123')
+        self.client.login(username='plain', password='pass123')
+        response = self.client.get(reverse('news_analyser:metrics'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_metrics_report_counters(self):
+        """Test that staff see every registered counter."""
+        cache.clear()
+        metrics.increment(metrics.CACHE_RESULTS_HIT, 3)
+        User.objects.create_user('ops', 'ops@example.com', 'pass123', is_staff=True)
+        self.client.login(username='ops', password='pass123')
+
+        data = self.client.get(reverse('news_analyser:metrics')).json()
+
+        self.assertEqual(set(data), set(metrics.ALL_COUNTERS))
+        self.assertEqual(data[metrics.CACHE_RESULTS_HIT], 3)
+
+
+class SharedCacheCheckTest(TestCase):
+    """Test cases for the Celery startup check on the cache backend."""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                         'LOCATION': 'redis://redis:6379/1'}}
+
+    def test_local_cache_refused(self):
+        """Test that a worker on the per-process cache fails to start."""
+        with override_settings(CACHES=self.LOCMEM, CELERY_REQUIRE_SHARED_CACHE=True):
+            with self.assertRaises(ImproperlyConfigured):
+                check_shared_cache()
+
+    def test_local_cache_warns_when_allowed(self):
+        """Test that the check only warns when a shared cache is not required."""
+        with override_settings(CACHES=self.LOCMEM, CELERY_REQUIRE_SHARED_CACHE=False):
+            with self.assertLogs('blackbox.celery', level='WARNING'):
+                check_shared_cache()
+
+    def test_shared_cache_accepted(self):
+        """Test that a Redis cache passes."""
+        with override_settings(CACHES=self.REDIS, CELERY_REQUIRE_SHARED_CACHE=True):
+            check_shared_cache()
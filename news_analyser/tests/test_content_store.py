@@ -0,0 +1,129 @@
+"""
+Unit tests for the URL-keyed article content store.
+
+This module tests URL canonicalisation, store hits and misses, re-extraction
+after extractor upgrades and eviction.
+"""
+
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+from news_analyser import content_store
+from news_analyser.content_store import (
+    canonical_url, evict, fetch_article, store_browser_content, stored_content
+)
+from news_analyser.exceptions import ContentExtractionError
+from news_analyser.models import ArticleContent
+
+URL = "https://www.example.com/markets/tcs-results"
+PAGE = "<html><body><div class='story'>" + "<p>TCS beat estimates, lifted guidance, and raised its dividend.</p>" * 8 + "</div></body></html>"
+
+
+class CanonicalUrlTest(TestCase):
+    """Test cases for store key normalisation."""
+
+    def test_tracking_noise_is_removed(self):
+        """Test that variants of one article URL share a key."""
+        variants = [
+            "http://WWW.Example.com/markets/tcs-results/",
+            "https://www.example.com/markets/tcs-results?utm_source=rss&utm_medium=feed",
+            "https://www.example.com/markets/tcs-results#comments",
+            "https://www.example.com/markets/tcs-results?from=mdr",
+        ]
+        self.assertEqual({canonical_url(url) for url in variants}, {URL})
+
+    def test_meaningful_query_is_kept_sorted(self):
+        """Test that article-identifying parameters survive in a stable order."""
+        self.assertEqual(
+            canonical_url("https://example.com/story?page=2&id=7"),
+            "https://example.com/story?id=7&page=2")
+
+
+@override_settings(CONTENT_MIN_CHARS=200)
+class FetchArticleTest(TestCase):
+    """Test cases for reading and filling the store."""
+
+    @patch('news_analyser.content_store.fetch_html', return_value=(URL, PAGE))
+    def test_second_fetch_is_served_from_store(self, mock_fetch):
+        """Test that the publisher is contacted once per article."""
+        first = fetch_article(URL + "?utm_source=rss")
+        second = fetch_article(URL)
+
+        self.assertEqual(first, second)
+        mock_fetch.assert_called_once()
+        entry = ArticleContent.objects.get(url=URL)
+        self.assertEqual(entry.get_html(), PAGE)
+        self.assertLess(entry.html_bytes, len(PAGE))
+
+    @patch('news_analyser.content_store.fetch_html', return_value=(URL, PAGE))
+    def test_extractor_upgrade_reuses_stored_html(self, mock_fetch):
+        """Test that a newer extractor re-extracts without a network request."""
+        fetch_article(URL)
+        ArticleContent.objects.filter(url=URL).update(extractor_version=0, content="stale")
+
+        article = fetch_article(URL)
+
+        self.assertIn("TCS beat estimates", article.content)
+        mock_fetch.assert_called_once()
+        self.assertEqual(ArticleContent.objects.get(url=URL).extractor_version,
+                         content_store.EXTRACTOR_VERSION)
+
+    @patch('news_analyser.content_store.fetch_html', return_value=(URL, PAGE))
+    def test_expired_entry_is_refetched(self, mock_fetch):
+        """Test that entries past the TTL are fetched again."""
+        fetch_article(URL)
+        ArticleContent.objects.filter(url=URL).update(fetched_at=timezone.now() - timedelta(days=365))
+
+        fetch_article(URL)
+
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('news_analyser.content_store.fetch_html', return_value=(URL, "<html><body><p>Paywall</p></body></html>"))
+    def test_failed_extraction_keeps_html(self, mock_fetch):
+        """Test that unextractable pages are stored for later extractors."""
+        with self.assertRaises(ContentExtractionError):
+            fetch_article(URL)
+
+        entry = ArticleContent.objects.get(url=URL)
+        self.assertEqual(entry.content, "")
+        self.assertIn("Paywall", entry.get_html())
+        self.assertIsNone(stored_content(URL))
+
+    def test_browser_content_is_stored(self):
+        """Test that browser extractions are reused by later reads."""
+        store_browser_content(URL, "Full article")
+
+        self.assertEqual(stored_content(URL + "/"), "Full article")
+        self.assertEqual(fetch_article(URL).method, "browser")
+
+
+class EvictTest(TestCase):
+    """Test cases for TTL and size based eviction."""
+
+    def _entry(self, url, size, accessed_days_ago, fetched_days_ago=0):
+        now = timezone.now()
+        return ArticleContent.objects.create(
+            url=url, content="x" * size,
+            fetched_at=now - timedelta(days=fetched_days_ago),
+            accessed_at=now - timedelta(days=accessed_days_ago))
+
+    @override_settings(CONTENT_STORE_TTL_DAYS=30)
+    def test_expired_entries_are_deleted(self):
+        """Test that entries fetched before the TTL are removed."""
+        self._entry("https://a.com/old", 10, 40, fetched_days_ago=40)
+        self._entry("https://a.com/new", 10, 1)
+
+        self.assertEqual(evict(), 1)
+        self.assertEqual(list(ArticleContent.objects.values_list('url', flat=True)), ["https://a.com/new"])
+
+    @override_settings(CONTENT_STORE_MAX_MB=1)
+    def test_least_recently_read_evicted_over_cap(self):
+        """Test that the oldest-read entries go first until under the cap."""
+        half = 512 * 1024
+        self._entry("https://a.com/1", half, 3)
+        self._entry("https://a.com/2", half, 2)
+        self._entry("https://a.com/3", half, 1)
+
+        self.assertEqual(evict(), 1)
+        self.assertFalse(ArticleContent.objects.filter(url="https://a.com/1").exists())
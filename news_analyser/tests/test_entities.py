@@ -0,0 +1,159 @@
+"""
+Unit tests for local ticker and company-name extraction.
+
+This module tests alias normalisation, the token-trie matcher and the
+cross-check of analysis tickers against the NSE symbol list.
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+from news_analyser.entities import (
+    EntityMatcher, company_aliases, cross_check_tickers, extract_tickers, get_nse_companies,
+    invalidate_entity_matcher, search_aliases
+)
+from news_analyser.models import News, Keyword, Stock
+from news_analyser import metrics
+
+COMPANIES = [
+    ("TCS", "Tata Consultancy Services Limited"),
+    ("LT", "Larsen & Toubro Limited"),
+    ("MARUTI", "Maruti Suzuki India Limited"),
+    ("SBIN", "State Bank of India"),
+    ("M&M", "Mahindra & Mahindra Limited"),
+    ("TATAPOWER", "The Tata Power Company Limited"),
+    ("INFY", "Infosys Limited"),
+    ("ITC", "ITC Limited"),
+    ("STAR", "Strides Pharma Science Limited"),
+]
+
+
+class CompanyAliasesTest(TestCase):
+    """Test cases for turning registered names into aliases."""
+
+    def test_legal_suffixes_dropped(self):
+        """Test that legal suffixes and a leading article are removed."""
+        self.assertEqual(company_aliases("The Tata Power Company Limited"), [("tata", "power", "company")])
+        self.assertEqual(company_aliases("Larsen & Toubro Ltd"), [("larsen", "and", "toubro")])
+
+    def test_trailing_india(self):
+        """Test that a trailing India is optional unless it completes the name."""
+        self.assertEqual(company_aliases("Maruti Suzuki India Limited"),
+                         [("maruti", "suzuki", "india"), ("maruti", "suzuki")])
+        self.assertEqual(company_aliases("State Bank of India"), [("state", "bank", "of", "india")])
+
+    def test_short_single_words_skipped(self):
+        """Test that names reducing to a short single word are not aliases."""
+        self.assertEqual(company_aliases("ITC Limited"), [])
+
+
+class NSECompaniesTest(TestCase):
+    """Test cases for the bundled NSE ticker list."""
+
+    def test_loaded_from_csv(self):
+        """Test that the bundled NSE ticker list is loaded with company names."""
+        companies = dict(get_nse_companies())
+        self.assertIn('RELIANCE', companies)
+        self.assertTrue(companies['TCS'])
+        self.assertGreater(len(companies), 1000)
+
+
+class EntityMatcherTest(TestCase):
+    """Test cases for matching symbols and names in text."""
+
+    def setUp(self):
+        """Build a matcher over a few companies."""
+        self.matcher = EntityMatcher(COMPANIES)
+
+    def test_names_and_symbols(self):
+        """Test that names, ampersand spellings and symbols are all found."""
+        text = ("Larsen and Toubro and Tata Consultancy Services rose while "
+                "M&M and ITC fell; Maruti Suzuki was flat.")
+
+        self.assertEqual(self.matcher.extract(text), ["ITC", "LT", "M&M", "MARUTI", "TCS"])
+
+    def test_longest_match_wins(self):
+        """Test that a longer name is preferred over a prefix of it."""
+        matcher = EntityMatcher(COMPANIES + [("TATA", "Tata Limited")])
+
+        self.assertEqual(matcher.extract("Tata Power Company shares"), ["TATAPOWER"])
+
+    def test_word_boundaries(self):
+        """Test that symbols and names only match whole words."""
+        self.assertEqual(self.matcher.extract("TCSX and Infosysland and itc"), [])
+
+    def test_ambiguous_symbols_skipped(self):
+        """Test that symbols that are ordinary words need their company name."""
+        self.assertEqual(self.matcher.extract("STAR performers of the week"), [])
+
+    def test_curated_aliases(self):
+        """Test that curated short forms match and settle shared names."""
+        matcher = EntityMatcher(
+            COMPANIES + [("TATAMOTORS", "Tata Motors Limited"), ("TATAMTRDVR", "Tata Motors Limited")],
+            aliases={"LT": ["L&T"], "TATAMOTORS": ["Tata Motors"], "UNLISTED": ["Nothing"]})
+
+        self.assertEqual(matcher.extract("L&T and Tata Motors win orders"), ["LT", "TATAMOTORS"])
+        self.assertEqual(matcher.aliases_for("LT"), ["larsen and toubro", "l&t"])
+        self.assertEqual(matcher.aliases_for("UNLISTED"), [])
+
+    def test_shared_names_skipped(self):
+        """Test that a name used by two listings matches neither."""
+        matcher = EntityMatcher([("ABC", "Acme Industries Ltd"), ("ABCDVR", "Acme Industries Limited")])
+
+        self.assertEqual(matcher.extract("Acme Industries wins order"), [])
+
+
+class TickerIngestTest(TestCase):
+    """Test cases for extraction at ingest and after analysis."""
+
+    def setUp(self):
+        """Reset the matcher and counters and add a watchlist-only stock."""
+        cache.clear()
+        invalidate_entity_matcher()
+        Stock.objects.create(symbol="NEWCO", name="Newco Ventures Limited")
+        self.keyword = Keyword.objects.create(name="markets")
+
+    def test_parse_news_sets_tickers(self):
+        """Test that ingested articles carry tickers before analysis."""
+        news = News.parse_news({
+            'title': 'Infosys and Newco Ventures sign deal',
+            'summary': 'HDFCBANK to fund the project',
+            'link': 'https://example.com/deal',
+            'published': 'Thu, 15 Nov 2025 10:00:00 GMT',
+        }, self.keyword)
+
+        self.assertEqual(news.extracted_tickers, ["HDFCBANK", "INFY", "NEWCO"])
+        self.assertEqual(news.mentioned_tickers, news.extracted_tickers)
+
+    def test_cross_check_drops_unknown(self):
+        """Test that unknown analysis tickers are dropped and counted."""
+        tickers = cross_check_tickers(["TCS.NS", "NSE:INFY", "NOTREAL"], ["HDFCBANK"])
+
+        self.assertEqual(tickers, ["HDFCBANK", "INFY", "TCS"])
+        self.assertEqual(metrics.get_counts(metrics.TICKERS_CONFIRMED, metrics.TICKERS_UNKNOWN),
+                         {metrics.TICKERS_CONFIRMED: 2, metrics.TICKERS_UNKNOWN: 1})
+
+    def test_extract_joins_parts(self):
+        """Test that every article part is searched."""
+        self.assertEqual(extract_tickers("Headline", None, "Body mentions Reliance Industries"), ["RELIANCE"])
+
+
+class SearchAliasesTest(TestCase):
+    """Test cases for expanding stock searches into aliases."""
+
+    def setUp(self):
+        """Reset the matcher."""
+        cache.clear()
+        invalidate_entity_matcher()
+
+    def test_registered_and_curated_names(self):
+        """Test that a symbol expands to its registered name and short forms."""
+        aliases = search_aliases(["RELIANCE", "NOTASYMBOL"])
+
+        self.assertEqual(list(aliases), ["RELIANCE"])
+        self.assertEqual(aliases["RELIANCE"], ["reliance industries", "ril"])
+
+    def test_stock_aliases_field(self):
+        """Test that aliases saved on a stock are picked up after the change."""
+        Stock.objects.create(symbol="INFY", name="Infosys Limited", aliases=["Infy"])
+
+        self.assertIn("infy", search_aliases(["INFY"])["INFY"])
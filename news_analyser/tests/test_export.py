@@ -0,0 +1,129 @@
+"""
+Unit tests for the Parquet news export.
+
+This module tests partitioned output, ticker columns and incremental
+export from the watermark.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pyarrow.dataset as ds
+from django.core.management import call_command
+from django.test import TestCase
+from news_analyser.export import WATERMARK_FILE, export_news, read_watermark
+from news_analyser.models import News, Keyword, NewsStock, Source, Stock
+from news_analyser.tasks import set_analysis_status
+from news_analyser.tests.factories import make_news
+
+
+def november(day):
+    return datetime(2025, 11, day, 10, tzinfo=dt_timezone.utc)
+
+
+class ExportNewsTest(TestCase):
+    """Test cases for exporting news to Parquet."""
+
+    def setUp(self):
+        """Set up an export directory and some news."""
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.keyword = Keyword.objects.create(name="TCS")
+        self.source = Source.objects.create(id_name="economic_times", name="Economic Times",
+                                            url="https://economictimes.indiatimes.com")
+        self.tcs = Stock.objects.create(symbol="TCS", name="Tata Consultancy Services")
+
+    def _read(self):
+        return ds.dataset(self.root, format="parquet", partitioning="hive").to_table().to_pylist()
+
+    def test_partitioned_by_day_and_source(self):
+        """Test that files are laid out by day and source, with partition values readable."""
+        make_news(self.keyword, "a", date=november(15), source=self.source)
+        make_news(self.keyword, "b", date=november(16))
+
+        self.assertEqual(export_news(root=self.root), 2)
+
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "day=2025-11-15", "source=economic_times")))
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "day=2025-11-16", "source=unknown")))
+        rows = {row['title']: row for row in self._read()}
+        self.assertEqual(str(rows['a']['day']), "2025-11-15")
+        self.assertEqual(rows['a']['source'], "economic_times")
+
+    def test_analysis_and_ticker_columns(self):
+        """Test that sentiment, tickers and linked stocks are exported."""
+        news = make_news(self.keyword, "tcs", 0.6, date=november(15), sentiment_confidence=0.9,
+                         mentioned_tickers=["TCS"], extracted_tickers=["TCS", "INFY"])
+        NewsStock.objects.create(news=news, stock=self.tcs)
+
+        export_news(root=self.root)
+
+        [row] = self._read()
+        self.assertEqual(row['id'], news.id)
+        self.assertEqual(row['impact_rating'], 0.6)
+        self.assertEqual(row['analysis_status'], "done")
+        self.assertEqual(row['extracted_tickers'], ["TCS", "INFY"])
+        self.assertEqual(row['stocks'], ["TCS"])
+
+    def test_incremental_from_watermark(self):
+        """Test that a second run exports only news changed since the first."""
+        first = make_news(self.keyword, "a", date=november(15))
+        make_news(self.keyword, "b", date=november(15))
+        export_news(root=self.root, batch_size=1)
+        self.assertEqual(read_watermark(self.root)[0], News.objects.latest('updated_at', 'id').updated_at)
+
+        self.assertEqual(export_news(root=self.root), 0)
+
+        first.impact_rating = -0.4
+        first.save()
+        make_news(self.keyword, "c", date=november(17))
+        self.assertEqual(export_news(root=self.root), 2)
+
+        rows = self._read()
+        self.assertEqual(len(rows), 4)
+        latest = max((row for row in rows if row['id'] == first.id), key=lambda row: row['updated_at'])
+        self.assertEqual(latest['impact_rating'], -0.4)
+
+    def test_late_commit_inside_overlap_exported(self):
+        """Test that a row stamped before the watermark but committed after it is still exported once."""
+        make_news(self.keyword, "a", date=november(15))
+        export_news(root=self.root)
+        watermark = read_watermark(self.root)[0]
+
+        late = make_news(self.keyword, "late", date=november(15))
+        News.objects.filter(pk=late.pk).update(updated_at=watermark - timedelta(seconds=30))
+
+        self.assertEqual(export_news(root=self.root), 1)
+        self.assertEqual(export_news(root=self.root), 0)
+        self.assertEqual(sorted(row['title'] for row in self._read()), ["a", "late"])
+
+    def test_status_change_reexported(self):
+        """Test that a status set with a bulk update is picked up by the next export."""
+        news = make_news(self.keyword, "a", date=november(15))
+        export_news(root=self.root)
+
+        set_analysis_status(news.id, News.AnalysisStatus.FAILED)
+
+        self.assertEqual(export_news(root=self.root), 1)
+        latest = max(self._read(), key=lambda row: row['updated_at'])
+        self.assertEqual(latest['analysis_status'], "failed")
+
+    def test_batches_written_separately(self):
+        """Test that each batch goes to its own file."""
+        for slug in "abc":
+            make_news(self.keyword, slug, date=november(15))
+
+        export_news(root=self.root, batch_size=2)
+
+        files = os.listdir(os.path.join(self.root, "day=2025-11-15", "source=unknown"))
+        self.assertEqual(len(files), 2)
+
+    def test_command_full_export(self):
+        """Test that --full re-exports everything regardless of the watermark."""
+        make_news(self.keyword, "a", date=november(15))
+        call_command("export_news", output=self.root, stdout=open(os.devnull, "w"))
+        call_command("export_news", output=self.root, full=True, stdout=open(os.devnull, "w"))
+
+        self.assertTrue(os.path.exists(os.path.join(self.root, WATERMARK_FILE)))
+        self.assertEqual(len(self._read()), 2)
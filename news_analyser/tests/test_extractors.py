@@ -0,0 +1,118 @@
+"""
+Unit tests for the plain-HTTP article extractors.
+
+This module tests site profile selection, the per-site and readability
+extraction paths, and HTTP failure handling.
+"""
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from unittest.mock import patch, MagicMock
+import requests
+from news_analyser.extractors import (
+    extract_article, extract_from_html, fetch_html, profile_for
+)
+from news_analyser.exceptions import ContentExtractionError
+
+PARAGRAPH = (
+    "Tata Consultancy Services reported a rise in quarterly profit, "
+    "beating analyst estimates as demand for cloud services held up, "
+    "while margins improved on lower subcontracting costs."
+)
+
+
+def article_page(body_class, paragraphs=4, extra=""):
+    body = "".join(f"<p>{PARAGRAPH}</p>" for _ in range(paragraphs))
+    return (
+        "<html><body><nav><a href='/'>Home</a><a href='/markets'>Markets</a></nav>"
+        f"<div class='{body_class}'>{body}{extra}</div>"
+        "<footer><p>Copyright 2025, all rights reserved by the publisher.</p></footer>"
+        "</body></html>"
+    )
+
+
+@override_settings(CONTENT_MIN_CHARS=200)
+class ExtractFromHtmlTest(TestCase):
+    """Test cases for extracting article bodies from HTML."""
+
+    def test_profile_for_known_hosts(self):
+        """Test that article URLs map to their site profiles."""
+        self.assertEqual(profile_for("https://economictimes.indiatimes.com/markets/x.cms").name, "ET")
+        self.assertEqual(profile_for("https://www.livemint.com/market/x.html").name, "LiveMint")
+        self.assertEqual(profile_for("https://www.thehindu.com/business/x.ece").name, "The Hindu")
+        self.assertIsNone(profile_for("https://example.com/story"))
+
+    def test_site_profile_extracts_body_and_drops_noise(self):
+        """Test that the site selectors pick the body and remove read-more blocks."""
+        html = article_page("artText", extra="<div class='mskPrime'>Subscribe to ET Prime</div>")
+
+        article = extract_from_html(html, "https://economictimes.indiatimes.com/markets/x.cms")
+
+        self.assertEqual(article.method, "profile:ET")
+        self.assertIn("Tata Consultancy Services", article.content)
+        self.assertNotIn("Subscribe", article.content)
+        self.assertNotIn("Copyright", article.content)
+
+    def test_readability_fallback_for_unknown_site(self):
+        """Test that unknown sites are handled by paragraph density scoring."""
+        html = article_page("story-body")
+
+        article = extract_from_html(html, "https://example.com/story")
+
+        self.assertEqual(article.method, "readability")
+        self.assertEqual(article.content.count("Tata Consultancy Services"), 4)
+        self.assertNotIn("Home", article.content)
+
+    def test_profile_miss_falls_back_to_readability(self):
+        """Test that a changed site layout still extracts via readability."""
+        html = article_page("redesigned-body")
+
+        article = extract_from_html(html, "https://www.moneycontrol.com/news/x.html")
+
+        self.assertEqual(article.method, "readability")
+
+    def test_thin_page_raises(self):
+        """Test that pages without enough text are left to the browser agent."""
+        html = article_page("story-body", paragraphs=1)
+
+        with self.assertRaises(ContentExtractionError):
+            extract_from_html(html, "https://example.com/story")
+
+
+@override_settings(CONTENT_MIN_CHARS=200)
+class FetchHtmlTest(TestCase):
+    """Test cases for downloading pages over HTTP."""
+
+    def setUp(self):
+        """Reset shared politeness state."""
+        cache.clear()
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_extract_article_uses_final_url(self, mock_get):
+        """Test that the profile is chosen from the URL after redirects."""
+        mock_get.return_value = MagicMock(
+            url="https://economictimes.indiatimes.com/markets/x.cms",
+            text=article_page("artText"),
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+
+        article = extract_article("https://news.google.com/rss/articles/abc")
+
+        self.assertEqual(article.method, "profile:ET")
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_http_error_raises_extraction_error(self, mock_get):
+        """Test that network failures surface as ContentExtractionError."""
+        mock_get.side_effect = requests.ConnectionError("refused")
+
+        with self.assertRaises(ContentExtractionError):
+            fetch_html("https://example.com/story")
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_non_html_response_raises(self, mock_get):
+        """Test that PDFs and other documents are not parsed as HTML."""
+        mock_get.return_value = MagicMock(
+            url="https://example.com/report.pdf", text="%PDF", headers={"Content-Type": "application/pdf"})
+
+        with self.assertRaises(ContentExtractionError):
+            fetch_html("https://example.com/report.pdf")
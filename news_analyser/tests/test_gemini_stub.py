@@ -0,0 +1,117 @@
+"""
+Tests for the local Gemini stand-in server.
+
+These exercise the real ``google-genai`` client over HTTP against the stub,
+covering the wire protocol, error injection and key failover.
+"""
+
+import json
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from google import genai
+from news_analyser.models import News, Keyword
+from news_analyser.tasks import analyse_news_task, get_gemini_client
+from news_analyser.utils.gemini_stub import GeminiStubConfig, start_stub_server
+
+MODEL = "gemini-flash-lite-latest"
+
+
+class GeminiStubTestMixin:
+    """Start a stub server for each test and point the client at it."""
+
+    stub_config = GeminiStubConfig(seed=1)
+
+    def setUp(self):
+        self.server = start_stub_server(config=self.stub_config)
+        self.settings_override = override_settings(GEMINI_BASE_URL=self.server.base_url)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class GeminiStubProtocolTest(GeminiStubTestMixin, TestCase):
+    """Test cases for the generateContent wire protocol."""
+
+    def test_returns_valid_analysis_json(self):
+        """Test that a normal response carries valid analysis JSON."""
+        client = get_gemini_client("test-key")
+        response = client.models.generate_content(
+            model=MODEL, contents="Title: TCS wins INFY deal\nSummary: big order"
+        )
+        data = json.loads(response.text)
+
+        self.assertTrue(-1 <= data['sentiment'] <= 1)
+        self.assertTrue(0 <= data['confidence'] <= 1)
+        self.assertEqual(data['tickers'], ['INFY', 'TCS'])
+        self.assertIn(data['impact_timeline'], ['immediate', 'short-term', 'medium-term', 'long-term'])
+        self.assertEqual(self.server.stats[200], 1)
+
+    def test_responses_are_deterministic_per_prompt(self):
+        """Test that the same prompt always produces the same analysis."""
+        client = get_gemini_client("test-key")
+        first = client.models.generate_content(model=MODEL, contents="Title: Same")
+        second = client.models.generate_content(model=MODEL, contents="Title: Same")
+        self.assertEqual(first.text, second.text)
+
+    def test_exhausted_key_is_rate_limited(self):
+        """Test that configured keys always receive a 429."""
+        self.server.config = GeminiStubConfig(exhausted_keys=frozenset({"dead-key"}))
+
+        dead_client = get_gemini_client("dead-key")
+        with self.assertRaises(genai.errors.ClientError) as ctx:
+            dead_client.models.generate_content(model=MODEL, contents="x")
+        self.assertEqual(ctx.exception.code, 429)
+
+        live_client = get_gemini_client("live-key")
+        response = live_client.models.generate_content(model=MODEL, contents="x")
+        self.assertIn('sentiment', json.loads(response.text))
+
+    def test_server_error_injection(self):
+        """Test that a 100% server error rate surfaces as a ServerError."""
+        self.server.config = GeminiStubConfig(rate_500=1.0)
+        client = get_gemini_client("test-key")
+        with self.assertRaises(genai.errors.ServerError):
+            client.models.generate_content(model=MODEL, contents="x")
+
+    def test_malformed_output_injection(self):
+        """Test that malformed output is not bare JSON."""
+        self.server.config = GeminiStubConfig(rate_malformed=1.0)
+        client = get_gemini_client("test-key")
+        response = client.models.generate_content(model=MODEL, contents="x")
+        with self.assertRaises(json.JSONDecodeError):
+            json.loads(response.text)
+        self.assertEqual(self.server.stats['malformed'], 1)
+
+    def test_invalid_config_rejected(self):
+        """Test that impossible error rates are rejected."""
+        with self.assertRaises(ValueError):
+            GeminiStubConfig(rate_429=0.8, rate_500=0.5)
+        with self.assertRaises(ValueError):
+            GeminiStubConfig(latency='pareto')
+
+
+@patch('news_analyser.tasks.GEMINI_API_KEYS', ['test-key'])
+class GeminiStubTaskTest(GeminiStubTestMixin, TestCase):
+    """Run analyse_news_task end to end against the stub."""
+
+    def setUp(self):
+        super().setUp()
+        keyword = Keyword.objects.create(name="TCS")
+        self.news = News.objects.create(
+            title="TCS Wins Major Contract",
+            content_summary="TCS secures $500M deal",
+            link="https://example.com/tcs-stub",
+            keyword=keyword
+        )
+
+    def test_task_analyses_news_via_stub(self):
+        """Test that the task stores the stub's analysis."""
+        result = analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.assertEqual(result['status'], 'success')
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.impact_rating, result['sentiment_score'])
+        self.assertEqual(self.news.mentioned_tickers, ['TCS'])
@@ -4,7 +4,10 @@ Integration tests for News Analyser application.
 This module tests end-to-end workflows combining multiple components.
 """
 
+from django.core.cache import cache
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from django.contrib.auth.models import User
 from unittest.mock import patch, MagicMock
@@ -194,3 +197,59 @@ class UserWorkflowIntegrationTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "RELIANCE")
         self.assertContains(response, "TCS")
+
+
+class ResultRenderingQueryTest(TestCase):
+    """Test that result pages use a fixed number of queries."""
+
+    def setUp(self):
+        """Set up a user with search history."""
+        cache.clear()
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pass123')
+        self.sources = [
+            Source.objects.create(id_name=f"S{i}", name=f"Source {i}", url=f"https://s{i}.example.com")
+            for i in range(3)
+        ]
+        self.client.login(username='reader', password='pass123')
+
+    def _add_search(self, name, articles):
+        keyword = Keyword.objects.create(name=name)
+        self.user.profile.searches.add(keyword)
+        for i in range(articles):
+            News.objects.create(
+                title=f"{name} news {i}", content_summary="Summary",
+                link=f"https://example.com/{name}/{i}", keyword=keyword,
+                source=self.sources[i % len(self.sources)], content="x" * 1000
+            )
+        return keyword
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_all_searches_query_count_is_flat(self):
+        """Test that more keywords and articles do not add queries."""
+        self._add_search("TCS", 2)
+        small, _ = self._count_queries(reverse('news_analyser:all_searches'))
+
+        for name in ("INFY", "WIPRO", "HDFC"):
+            self._add_search(name, 5)
+        large, response = self._count_queries(reverse('news_analyser:all_searches'))
+
+        self.assertEqual(small, large)
+        self.assertContains(response, "Source 2")
+        self.assertContains(response, "WIPRO news 4")
+
+    def test_search_result_defers_heavy_columns(self):
+        """Test that article bodies are not loaded for the result table."""
+        keyword = self._add_search("TCS", 3)
+        _, response = self._count_queries(
+            reverse('news_analyser:search_results', args=[keyword.id]))
+
+        news_list = response.context['kw_link'][keyword].object_list
+        self.assertEqual(len(news_list), 3)
+        self.assertEqual(
+            news_list[0].get_deferred_fields() & {'content', 'raw_gemini_response'},
+            {'content', 'raw_gemini_response'})
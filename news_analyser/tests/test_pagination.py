@@ -0,0 +1,153 @@
+"""
+Unit tests for keyset pagination.
+
+This module tests cursor encoding, page boundaries and the paginated
+result and history views.
+"""
+
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from news_analyser.exceptions import InvalidCursorError
+from news_analyser.models import News, Keyword
+from news_analyser.pagination import decode_cursor, encode_cursor, paginate
+
+
+class CursorTest(TestCase):
+    """Test cases for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the timestamp and key it encodes."""
+        now = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(now, 42)), (now, 42))
+
+    def test_invalid_cursor(self):
+        """Test that garbage cursors raise InvalidCursorError."""
+        for cursor in ('not-a-cursor', '!!!', encode_cursor(timezone.now(), 1)[:-4]):
+            with self.assertRaises(InvalidCursorError):
+                decode_cursor(cursor)
+
+
+class PaginateTest(TestCase):
+    """Test cases for paging through news newest first."""
+
+    def setUp(self):
+        """Create news, some sharing a timestamp."""
+        self.keyword = Keyword.objects.create(name="TCS")
+        base = timezone.now()
+        self.news = [
+            News.objects.create(
+                title=f"News {i}", content_summary="", link=f"https://example.com/p/{i}",
+                keyword=self.keyword, date=base - timedelta(hours=i // 2)
+            )
+            for i in range(7)
+        ]
+
+    def _all_pages(self, page_size):
+        pages, cursor = [], None
+        while True:
+            page = paginate(self.keyword.news.all(), cursor, page_size)
+            pages.append([n.id for n in page.object_list])
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_row_once(self):
+        """Test that pages are disjoint, ordered and complete, even on ties."""
+        pages = self._all_pages(3)
+
+        self.assertEqual([len(p) for p in pages], [3, 3, 1])
+        flat = [i for p in pages for i in p]
+        expected = [n.id for n in sorted(self.news, key=lambda n: (n.date, n.id), reverse=True)]
+        self.assertEqual(flat, expected)
+
+    def test_exact_multiple_has_no_empty_page(self):
+        """Test that the last full page has no next cursor."""
+        self.assertEqual([len(p) for p in self._all_pages(7)], [7])
+
+    def test_cursor_is_stable_when_news_arrives(self):
+        """Test that inserting newer rows does not shift later pages."""
+        first = paginate(self.keyword.news.all(), None, 3)
+        News.objects.create(
+            title="Breaking", content_summary="", link="https://example.com/p/new",
+            keyword=self.keyword
+        )
+        second = paginate(self.keyword.news.all(), first.next_cursor, 3)
+
+        self.assertEqual(
+            [n.id for n in second.object_list],
+            [n.id for n in paginate(self.keyword.news.exclude(title="Breaking"), first.next_cursor, 3).object_list]
+        )
+
+
+@override_settings(RESULTS_PAGE_SIZE=2, HISTORY_PAGE_SIZE=2)
+class PaginatedViewsTest(TestCase):
+    """Test cases for paginated result and history pages."""
+
+    def setUp(self):
+        """Set up a user with three searches of three articles each."""
+        cache.clear()
+        self.user = User.objects.create_user('pager', 'pager@example.com', 'pass123')
+        self.keywords = []
+        for name in ("TCS", "INFY", "WIPRO"):
+            keyword = Keyword.objects.create(name=name)
+            self.user.profile.searches.add(keyword)
+            self.keywords.append(keyword)
+            for i in range(3):
+                News.objects.create(
+                    title=f"{name} story {i}", content_summary="",
+                    link=f"https://example.com/{name}/{i}", keyword=keyword,
+                    date=timezone.now() - timedelta(hours=i)
+                )
+        self.client.login(username='pager', password='pass123')
+
+    def test_result_page_is_limited(self):
+        """Test that a keyword's result page shows one page and a cursor."""
+        keyword = self.keywords[0]
+        response = self.client.get(reverse('news_analyser:search_results', args=[keyword.id]))
+
+        page = response.context['kw_link'][keyword]
+        self.assertEqual([n.title for n in page.object_list], ["TCS story 0", "TCS story 1"])
+        self.assertIsNotNone(page.next_cursor)
+        self.assertContains(response, "Load more")
+
+    def test_json_fragment(self):
+        """Test that the infinite-scroll fragment returns the next rows."""
+        keyword = self.keywords[0]
+        first = self.client.get(reverse('news_analyser:search_results', args=[keyword.id]))
+        cursor = first.context['kw_link'][keyword].next_cursor
+
+        response = self.client.get(
+            reverse('news_analyser:search_results', args=[keyword.id]),
+            {'format': 'json', 'cursor': cursor}
+        )
+
+        data = response.json()
+        self.assertIn("TCS story 2", data['html'])
+        self.assertNotIn("TCS story 1", data['html'])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_invalid_fragment_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        response = self.client.get(
+            reverse('news_analyser:search_results', args=[self.keywords[0].id]),
+            {'format': 'json', 'cursor': 'bogus'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_history_is_paginated(self):
+        """Test that all_searches pages through keywords newest first."""
+        response = self.client.get(reverse('news_analyser:all_searches'))
+        first = list(response.context['kw_link'])
+        self.assertEqual(first, [self.keywords[2], self.keywords[1]])
+        self.assertTrue(all(len(p.object_list) == 2 for p in response.context['kw_link'].values()))
+
+        response = self.client.get(
+            reverse('news_analyser:all_searches'),
+            {'cursor': response.context['next_history_cursor']}
+        )
+        self.assertEqual(list(response.context['kw_link']), [self.keywords[0]])
+        self.assertIsNone(response.context['next_history_cursor'])
@@ -0,0 +1,135 @@
+"""
+Unit tests for the saved-query percolator.
+
+This module tests compiling saved queries, matching articles against them
+and writing alerts to the user's inbox.
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth.models import User
+from news_analyser.percolator import Percolator, QuerySpec, get_percolator, percolate
+from news_analyser.tests.factories import make_news
+from news_analyser.models import Alert, News, Keyword, SavedQuery, Sector, Stock
+
+
+def spec(query_id, symbols=(), keywords=(), sector_id=None, above=None, below=None):
+    return QuerySpec(query_id, 1, frozenset(symbols), tuple(keywords), sector_id, above, below)
+
+
+class PercolatorTest(TestCase):
+    """Test cases for matching one article against compiled queries."""
+
+    def test_symbol_keyword_and_sector_indexes(self):
+        """Test that each kind of criterion selects its queries."""
+        percolator = Percolator([
+            spec(1, symbols=["TCS"]), spec(2, keywords=["order win"]), spec(3, sector_id=7), spec(4, symbols=["INFY"]),
+        ])
+
+        matches = percolator.match("Big order win for the company", tickers=["tcs"], sector_ids=[7])
+
+        self.assertEqual([match.id for match in matches], [1, 2, 3])
+
+    def test_keywords_match_whole_words(self):
+        """Test that keywords do not match inside other words."""
+        percolator = Percolator([spec(1, keywords=["ipo"])])
+
+        self.assertEqual(percolator.match("Tipos and ipos"), [])
+        self.assertEqual(len(percolator.match("IPO opens today")), 1)
+
+    def test_sentiment_bounds(self):
+        """Test that bounded queries wait for analysis and then filter on it."""
+        percolator = Percolator([spec(1, symbols=["TCS"], above=0.5), spec(2, symbols=["TCS"], below=-0.5)])
+
+        self.assertEqual(percolator.match("", tickers=["TCS"]), [])
+        self.assertEqual([m.id for m in percolator.match("", tickers=["TCS"], sentiment=0.7)], [1])
+        self.assertEqual([m.id for m in percolator.match("", tickers=["TCS"], sentiment=-0.6)], [2])
+        self.assertEqual(percolator.match("", tickers=["TCS"], sentiment=0.1), [])
+
+
+class PercolateTest(TestCase):
+    """Test cases for alerts raised from saved queries."""
+
+    def setUp(self):
+        """Set up a user with a watchlist and saved queries."""
+        cache.clear()
+        self.user = User.objects.create_user('watcher', 'watch@example.com', 'pass123')
+        self.tcs = Stock.objects.create(symbol="TCS", name="Tata Consultancy Services")
+        self.keyword = Keyword.objects.create(name="markets")
+        self.watchlist = SavedQuery.objects.create(user=self.user, name="Watchlist", include_watchlist=True)
+        self.bearish = SavedQuery.objects.create(
+            user=self.user, name="Bad news", keywords=["downgrade"], sentiment_below=-0.3)
+
+    def test_watchlist_follows_portfolio(self):
+        """Test that watchlist queries pick up stocks added after compiling."""
+        percolate(make_news(self.keyword, "Before", mentioned_tickers=["TCS"]))
+        self.assertFalse(Alert.objects.exists())
+
+        self.user.profile.stocks.add(self.tcs)
+        percolate(make_news(self.keyword, "After", mentioned_tickers=["TCS"]))
+
+        alert = Alert.objects.get()
+        self.assertEqual((alert.user, alert.saved_query, alert.news.title), (self.user, self.watchlist, "After"))
+
+    def test_ingest_then_analysis_does_not_duplicate(self):
+        """Test that percolating again after analysis adds only newly matching queries."""
+        self.user.profile.stocks.add(self.tcs)
+        news = make_news(self.keyword, "TCS downgrade", extracted_tickers=["TCS"])
+        self.assertEqual(percolate(news), 1)
+
+        news.impact_rating = -0.6
+        news.analysis_status = News.AnalysisStatus.DONE
+        news.save()
+        self.assertEqual(percolate(news), 2)
+
+        self.assertEqual(
+            set(Alert.objects.values_list('saved_query__name', flat=True)), {"Watchlist", "Bad news"})
+        self.assertEqual(Alert.objects.count(), 2)
+
+    def test_deleted_query_stops_matching(self):
+        """Test that saving or deleting a query recompiles the percolator."""
+        self.bearish.delete()
+        self.watchlist.delete()
+
+        self.assertEqual(len(get_percolator()), 0)
+
+    def test_sector_query(self):
+        """Test that sector queries match through the sector terms."""
+        sector = Sector.objects.create(name="IT", search_fields="software services")
+        SavedQuery.objects.create(user=self.user, name="IT", sector=sector)
+
+        self.assertEqual(percolate(make_news(self.keyword, "Software services demand slows")), 1)
+
+
+class AlertsViewTest(TestCase):
+    """Test cases for the alert inbox page."""
+
+    def setUp(self):
+        """Set up a logged-in user."""
+        cache.clear()
+        self.user = User.objects.create_user('reader', 'read@example.com', 'pass123')
+        self.client.force_login(self.user)
+
+    def test_create_query_and_read_alerts(self):
+        """Test that queries can be saved and alerts marked read."""
+        response = self.client.post(reverse('news_analyser:alerts'), {
+            'action': 'create', 'name': 'Banks', 'symbols': 'hdfcbank, sbin', 'keywords': '',
+        })
+        self.assertRedirects(response, reverse('news_analyser:alerts'))
+        query = SavedQuery.objects.get(user=self.user)
+        self.assertEqual(query.symbols, ["HDFCBANK", "SBIN"])
+
+        keyword = Keyword.objects.create(name="banks")
+        news = make_news(keyword, "SBIN rallies", mentioned_tickers=["SBIN"])
+        percolate(news)
+        self.assertContains(self.client.get(reverse('news_analyser:alerts')), "SBIN rallies")
+
+        self.client.post(reverse('news_analyser:alerts'), {'action': 'read'})
+        self.assertFalse(Alert.objects.filter(read_at__isnull=True).exists())
+
+    def test_query_needs_a_criterion(self):
+        """Test that a query without anything to match is rejected."""
+        self.client.post(reverse('news_analyser:alerts'), {'action': 'create', 'name': 'Empty'})
+
+        self.assertFalse(SavedQuery.objects.exists())
@@ -0,0 +1,120 @@
+"""
+Unit tests for per-host fetch politeness.
+
+This module tests concurrency caps, minimum delays, robots.txt crawl-delay
+caching and backoff after throttling responses.
+"""
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from unittest.mock import patch, MagicMock
+from news_analyser import politeness
+from news_analyser.politeness import (
+    backoff_remaining, crawl_delay, host_slot, polite_get, record_response
+)
+from news_analyser.exceptions import HostThrottledError
+
+URL = "https://www.livemint.com/market/story.html"
+HOST = "www.livemint.com"
+
+
+def response(status=200, headers=None, text=""):
+    return MagicMock(status_code=status, headers=headers or {}, text=text, ok=status < 400)
+
+
+@override_settings(
+    POLITE_HOST_CONCURRENCY=1, POLITE_MIN_DELAY=0, POLITE_MAX_WAIT=0,
+    POLITE_BACKOFF_BASE=30, POLITE_BACKOFF_MAX=120)
+@patch('news_analyser.politeness.crawl_delay', return_value=None)
+class HostSlotTest(TestCase):
+    """Test cases for concurrency caps and request spacing."""
+
+    def setUp(self):
+        """Reset shared politeness state."""
+        cache.clear()
+
+    def test_concurrency_cap_per_host(self, mock_delay):
+        """Test that a host's slots are exclusive until released."""
+        with host_slot(URL):
+            cache.delete(politeness._key("gate", HOST))
+            with self.assertRaises(HostThrottledError):
+                with host_slot(URL):
+                    pass
+            # Other hosts are unaffected
+            with host_slot("https://www.thehindu.com/x.ece"):
+                pass
+
+    def test_expired_lease_does_not_free_new_holder(self, mock_delay):
+        """Test that a fetch outliving its lease leaves the next holder's slot alone."""
+        slot = politeness._key("slot", HOST, 0)
+        with host_slot(URL):
+            # The lease expired and another request took the slot
+            cache.set(slot, "other-token")
+
+        self.assertEqual(cache.get(slot), "other-token")
+
+    @override_settings(POLITE_MIN_DELAY=5)
+    def test_min_delay_between_requests(self, mock_delay):
+        """Test that a second request inside the delay window is deferred."""
+        with host_slot(URL):
+            pass
+
+        with self.assertRaises(HostThrottledError) as ctx:
+            with host_slot(URL):
+                pass
+        self.assertGreaterEqual(ctx.exception.retry_after, 5)
+
+    def test_backoff_doubles_and_resets(self, mock_delay):
+        """Test that consecutive throttles back off exponentially and success resets."""
+        record_response(HOST, 429)
+        self.assertAlmostEqual(backoff_remaining(HOST), 30, delta=1)
+        record_response(HOST, 503)
+        self.assertAlmostEqual(backoff_remaining(HOST), 60, delta=1)
+
+        record_response(HOST, 200)
+        cache.delete(politeness._key("backoff", HOST))
+        record_response(HOST, 429)
+        self.assertAlmostEqual(backoff_remaining(HOST), 30, delta=1)
+
+    def test_retry_after_header_is_honoured(self, mock_delay):
+        """Test that Retry-After extends the backoff, within the cap."""
+        record_response(HOST, 429, retry_after="90")
+        self.assertAlmostEqual(backoff_remaining(HOST), 90, delta=1)
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_polite_get_raises_on_throttle(self, mock_get, mock_delay):
+        """Test that a 429 raises and blocks the host for later callers."""
+        mock_get.return_value = response(429)
+
+        with self.assertRaises(HostThrottledError):
+            polite_get(URL)
+        with self.assertRaises(HostThrottledError):
+            polite_get(URL)
+        mock_get.assert_called_once()
+
+
+@override_settings(POLITE_ROBOTS_TTL=60)
+class CrawlDelayTest(TestCase):
+    """Test cases for robots.txt crawl-delay discovery."""
+
+    def setUp(self):
+        """Reset shared politeness state."""
+        cache.clear()
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_crawl_delay_is_read_once(self, mock_get):
+        """Test that robots.txt is fetched once per host and cached."""
+        mock_get.return_value = response(text="User-agent: *\nCrawl-delay: 4\nDisallow: /search")
+
+        self.assertEqual(crawl_delay(HOST), 4)
+        self.assertEqual(crawl_delay(HOST), 4)
+        mock_get.assert_called_once()
+
+    @patch('news_analyser.politeness.requests.get')
+    def test_missing_robots_means_no_delay(self, mock_get):
+        """Test that hosts without robots.txt get no crawl delay."""
+        mock_get.return_value = response(404)
+
+        self.assertIsNone(crawl_delay(HOST))
+        self.assertIsNone(crawl_delay(HOST))
+        mock_get.assert_called_once()
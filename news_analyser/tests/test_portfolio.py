@@ -0,0 +1,140 @@
+"""
+Unit tests for the watchlist sentiment dashboard.
+
+This module tests linking analysed news to stocks, the per-stock daily
+aggregates and the cached portfolio summary.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from news_analyser.portfolio import index_news, portfolio_summary, rebuild_stock_sentiment
+from news_analyser.tests.factories import make_news
+from news_analyser.models import Keyword, NewsStock, Stock, StockSentimentDaily
+
+
+class StockIndexingTest(TestCase):
+    """Test cases for per-stock daily aggregates."""
+
+    def setUp(self):
+        """Set up stocks and a keyword."""
+        cache.clear()
+        self.tcs = Stock.objects.create(symbol="TCS", name="Tata Consultancy Services")
+        self.infy = Stock.objects.create(symbol="INFY", name="Infosys")
+        self.keyword = Keyword.objects.create(name="TCS")
+
+    def test_news_linked_by_search_and_tickers(self):
+        """Test that an article counts for its searched symbol and mentioned tickers."""
+        news = make_news(self.keyword, "IT majors rally", 0.5, mentioned_tickers=["infy"])
+
+        self.assertEqual(index_news(news), sorted([self.tcs.id, self.infy.id]))
+        row = StockSentimentDaily.objects.get(stock=self.infy)
+        self.assertEqual((row.news_count, row.positive), (1, 1))
+
+    def test_news_linked_by_extracted_tickers(self):
+        """Test that cross-checked local extractions link stocks Gemini left out."""
+        news = make_news(self.keyword, "IT majors rally", 0.5)
+        news.extracted_tickers = ["INFY"]
+        news.save()
+
+        self.assertIn(self.infy.id, index_news(news))
+        self.assertTrue(StockSentimentDaily.objects.filter(stock=self.infy).exists())
+
+    def test_reanalysis_updates_rows(self):
+        """Test that a changed rating and tickers are reflected on re-index."""
+        news = make_news(self.keyword, "IT majors rally", 0.5, mentioned_tickers=["INFY"])
+        index_news(news)
+
+        news.impact_rating = -0.6
+        news.mentioned_tickers = []
+        news.save()
+        index_news(news)
+
+        self.assertFalse(StockSentimentDaily.objects.filter(stock=self.infy).exists())
+        row = StockSentimentDaily.objects.get(stock=self.tcs)
+        self.assertEqual((row.news_count, row.negative), (1, 1))
+
+    def test_rebuild(self):
+        """Test that a rebuild links history and recomputes rows."""
+        make_news(self.keyword, "TCS deal", 0.4, days_ago=3)
+        make_news(self.keyword, "TCS miss", -0.4, days_ago=1)
+
+        self.assertEqual(rebuild_stock_sentiment(), 2)
+        self.assertEqual(StockSentimentDaily.objects.filter(stock=self.tcs).count(), 2)
+        self.assertEqual(NewsStock.objects.count(), 2)
+
+
+class PortfolioSummaryTest(TestCase):
+    """Test cases for the per-user dashboard."""
+
+    def setUp(self):
+        """Set up a user watching three stocks with some daily sentiment."""
+        cache.clear()
+        self.user = User.objects.create_user('investor', 'investor@example.com', 'pass123')
+        self.tcs = Stock.objects.create(symbol="TCS", name="Tata Consultancy Services")
+        self.infy = Stock.objects.create(symbol="INFY", name="Infosys")
+        self.wipro = Stock.objects.create(symbol="WIPRO", name="Wipro")
+        self.user.profile.stocks.set([self.tcs, self.infy, self.wipro])
+        today = timezone.localdate()
+        StockSentimentDaily.objects.create(stock=self.tcs, day=today, news_count=2, sentiment_sum=1.2)
+        StockSentimentDaily.objects.create(stock=self.tcs, day=today - timedelta(days=9), news_count=1, sentiment_sum=-0.2)
+        StockSentimentDaily.objects.create(stock=self.infy, day=today - timedelta(days=1), news_count=1, sentiment_sum=-0.5)
+        StockSentimentDaily.objects.create(stock=self.infy, day=today - timedelta(days=8), news_count=1, sentiment_sum=-0.4)
+
+    def test_scores_trends_and_movers(self):
+        """Test that scores, trends and movers come from the daily rows."""
+        with self.settings(PORTFOLIO_WINDOW_DAYS=7, PORTFOLIO_TOP_MOVERS=1):
+            summary = portfolio_summary(self.user)
+
+        stocks = {stock['symbol']: stock for stock in summary['stocks']}
+        self.assertEqual(list(stocks), ["INFY", "TCS", "WIPRO"])
+        self.assertAlmostEqual(stocks["TCS"]['score'], 0.6)
+        self.assertAlmostEqual(stocks["TCS"]['trend'], 0.8)
+        self.assertAlmostEqual(stocks["INFY"]['trend'], -0.1)
+        self.assertIsNone(stocks["WIPRO"]['score'])
+        self.assertEqual(len(stocks["TCS"]['series']), 14)
+        self.assertEqual(stocks["TCS"]['series'][-1], 0.6)
+        self.assertEqual([stock['symbol'] for stock in summary['top_movers']], ["TCS"])
+
+    def test_summary_is_one_query_then_cached(self):
+        """Test that a miss costs one query and a hit none."""
+        with self.assertNumQueries(1):
+            first = portfolio_summary(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(portfolio_summary(self.user), first)
+
+    def test_watchlist_change_invalidates(self):
+        """Test that editing the watchlist drops the cached summary."""
+        portfolio_summary(self.user)
+        self.user.profile.stocks.remove(self.wipro)
+
+        symbols = [stock['symbol'] for stock in portfolio_summary(self.user)['stocks']]
+        self.assertEqual(symbols, ["INFY", "TCS"])
+
+    def test_new_analysis_invalidates(self):
+        """Test that refreshed stock sentiment drops cached summaries."""
+        portfolio_summary(self.user)
+        keyword = Keyword.objects.create(name="WIPRO")
+        with self.captureOnCommitCallbacks() as callbacks:
+            index_news(make_news(keyword, "Wipro wins", 0.9))
+            # Until the new rows commit, readers keep the cached summary
+            stocks = {stock['symbol']: stock for stock in portfolio_summary(self.user)['stocks']}
+            self.assertIsNone(stocks["WIPRO"]['score'])
+        for callback in callbacks:
+            callback()
+
+        stocks = {stock['symbol']: stock for stock in portfolio_summary(self.user)['stocks']}
+        self.assertAlmostEqual(stocks["WIPRO"]['score'], 0.9)
+
+    def test_portfolio_view(self):
+        """Test that the dashboard renders and serves JSON."""
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('news_analyser:portfolio'))
+        self.assertContains(response, "Top movers")
+
+        data = self.client.get(reverse('news_analyser:portfolio'), {'format': 'json'}).json()
+        self.assertEqual(len(data['stocks']), 3)
@@ -0,0 +1,127 @@
+"""
+Unit tests for boolean news queries.
+
+This module tests the query parser, the postings index and ranked
+evaluation of AND/OR/NOT and phrase queries.
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth.models import User
+from news_analyser.query import And, Not, Or, Term, index_news_terms, is_boolean_query, parse_query, search
+from news_analyser.exceptions import QuerySyntaxError
+from news_analyser.models import News, Keyword, NewsTerm
+
+
+class ParseQueryTest(TestCase):
+    """Test cases for the query language."""
+
+    def test_precedence_and_implicit_and(self):
+        """Test that AND binds tighter than OR and adjacency means AND."""
+        self.assertEqual(
+            parse_query('tcs infosys OR wipro NOT "job cuts"'),
+            Or((And((Term(("tcs",)), Term(("infosys",)))),
+                And((Term(("wipro",)), Not(Term(("job", "cuts"))))))))
+
+    def test_parentheses(self):
+        """Test that parentheses group sub-queries."""
+        self.assertEqual(
+            parse_query("(tcs OR infy) AND Guidance"),
+            And((Or((Term(("tcs",)), Term(("infy",)))), Term(("guidance",)))))
+
+    def test_syntax_errors(self):
+        """Test that malformed queries raise QuerySyntaxError."""
+        for text in ["", "tcs AND", "(tcs OR infy", "OR tcs", "tcs )"]:
+            with self.subTest(text=text), self.assertRaises(QuerySyntaxError):
+                parse_query(text)
+
+    def test_is_boolean_query(self):
+        """Test that plain comma-separated keywords are not treated as queries."""
+        self.assertFalse(is_boolean_query("TCS, Infosys"))
+        self.assertTrue(is_boolean_query("TCS AND Infosys"))
+        self.assertTrue(is_boolean_query('"order book"'))
+
+
+class SearchTest(TestCase):
+    """Test cases for evaluating queries over the postings index."""
+
+    def setUp(self):
+        """Index a handful of articles."""
+        keyword = Keyword.objects.create(name="IT")
+        self.news = {}
+        for slug, title, summary in [
+            ("tcs-deal", "TCS wins large deal", "The order book grows; deal win in Europe"),
+            ("infy-deal", "Infosys deal win", "Infosys bags a deal, deal momentum strong"),
+            ("tcs-cuts", "TCS announces job cuts", "Layoffs across units"),
+            ("wipro", "Wipro guidance", "Win for deal teams"),
+        ]:
+            item = News.objects.create(title=title, content_summary=summary,
+                                       link=f"https://example.com/{slug}", keyword=keyword)
+            index_news_terms(item)
+            self.news[slug] = item
+
+    def _slugs(self, text):
+        ids = {item.id: slug for slug, item in self.news.items()}
+        return [ids[item.id] for item in search(text)]
+
+    def test_and_or_not(self):
+        """Test that boolean operators combine document sets."""
+        self.assertEqual(sorted(self._slugs("tcs OR infosys")), ["infy-deal", "tcs-cuts", "tcs-deal"])
+        self.assertEqual(self._slugs("tcs deal"), ["tcs-deal"])
+        self.assertEqual(self._slugs("tcs NOT layoffs"), ["tcs-deal"])
+
+    def test_phrases_need_word_order(self):
+        """Test that phrases only match consecutive words."""
+        self.assertEqual(sorted(self._slugs('"deal win"')), ["infy-deal", "tcs-deal"])
+
+    def test_ranking_by_term_frequency(self):
+        """Test that articles using the terms more often rank first."""
+        self.assertEqual(self._slugs("deal")[0], "infy-deal")
+
+    def test_pure_negation_rejected(self):
+        """Test that a query with nothing to include is rejected."""
+        with self.assertRaises(QuerySyntaxError):
+            search("NOT tcs")
+
+    def test_postings_replaced_on_reindex(self):
+        """Test that re-indexing reflects changed article text."""
+        item = self.news["wipro"]
+        item.content = "Wipro also reports layoffs"
+        item.save()
+        index_news_terms(item)
+
+        self.assertTrue(NewsTerm.objects.filter(news=item, term="layoffs").exists())
+        self.assertEqual(sorted(self._slugs("layoffs")), ["tcs-cuts", "wipro"])
+
+    def test_parse_news_indexes(self):
+        """Test that ingested articles are indexed immediately."""
+        news = News.parse_news({
+            'title': 'HDFC Bank raises rates', 'summary': 'Deposit rates up',
+            'link': 'https://example.com/hdfc', 'published': 'Thu, 15 Nov 2025 10:00:00 GMT',
+        }, Keyword.objects.create(name="banks"))
+
+        self.assertEqual([item.id for item in search('"deposit rates"')], [news.id])
+
+
+class QueryViewTest(TestCase):
+    """Test cases for the query page and search redirect."""
+
+    def setUp(self):
+        """Set up a logged-in user."""
+        cache.clear()
+        self.user = User.objects.create_user('querier', 'query@example.com', 'pass123')
+        self.client.force_login(self.user)
+
+    def test_boolean_keyword_search_redirects(self):
+        """Test that keyword searches with operators go to the query page."""
+        response = self.client.post(reverse('news_analyser:search'), {
+            'search_type': 'keyword', 'keyword': 'tcs AND infosys'})
+
+        self.assertRedirects(response, reverse('news_analyser:query') + '?q=tcs+AND+infosys')
+
+    def test_syntax_error_shown(self):
+        """Test that parse errors are reported on the page."""
+        response = self.client.get(reverse('news_analyser:query'), {'q': '(tcs'})
+
+        self.assertContains(response, "Missing closing parenthesis")
@@ -0,0 +1,162 @@
+"""
+Unit tests for the local market-relevance pre-filter.
+
+This module tests lexicon scoring, ticker detection and how the verdict
+feeds into ingestion and analysis enqueueing.
+"""
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from unittest.mock import patch
+from news_analyser.entities import EntityMatcher
+from news_analyser.relevance import score_article, score_text
+from news_analyser.models import News, Keyword, Stock
+from news_analyser.tasks import enqueue_analysis, LOW_PRIORITY
+
+
+class RelevanceScoringTest(TestCase):
+    """Test cases for lexicon and ticker based scoring."""
+
+    def setUp(self):
+        """Set up an entity matcher over a few companies."""
+        self.entities = EntityMatcher(
+            [('TCS', 'Tata Consultancy Services Ltd'), ('INFY', 'Infosys Limited'),
+             ('TATAMOTORS', 'Tata Motors Limited')])
+
+    def test_stock_table_symbols_are_credited(self):
+        """Test that a stock missing from the bundled list counts by symbol and name."""
+        cache.clear()
+        Stock.objects.create(symbol='NEWCO', name='Newco Holdings Limited')
+
+        self.assertEqual(score_text('NEWCO lists today').tickers, ['NEWCO'])
+        self.assertEqual(score_text('Newco Holdings lists today').tickers, ['NEWCO'])
+
+    def test_empty_matcher_is_used(self):
+        """Test that an explicitly empty matcher is not swapped for the process one."""
+        self.assertEqual(score_text('TCS and INFY', entities=EntityMatcher([])).tickers, [])
+
+    def test_market_news_is_relevant(self):
+        """Test that clear market news passes the filter."""
+        result = score_article(
+            'Sensex rallies 500 points as IT stocks gain',
+            'Investors cheered strong quarterly earnings from TCS and INFY'
+        )
+        self.assertTrue(result.is_relevant)
+        self.assertIn('sensex', result.terms)
+        self.assertEqual(result.tickers, ['INFY', 'TCS'])
+
+    def test_generic_news_is_not_relevant(self):
+        """Test that world news with an incidental keyword is rejected."""
+        result = score_article(
+            'Football club announces budget for new stadium seats',
+            'The club said fans would see the changes next season'
+        )
+        self.assertFalse(result.is_relevant)
+        self.assertLess(result.score, 1.0)
+
+    def test_ambiguous_symbols_are_ignored(self):
+        """Test that symbols which are ordinary words do not count."""
+        result = score_text('RAIN AND STAR WARS TAKE OVER THE WEEKEND')
+        self.assertEqual(result.tickers, [])
+
+    def test_phrases_are_scored(self):
+        """Test that multi-word finance phrases contribute to the score."""
+        result = score_text('Dalal Street waits on the rate cut')
+        self.assertIn('dalal street', result.terms)
+        self.assertIn('rate cut', result.terms)
+
+    def test_empty_text(self):
+        """Test that empty text scores zero."""
+        result = score_text('')
+        self.assertEqual(result.score, 0.0)
+        self.assertFalse(result.is_relevant)
+
+    def test_company_names_are_credited(self):
+        """Test that companies named in words count like their symbols."""
+        result = score_text('Infosys and Tata Motors announce a partnership', entities=self.entities)
+        self.assertTrue(result.is_relevant)
+        self.assertEqual(result.tickers, ['INFY', 'TATAMOTORS'])
+
+    def test_company_keyword_is_credited(self):
+        """Test that the company an article was searched for counts in any case."""
+        self.assertEqual(score_text('what next for tcs', entities=self.entities).tickers, [])
+        result = score_text('what next for tcs', keyword='TCS', entities=self.entities)
+        self.assertTrue(result.is_relevant)
+        self.assertEqual(result.tickers, ['TCS'])
+
+    def test_word_keyword_is_not_credited(self):
+        """Test that an ordinary-word keyword is no evidence on its own."""
+        result = score_text('Football club announces budget', keyword='budget', entities=self.entities)
+        self.assertEqual(result.tickers, [])
+        self.assertFalse(result.is_relevant)
+
+    @override_settings(RELEVANCE_THRESHOLD=5.0)
+    def test_threshold_is_configurable(self):
+        """Test that the relevance threshold comes from settings."""
+        result = score_text('Sensex rises')
+        self.assertFalse(result.is_relevant)
+
+
+class RelevanceIngestTest(TestCase):
+    """Test cases for relevance marking at ingest and enqueue time."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.keyword = Keyword.objects.create(name="budget")
+
+    def test_parse_news_marks_relevance(self):
+        """Test that parse_news stores the relevance verdict."""
+        relevant = News.parse_news({
+            'title': 'Budget 2026: Sensex jumps as capex push lifts infra stocks',
+            'summary': 'Market rally led by L&T',
+            'link': 'https://economictimes.indiatimes.com/a1',
+            'published': 'Thu, 15 Nov 2025 10:00:00 GMT'
+        }, self.keyword)
+        generic = News.parse_news({
+            'title': 'City council debates budget for new parks',
+            'summary': 'Residents want more green spaces',
+            'link': 'https://timesofindia.indiatimes.com/a2',
+            'published': 'Thu, 15 Nov 2025 10:00:00 GMT'
+        }, self.keyword)
+
+        self.assertTrue(relevant.is_market_relevant)
+        self.assertGreater(relevant.relevance_score, 1.0)
+        self.assertFalse(generic.is_market_relevant)
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_enqueue_skips_irrelevant_news(self, mock_task):
+        """Test that non-relevant news is not sent to Gemini."""
+        news = News.objects.create(
+            title='Weather update', content_summary='Sunny',
+            link='https://example.com/w', keyword=self.keyword,
+            is_market_relevant=False
+        )
+        self.assertFalse(enqueue_analysis(news))
+        mock_task.delay.assert_not_called()
+        mock_task.apply_async.assert_not_called()
+        news.refresh_from_db()
+        self.assertEqual(news.analysis_status, News.AnalysisStatus.SKIPPED)
+
+    @override_settings(RELEVANCE_SKIP_IRRELEVANT=False)
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_enqueue_deprioritises_irrelevant_news(self, mock_task):
+        """Test that non-relevant news can be queued at low priority."""
+        news = News.objects.create(
+            title='Weather update', content_summary='Sunny',
+            link='https://example.com/w', keyword=self.keyword,
+            is_market_relevant=False
+        )
+        self.assertTrue(enqueue_analysis(news))
+        mock_task.apply_async.assert_called_once_with(
+            args=[news.id], priority=LOW_PRIORITY
+        )
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_enqueue_relevant_news(self, mock_task):
+        """Test that relevant news is queued normally."""
+        news = News.objects.create(
+            title='TCS results', content_summary='Profit up',
+            link='https://example.com/t', keyword=self.keyword
+        )
+        self.assertTrue(enqueue_analysis(news))
+        mock_task.delay.assert_called_once_with(news.id)
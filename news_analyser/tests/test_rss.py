@@ -262,3 +262,27 @@ class RSSFeedTest(TestCase):
 
         self.assertIn('WIPRO', results)
         self.assertGreater(len(results['WIPRO']), 0)
+
+    @patch('news_analyser.rss.feedparser.parse')
+    def test_check_keywords_matches_aliases(self, mock_parse):
+        """Test that a stock is found under the names headlines use for it."""
+        mock_feed = MagicMock()
+        mock_feed.bozo = False
+        mock_feed.entries = [
+            feedparser.FeedParserDict({
+                'title': 'HDFC Bank raises deposit rates',
+                'summary': 'The lender said',
+                'link': 'https://example.com/hdfc-bank',
+            }),
+            feedparser.FeedParserDict({
+                'title': 'HDFC Banking app outage',
+                'summary': 'Customers complain',
+                'link': 'https://example.com/hdfc-app',
+            }),
+        ]
+        mock_parse.return_value = mock_feed
+
+        results = check_keywords(['HDFCBANK'], aliases={'HDFCBANK': ['hdfc bank']})
+
+        links = {entry.link for entry in results['HDFCBANK']}
+        self.assertEqual(links, {'https://example.com/hdfc-bank'})
@@ -0,0 +1,102 @@
+"""
+Unit tests for time-decayed stock scoring.
+
+This module tests the vectorised reduction and the cached, universe-wide
+recompute built on it.
+"""
+
+import time
+from datetime import timedelta
+import numpy as np
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.utils import timezone
+from news_analyser.scoring import decayed_scores, refresh_stock_scores, stock_scores
+from news_analyser.models import News, Keyword, NewsStock, Stock
+
+
+class DecayedScoresTest(TestCase):
+    """Test cases for the NumPy score reduction."""
+
+    def test_half_life_weighting(self):
+        """Test that a mention one half-life old counts half as much."""
+        ids, scores, weights, mentions = decayed_scores(
+            np.array([7, 7]), np.array([1.0, -1.0]), np.array([1.0, 1.0]),
+            np.array([0.0, 24.0]), half_life_hours=24.0)
+
+        self.assertEqual(ids.tolist(), [7])
+        self.assertAlmostEqual(scores[0], (1.0 - 0.5) / 1.5)
+        self.assertAlmostEqual(weights[0], 1.5)
+        self.assertEqual(mentions.tolist(), [2])
+
+    def test_confidence_weighting_and_default(self):
+        """Test that confidence scales weights and missing confidence uses the default."""
+        ids, scores, _, _ = decayed_scores(
+            np.array([1, 1, 2]), np.array([1.0, -1.0, 0.4]), np.array([0.9, 0.1, np.nan]),
+            np.zeros(3), half_life_hours=48.0)
+
+        self.assertEqual(ids.tolist(), [1, 2])
+        self.assertAlmostEqual(scores[0], 0.8)
+        self.assertAlmostEqual(scores[1], 0.4)
+
+    def test_empty_universe(self):
+        """Test that no mentions give no scores."""
+        ids, scores, _, _ = decayed_scores(
+            np.array([], dtype=np.int64), np.array([]), np.array([]), np.array([]), 48.0)
+
+        self.assertEqual(len(ids), 0)
+        self.assertEqual(len(scores), 0)
+
+    def test_large_universe_is_fast(self):
+        """Test that scoring thousands of stocks takes milliseconds."""
+        rng = np.random.default_rng(0)
+        size = 200_000
+        started = time.perf_counter()
+        ids, _, _, _ = decayed_scores(
+            rng.integers(0, 5000, size), rng.uniform(-1, 1, size), rng.uniform(0, 1, size),
+            rng.uniform(0, 720, size), 48.0)
+
+        self.assertEqual(len(ids), 5000)
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+
+@override_settings(SENTIMENT_HALF_LIFE_HOURS=24.0, SENTIMENT_LOOKBACK_DAYS=30)
+class StockScoresTest(TestCase):
+    """Test cases for loading, caching and reading stock scores."""
+
+    def setUp(self):
+        """Set up two stocks with analysed mentions of different ages."""
+        cache.clear()
+        self.tcs = Stock.objects.create(symbol="TCS", name="Tata Consultancy Services")
+        self.infy = Stock.objects.create(symbol="INFY", name="Infosys")
+        keyword = Keyword.objects.create(name="IT")
+        now = timezone.now()
+        for title, stock, rating, hours in [
+            ("fresh", self.tcs, 0.8, 1), ("day old", self.tcs, -0.8, 25),
+            ("stale", self.infy, 0.5, 24 * 40), ("recent", self.infy, -0.2, 2),
+        ]:
+            news = News.objects.create(
+                title=title, content_summary="", link=f"https://example.com/{title}", keyword=keyword,
+                impact_rating=rating, sentiment_confidence=1.0, date=now - timedelta(hours=hours),
+                analysis_status=News.AnalysisStatus.DONE, analysed_at=now)
+            NewsStock.objects.create(news=news, stock=stock)
+
+    def test_recent_mentions_dominate(self):
+        """Test that fresher sentiment outweighs older and the lookback drops stale news."""
+        scores = refresh_stock_scores()
+
+        self.assertGreater(scores[self.tcs.id]['score'], 0.2)
+        self.assertEqual(scores[self.tcs.id]['mentions'], 2)
+        self.assertEqual(scores[self.infy.id], {'score': -0.2, 'weight': scores[self.infy.id]['weight'], 'mentions': 1})
+
+    def test_reads_are_cached(self):
+        """Test that the periodic refresh serves later reads without queries."""
+        refresh_stock_scores()
+
+        with self.assertNumQueries(0):
+            scores = stock_scores([self.infy.id])
+        self.assertEqual(list(scores), [self.infy.id])
+
+    def test_computes_on_cold_cache(self):
+        """Test that a read before any refresh computes the scores."""
+        self.assertIn(self.tcs.id, stock_scores())
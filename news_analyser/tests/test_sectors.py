@@ -0,0 +1,157 @@
+"""
+Unit tests for the sector sentiment engine.
+
+This module tests the compiled sector matcher, indexing of analysed news
+into daily sector aggregates and the sector page.
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from unittest.mock import patch
+from news_analyser.sectors import (
+    SectorMatcher, get_sector_matcher, index_news, rebuild_sector_sentiment, sector_sentiment
+)
+from news_analyser.entities import EntityMatcher
+from news_analyser.tests.factories import make_news
+from news_analyser.models import Keyword, NewsSector, Sector, SectorSentimentDaily, Stock
+
+
+class SectorMatcherTest(TestCase):
+    """Test cases for matching text against all sectors at once."""
+
+    def setUp(self):
+        """Set up a matcher over two sectors and their companies."""
+        self.matcher = SectorMatcher([
+            (1, "software services, IT outsourcing; cloud", ["TCS", "INFY"]),
+            (2, "private bank\nNPA, net interest margin", ["HDFCBANK"]),
+        ])
+        self.entities = EntityMatcher(
+            [("TCS", "Tata Consultancy Services Ltd"), ("INFY", "Infosys Limited"), ("HDFCBANK", "HDFC Bank Ltd")],
+            {"TCS": ["Tata Consultancy"]})
+
+    def match(self, text, tickers=()):
+        return self.matcher.match(text, tickers, entities=self.entities)
+
+    def test_terms_names_and_symbols_match(self):
+        """Test that search fields, company names and symbols all count."""
+        hits = self.match("Tata Consultancy Services wins cloud deal; INFY also gains")
+        self.assertEqual(hits, {1: 3})
+
+    def test_multiple_sectors(self):
+        """Test that one article can belong to several sectors."""
+        hits = self.match("HDFC Bank expands IT outsourcing contracts", tickers=["TCS"])
+        self.assertEqual(set(hits), {1, 2})
+
+    def test_partial_words_do_not_match(self):
+        """Test that terms only match whole tokens."""
+        self.assertEqual(self.match("Clouded outlook for private banking"), {})
+
+    def test_company_aliases_match(self):
+        """Test that companies are found by the same aliases the entity matcher knows."""
+        self.assertEqual(self.match("Tata Consultancy bags order"), {1: 1})
+        self.assertEqual(self.match("HDFC Bank & Infosys"), {1: 1, 2: 1})
+
+    def test_empty_entity_matcher_is_used(self):
+        """Test that an explicitly empty matcher is not swapped for the process one."""
+        hits = self.matcher.match("Tata Consultancy Services wins cloud deal", entities=EntityMatcher([]))
+        self.assertEqual(hits, {1: 1})
+
+    def test_lowercase_symbol_is_not_a_ticker(self):
+        """Test that symbols must appear upper-case in the text."""
+        self.assertEqual(self.match("the tcs of the matter"), {})
+
+
+class SectorIndexingTest(TestCase):
+    """Test cases for indexing analysed news into daily sector sentiment."""
+
+    def setUp(self):
+        """Set up sectors, stocks and analysed news."""
+        cache.clear()
+        self.it = Sector.objects.create(name="IT", search_fields="software services, IT outsourcing")
+        self.banks = Sector.objects.create(name="Banking", search_fields="private bank, NPA")
+        Stock.objects.create(symbol="TCS", name="Tata Consultancy Services Ltd", sector=self.it)
+        self.keyword = Keyword.objects.create(name="TCS")
+        self.now = timezone.now()
+
+    def test_index_news_updates_daily_rows(self):
+        """Test that each analysed article updates its sectors' day rollup."""
+        index_news(make_news(self.keyword, "TCS software services deal", 0.6))
+        index_news(make_news(self.keyword, "Tata Consultancy Services misses estimates", -0.4))
+
+        row = SectorSentimentDaily.objects.get(sector=self.it, day=timezone.localdate(self.now))
+        self.assertEqual((row.news_count, row.positive, row.negative), (2, 1, 1))
+        self.assertAlmostEqual(row.avg_sentiment, 0.1)
+        self.assertFalse(SectorSentimentDaily.objects.filter(sector=self.banks).exists())
+
+    def test_reindex_moves_article_between_sectors(self):
+        """Test that re-analysed articles leave sectors they no longer match."""
+        news = make_news(self.keyword, "Private bank NPA worries", -0.5)
+        index_news(news)
+        self.assertTrue(SectorSentimentDaily.objects.filter(sector=self.banks).exists())
+
+        news.title = "TCS software services update"
+        news.save()
+        index_news(news)
+
+        self.assertFalse(SectorSentimentDaily.objects.filter(sector=self.banks).exists())
+        self.assertEqual(list(NewsSector.objects.filter(news=news).values_list('sector', flat=True)), [self.it.id])
+
+    def test_matcher_rebuilds_after_sector_change(self):
+        """Test that editing a sector's search fields reaches the matcher."""
+        with self.settings(SECTOR_MATCHER_REFRESH_SECONDS=0):
+            self.assertEqual(get_sector_matcher().match("Semiconductor fab plans"), {})
+            self.it.search_fields = "semiconductor"
+            self.it.save()
+            self.assertEqual(get_sector_matcher().match("Semiconductor fab plans"), {self.it.id: 1})
+
+    def test_rebuild_and_series(self):
+        """Test that a rebuild recomputes history and the series is ordered by day."""
+        make_news(self.keyword, "TCS software services deal", 0.6, days_ago=2)
+        make_news(self.keyword, "TCS IT outsourcing win", 0.2, days_ago=0)
+        make_news(self.keyword, "Old TCS news", 0.9, days_ago=400)
+
+        self.assertEqual(rebuild_sector_sentiment(), 3)
+
+        series = list(sector_sentiment(self.it, days=30))
+        self.assertEqual([row.news_count for row in series], [1, 1])
+        self.assertLess(series[0].day, series[1].day)
+
+    @patch('news_analyser.tasks._analyse_news', return_value={'status': 'success', 'news_id': None})
+    def test_successful_analysis_indexes_sectors(self, mock_analyse):
+        """Test that the analysis task feeds the sector rollups."""
+        from news_analyser.tasks import analyse_news_task
+        news = make_news(self.keyword, "TCS software services deal", 0.6)
+
+        analyse_news_task.apply(args=[news.id]).get()
+
+        self.assertTrue(NewsSector.objects.filter(news=news, sector=self.it).exists())
+
+
+class SectorViewTest(TestCase):
+    """Test cases for the sector page."""
+
+    def setUp(self):
+        """Set up a user and a sector with one day of sentiment."""
+        cache.clear()
+        self.user = User.objects.create_user('sectors', 'sectors@example.com', 'pass123')
+        self.client.force_login(self.user)
+        self.sector = Sector.objects.create(name="IT", search_fields="software")
+        SectorSentimentDaily.objects.create(
+            sector=self.sector, day=timezone.localdate(), news_count=4, sentiment_sum=1.0, positive=2)
+
+    def test_post_redirects_to_sector(self):
+        """Test that choosing a sector redirects to its page."""
+        response = self.client.post(reverse('news_analyser:sector'), {'sector': self.sector.id})
+        self.assertRedirects(response, f"{reverse('news_analyser:sector')}?sector={self.sector.id}")
+
+    def test_sector_page_reads_daily_rows(self):
+        """Test that the page renders the precomputed series."""
+        response = self.client.get(reverse('news_analyser:sector'), {'sector': self.sector.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_news'], 4)
+        self.assertAlmostEqual(response.context['avg_sentiment'], 0.25)
+        self.assertContains(response, "across 4 analysed articles")
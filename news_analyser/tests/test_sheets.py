@@ -0,0 +1,164 @@
+"""
+Tests for the batched Google Sheets sync.
+
+These run ``SheetsClient`` over HTTP against the local Sheets stand-in,
+counting the API calls each sync makes.
+"""
+
+from django.test import SimpleTestCase, override_settings
+from news_analyser.exceptions import SheetsRateLimitError
+from news_analyser.utils import sheets_client
+from news_analyser.utils.sheets_client import (
+    SheetsClient, column_letter, diff_ranges, get_details, parse_cell, split_range,
+    update_sources, write_links, write_news,
+)
+from news_analyser.utils.sheets_stub import start_stub_server
+
+SHEET_ID = "test-sheet"
+
+
+class A1NotationTest(SimpleTestCase):
+    """Test cases for range helpers."""
+
+    def test_columns_round_trip(self):
+        """Test that column letters convert both ways."""
+        for column, letters in [(1, "A"), (26, "Z"), (27, "AA"), (703, "AAA")]:
+            self.assertEqual(column_letter(column), letters)
+            self.assertEqual(parse_cell(f"{letters}5"), (5, column))
+
+    def test_split_range_unquotes_titles(self):
+        """Test that quoted worksheet titles are unescaped."""
+        self.assertEqual(split_range("'Bob''s Links'!A2:C3"), ("Bob's Links", "A2:C3"))
+        self.assertEqual(split_range("B4"), (None, "B4"))
+        self.assertEqual(split_range("Config Data"), ("Config Data", None))
+
+
+class DiffRangesTest(SimpleTestCase):
+    """Test cases for computing changed cells."""
+
+    def test_unchanged_grid_needs_no_writes(self):
+        """Test that identical grids produce no ranges."""
+        self.assertEqual(diff_ranges([["a", "b"]], [["a", "b"]]), [])
+
+    def test_changed_cells_grouped_into_runs(self):
+        """Test that adjacent changes in a row share one range."""
+        old = [["a", "b", "c", "d"]]
+        new = [["a", "x", "y", "d", "e"]]
+        self.assertEqual(diff_ranges(old, new), [(0, 1, ["x", "y"]), (0, 4, ["e"])])
+
+    def test_removed_cells_blanked(self):
+        """Test that cells only the old grid has are cleared."""
+        self.assertEqual(diff_ranges([["a", "b"], ["c"]], [["a"]]), [(0, 1, [""]), (1, 0, [""])])
+
+
+class SheetsSyncTest(SimpleTestCase):
+    """Test cases for syncing worksheets through the stand-in."""
+
+    def setUp(self):
+        self.server = start_stub_server()
+        self.client = SheetsClient(SHEET_ID, base_url=self.server.base_url, retry_backoff=0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_worksheet_written_in_one_call(self):
+        """Test that a whole worksheet costs one read and one write."""
+        news = {f"Category {n}": [f"Headline {n}.{i}" for i in range(10)] for n in range(20)}
+
+        written = write_news(news, client=self.client)
+
+        # The empty second column is never sent
+        self.assertEqual(written, 20 * 11)
+        self.assertEqual(dict(self.server.stats), {'batchGet': 1, 'batchUpdate': 1})
+        rows = self.server.values(SHEET_ID)
+        self.assertEqual(rows[0], [])
+        self.assertEqual(rows[1][:3], ["Category 0", "", "Headline 0.0"])
+        self.assertEqual(len(rows), 21)
+
+    def test_resync_sends_only_changes(self):
+        """Test that a second sync writes just the changed cells, and nothing when unchanged."""
+        write_links({"TCS": ["https://a", "https://b"], "INFY": ["https://c"]}, client=self.client)
+        write_links({"TCS": ["https://a", "https://b"], "INFY": ["https://c"]}, client=self.client)
+        self.assertEqual(self.server.stats['batchUpdate'], 1)
+
+        written = write_links({"TCS": ["https://a"], "INFY": ["https://c", "https://d"]}, client=self.client)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(self.server.stats['batchGet'], 1)
+        self.assertEqual(self.server.values(SHEET_ID, "News Links")[1:],
+                         [["TCS", "", "https://a"], ["INFY", "", "https://c", "https://d"]])
+
+    def test_new_process_diffs_against_sheet(self):
+        """Test that a fresh client seeds its snapshot from the sheet instead of rewriting it."""
+        update_sources({"economic_times": 1, "moneycontrol": 2}, client=self.client)
+        fresh = SheetsClient(SHEET_ID, base_url=self.server.base_url)
+
+        self.assertEqual(update_sources(["economic_times", "moneycontrol", "mint"], client=fresh), 1)
+        self.assertEqual(self.server.values(SHEET_ID, "Config Data"),
+                         [["", "", "Sources"], ["", "", "economic_times"], ["", "", "moneycontrol"], ["", "", "mint"]])
+
+    def test_several_worksheets_in_one_sync(self):
+        """Test that syncing several worksheets still costs one read and one write."""
+        self.client.sync({
+            (None, "A2:A"): [["Tech"]],
+            ("News Links", "C2:ZZZ"): [["https://a"]],
+            ("Config Data", "C1:C"): [["Sources"], ["mint"]],
+        })
+
+        self.assertEqual(dict(self.server.stats), {'batchGet': 1, 'batchUpdate': 1})
+
+    def test_cells_outside_owned_columns_kept(self):
+        """Test that keywords in column B and other config columns survive a sync."""
+        self.client.sync({
+            (None, "A1:B"): [["Category", "Keywords"], ["Tech", "apple,google"], ["Fin", "banks"]],
+            ("Config Data", "A1:ZZZ"): [["a", "b", "Old header", "other"], ["", "", "", "keep"]],
+        })
+        fresh = SheetsClient(SHEET_ID, base_url=self.server.base_url)
+
+        write_news({"Tech": ["Apple results"], "Fin": ["Rate cut"]}, client=fresh)
+        update_sources(["mint"], client=fresh)
+
+        self.assertEqual(get_details(client=fresh), {"Tech": ["apple", "google"], "Fin": ["banks"]})
+        self.assertEqual(self.server.values(SHEET_ID, "Config Data"),
+                         [["a", "b", "Sources", "other"], ["", "", "mint", "keep"]])
+
+    def test_rows_wider_than_region_rejected(self):
+        """Test that a grid that would spill out of its region is refused."""
+        with self.assertRaises(ValueError):
+            self.client.sync({("Config Data", "C1:C"): [["Sources", "extra"]]})
+
+    def test_get_details(self):
+        """Test that categories and their keywords are read back."""
+        self.client.sync({(None, "A1:B"): [["Category", "Keywords"], ["Tech", "ai,chips"], ["Banks"]]})
+
+        self.assertEqual(get_details(client=self.client), {"Tech": ["ai", "chips"], "Banks": []})
+
+    def test_rate_limit_retried(self):
+        """Test that 429 responses are retried with backoff, then surfaced."""
+        self.server.fail_next = 2
+        write_news({"Tech": ["Headline"]}, client=self.client)
+        self.assertEqual(self.server.stats[429], 2)
+
+        self.server.fail_next = 10
+        with self.assertRaises(SheetsRateLimitError):
+            write_news({"Tech": ["Other headline"]}, client=self.client)
+
+
+class SheetsClientSettingsTest(SimpleTestCase):
+    """Test cases for the lazily built default client."""
+
+    def setUp(self):
+        self.server = start_stub_server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        sheets_client._client = None
+        self.addCleanup(setattr, sheets_client, '_client', None)
+
+    def test_default_client_uses_stub_without_credentials(self):
+        """Test that SHEETS_BASE_URL builds a client that needs no key file."""
+        with override_settings(GOOGLE_SHEET_ID=SHEET_ID, SHEETS_BASE_URL=self.server.base_url,
+                               GOOGLE_SHEETS_CREDENTIALS="/nonexistent.json"):
+            write_news({"Tech": ["Headline"]})
+
+        self.assertEqual(self.server.values(SHEET_ID)[1], ["Tech", "", "Headline"])
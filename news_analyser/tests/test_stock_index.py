@@ -0,0 +1,106 @@
+"""
+Unit tests for the stock typeahead prefix index.
+
+This module tests prefix matching and ranking, lazy rebuilding when stocks
+change, and the typeahead endpoint.
+"""
+
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from news_analyser.models import Stock
+from news_analyser.stock_index import StockEntry, StockPrefixIndex, get_stock_index
+
+STOCKS = [
+    StockEntry(1, "TCS", "Tata Consultancy Services"),
+    StockEntry(2, "TATAMOTORS", "Tata Motors"),
+    StockEntry(3, "TATASTEEL", "Tata Steel"),
+    StockEntry(4, "TITAN", "Titan Company"),
+    StockEntry(5, "INFY", "Infosys"),
+    StockEntry(6, "HCLTECH", "HCL Technologies"),
+    StockEntry(7, "TECHM", "Tech Mahindra"),
+]
+
+
+class StockPrefixIndexTest(TestCase):
+    """Test cases for prefix lookup and ranking."""
+
+    def setUp(self):
+        """Build an index over a handful of stocks."""
+        self.index = StockPrefixIndex(STOCKS)
+
+    def symbols(self, query, limit=10):
+        return [stock.symbol for stock in self.index.search(query, limit)]
+
+    def test_exact_symbol_ranks_first(self):
+        """Test that an exact symbol beats longer symbol prefixes."""
+        self.assertEqual(self.symbols("tcs"), ["TCS"])
+        self.assertEqual(self.symbols("tata")[:2], ["TATASTEEL", "TATAMOTORS"])
+
+    def test_symbol_before_name_before_word(self):
+        """Test the ranking of symbol, name and name-word matches."""
+        self.assertEqual(self.symbols("tech"), ["TECHM", "HCLTECH"])
+        self.assertEqual(self.symbols("t", limit=3), ["TCS", "TECHM", "TITAN"])
+
+    def test_name_word_match(self):
+        """Test that any word of the company name matches."""
+        self.assertEqual(self.symbols("consult"), ["TCS"])
+        self.assertEqual(self.symbols("mahin"), ["TECHM"])
+
+    def test_no_match_and_empty_query(self):
+        """Test that unknown and empty prefixes return nothing."""
+        self.assertEqual(self.symbols("zzz"), [])
+        self.assertEqual(self.symbols("  "), [])
+
+    def test_limit(self):
+        """Test that results are capped at the limit."""
+        self.assertEqual(len(self.index.search("ta", limit=2)), 2)
+
+    def test_lookup_is_fast(self):
+        """Test that lookups over the full NSE-sized universe stay sub-millisecond."""
+        universe = [StockEntry(i, f"SYM{i:04d}", f"Company {i} Industries Limited") for i in range(2000)]
+        index = StockPrefixIndex(universe)
+        start = time.perf_counter()
+        for _ in range(100):
+            index.search("sym01")
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+
+class StockTypeaheadViewTest(TestCase):
+    """Test cases for the typeahead endpoint and lazy index refresh."""
+
+    def setUp(self):
+        """Set up a user and stocks."""
+        cache.clear()
+        for _, symbol, name in STOCKS[:3]:
+            Stock.objects.create(symbol=symbol, name=name)
+        User.objects.create_user('typer', 'typer@example.com', 'pass123')
+        self.client.login(username='typer', password='pass123')
+
+    def test_typeahead_returns_ranked_matches(self):
+        """Test that the endpoint returns JSON matches."""
+        response = self.client.get(reverse('news_analyser:stock_typeahead'), {'q': 'tata', 'limit': 1})
+
+        data = response.json()
+        self.assertEqual(data['query'], 'tata')
+        self.assertEqual([r['symbol'] for r in data['results']], ['TATASTEEL'])
+        self.assertEqual(set(data['results'][0]), {'id', 'symbol', 'name'})
+
+    def test_index_rebuilt_after_stock_change(self):
+        """Test that a new stock is searchable after the change."""
+        get_stock_index()
+        Stock.objects.create(symbol="INFY", name="Infosys")
+
+        self.assertEqual([s.symbol for s in get_stock_index().search("inf")], ["INFY"])
+
+    def test_add_stocks_renders_only_portfolio(self):
+        """Test that the portfolio page no longer ships every stock."""
+        user = User.objects.get(username='typer')
+        user.profile.stocks.add(Stock.objects.get(symbol="TCS"))
+
+        response = self.client.get(reverse('news_analyser:add_stocks'))
+
+        self.assertContains(response, "Tata Consultancy Services")
+        self.assertNotContains(response, "Tata Motors")
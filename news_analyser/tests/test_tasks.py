@@ -5,17 +5,34 @@ This module tests async task execution, retry logic, and error handling.
 """
 
 from django.test import TestCase, override_settings
+from django.core.cache import cache
 from unittest.mock import patch, MagicMock
+from celery.exceptions import Retry
 import json
-from news_analyser.tasks import analyse_news_task
-from news_analyser.models import News, Keyword, Source
+from django.urls import reverse
+from django.contrib.auth.models import User
+from news_analyser.tasks import (
+    analyse_news_task, enqueue_analysis, current_analysis_version,
+    dispatch_search_job, finalize_search_job, run_search_job,
+    extract_content_task, browser_extract_content_task, request_content_extraction
+)
+from news_analyser import events
+from news_analyser.schemas import NewsAnalysis, parse_news_analysis
+from news_analyser.metrics import get_counts, ANALYSIS_PARSE_FAILURE, ANALYSIS_PARSE_SUCCESS
+from news_analyser.models import News, Keyword, Source, SearchJob
+from news_analyser.extractors import ExtractedArticle
+from news_analyser.content_store import store_browser_content
 from news_analyser.exceptions import (
+    AnalysisParseError,
+    ContentExtractionError,
+    HostThrottledError,
     GeminiAPIError,
     GeminiRateLimitError,
     InvalidSentimentScoreError
 )
 
 
+@patch('news_analyser.tasks.GEMINI_API_KEYS', ['test-key'])
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
 class AnalyseNewsTaskTest(TestCase):
     """Test cases for the analyse_news_task Celery task."""
@@ -313,3 +330,559 @@ class AnalyseNewsTaskTest(TestCase):
 
         self.news.refresh_from_db()
         self.assertEqual(self.news.impact_rating, 0.0)
+
+
+class NewsAnalysisSchemaTest(TestCase):
+    """Test cases for validating Gemini output against the analysis schema."""
+
+    def test_valid_response_parses(self):
+        """Test that a conforming response is parsed and normalised."""
+        result = parse_news_analysis(json.dumps({
+            "sentiment": 0.4,
+            "confidence": 0.9,
+            "explanation": "Good results",
+            "tickers": ["tcs", " INFY ", "TCS"],
+            "impact_timeline": "short-term"
+        }))
+        self.assertEqual(result.sentiment, 0.4)
+        self.assertEqual(result.tickers, ["TCS", "INFY"])
+        self.assertEqual(result.impact_timeline.value, "short-term")
+
+    def test_out_of_range_sentiment_rejected(self):
+        """Test that sentiment outside [-1, 1] fails validation."""
+        with self.assertRaises(AnalysisParseError):
+            parse_news_analysis(json.dumps({
+                "sentiment": 1.5, "confidence": 0.5, "explanation": "",
+                "tickers": [], "impact_timeline": "immediate"
+            }))
+
+    def test_unknown_timeline_rejected(self):
+        """Test that an impact timeline outside the enum fails validation."""
+        with self.assertRaises(AnalysisParseError):
+            parse_news_analysis(json.dumps({
+                "sentiment": 0.1, "confidence": 0.5, "explanation": "",
+                "tickers": [], "impact_timeline": "someday"
+            }))
+
+    def test_malformed_json_rejected(self):
+        """Test that non-JSON text fails validation."""
+        with self.assertRaises(AnalysisParseError):
+            parse_news_analysis('{"sentiment": 0.2, "confid')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+@patch('news_analyser.tasks.GEMINI_API_KEYS', ['test-key'])
+class StructuredOutputTaskTest(TestCase):
+    """Test cases for structured output handling in analyse_news_task."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        keyword = Keyword.objects.create(name="TCS")
+        self.news = News.objects.create(
+            title="TCS Wins Major Contract",
+            content_summary="TCS secures $500M deal",
+            link="https://example.com/tcs-structured",
+            keyword=keyword
+        )
+
+    def _mock_client(self, mock_client_class, text):
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.text = text
+        mock_client.models.generate_content.return_value = mock_response
+        mock_client_class.return_value = mock_client
+        return mock_client
+
+    @patch('news_analyser.tasks.genai.Client')
+    def test_request_uses_response_schema(self, mock_client_class):
+        """Test that analysis requests ask for JSON matching the schema."""
+        mock_client = self._mock_client(mock_client_class, json.dumps({
+            "sentiment": 0.5, "confidence": 0.8, "explanation": "ok",
+            "tickers": ["TCS"], "impact_timeline": "immediate"
+        }))
+
+        result = analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.assertEqual(result['status'], 'success')
+        config = mock_client.models.generate_content.call_args.kwargs['config']
+        self.assertEqual(config.response_mime_type, "application/json")
+        self.assertIs(config.response_schema, NewsAnalysis)
+        self.assertEqual(get_counts(ANALYSIS_PARSE_SUCCESS)[ANALYSIS_PARSE_SUCCESS], 1)
+
+    @patch('news_analyser.tasks.GEMINI_API_KEYS', ['key-1', 'key-2'])
+    @patch('news_analyser.tasks.genai.Client')
+    def test_parse_failure_does_not_try_other_keys(self, mock_client_class):
+        """Test that malformed output is recorded and not retried on another key."""
+        mock_client = self._mock_client(mock_client_class, "The sentiment is quite positive")
+
+        result = analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(mock_client.models.generate_content.call_count, 1)
+        self.assertEqual(get_counts(ANALYSIS_PARSE_FAILURE)[ANALYSIS_PARSE_FAILURE], 1)
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.impact_rating, 0)
+
+    @patch('news_analyser.tasks.genai.Client')
+    def test_schema_violation_is_parse_failure(self, mock_client_class):
+        """Test that JSON violating the schema is rejected and counted."""
+        self._mock_client(mock_client_class, json.dumps({
+            "sentiment": 3, "confidence": 0.8, "explanation": "too big",
+            "tickers": [], "impact_timeline": "immediate"
+        }))
+
+        result = analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(get_counts(ANALYSIS_PARSE_FAILURE)[ANALYSIS_PARSE_FAILURE], 1)
+
+
+@patch('news_analyser.tasks.GEMINI_API_KEYS', ['test-key'])
+class AnalysisStateTest(TestCase):
+    """Test cases for explicit analysis status and enqueue-once semantics."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.keyword = Keyword.objects.create(name="TCS")
+        self.news = News.objects.create(
+            title="TCS results", content_summary="Quarterly profit up",
+            link="https://example.com/tcs-state", keyword=self.keyword
+        )
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_enqueue_only_once(self, mock_task):
+        """Test that repeated enqueues send a single task."""
+        self.assertTrue(enqueue_analysis(self.news))
+        self.assertFalse(enqueue_analysis(News.objects.get(id=self.news.id)))
+
+        mock_task.delay.assert_called_once_with(self.news.id)
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.analysis_status, News.AnalysisStatus.QUEUED)
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_current_analysis_not_requeued(self, mock_task):
+        """Test that an article analysed with the current version is left alone."""
+        News.objects.filter(id=self.news.id).update(
+            analysis_status=News.AnalysisStatus.DONE,
+            analysis_version=current_analysis_version()
+        )
+        self.assertFalse(enqueue_analysis(News.objects.get(id=self.news.id)))
+        mock_task.delay.assert_not_called()
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_outdated_analysis_requeued(self, mock_task):
+        """Test that analyses from an older prompt or model are redone."""
+        News.objects.filter(id=self.news.id).update(
+            analysis_status=News.AnalysisStatus.DONE, analysis_version="1:old-model"
+        )
+        self.assertTrue(enqueue_analysis(News.objects.get(id=self.news.id)))
+        mock_task.delay.assert_called_once_with(self.news.id)
+
+    @patch('news_analyser.tasks.analyse_news_task')
+    def test_force_requeues_finished_analysis(self, mock_task):
+        """Test that an explicit re-analysis bypasses the version check."""
+        News.objects.filter(id=self.news.id).update(
+            analysis_status=News.AnalysisStatus.DONE,
+            analysis_version=current_analysis_version()
+        )
+        self.assertTrue(enqueue_analysis(News.objects.get(id=self.news.id), force=True))
+        mock_task.delay.assert_called_once_with(self.news.id)
+
+    @patch('news_analyser.tasks.genai.Client')
+    def test_task_records_done_state(self, mock_client_class):
+        """Test that a successful analysis records status, time and version."""
+        mock_client = MagicMock()
+        mock_client.models.generate_content.return_value = MagicMock(text=json.dumps({
+            "sentiment": 0.0, "confidence": 0.9, "explanation": "Neutral",
+            "tickers": [], "impact_timeline": "immediate"
+        }))
+        mock_client_class.return_value = mock_client
+
+        analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.analysis_status, News.AnalysisStatus.DONE)
+        self.assertIsNotNone(self.news.analysed_at)
+        self.assertEqual(self.news.analysis_version, current_analysis_version())
+
+    @patch('news_analyser.tasks.genai.Client')
+    def test_task_records_failed_state(self, mock_client_class):
+        """Test that an unusable response marks the article failed."""
+        mock_client = MagicMock()
+        mock_client.models.generate_content.return_value = MagicMock(text="no idea")
+        mock_client_class.return_value = mock_client
+
+        analyse_news_task.apply(args=[self.news.id]).get()
+
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.analysis_status, News.AnalysisStatus.FAILED)
+
+    def test_task_status_counts_neutral_news_as_analysed(self):
+        """Test that a neutral (0.0) analysis counts towards completion."""
+        News.objects.filter(id=self.news.id).update(analysis_status=News.AnalysisStatus.DONE)
+        News.objects.create(
+            title="Pending", content_summary="", link="https://example.com/pending",
+            keyword=self.keyword
+        )
+
+        response = self.client.get(reverse('news_analyser:task_status', args=[self.keyword.id]))
+
+        self.assertEqual(response.json(), {"total_news": 2, "analysed_news": 1})
+
+
+@patch('news_analyser.tasks.GEMINI_API_KEYS', ['test-key'])
+class SearchJobTest(TestCase):
+    """Test cases for search-level progress tracking."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user('searcher', 'search@example.com', 'pass123')
+        self.keyword = Keyword.objects.create(name="TCS")
+        self.job = SearchJob.objects.create(user=self.user, query="TCS")
+        self.job.keywords.add(self.keyword)
+        self.news = [
+            News.objects.create(
+                title=f"TCS update {i}", content_summary="Quarterly profit up",
+                link=f"https://example.com/tcs-job-{i}", keyword=self.keyword
+            )
+            for i in range(3)
+        ]
+
+    def _mock_gemini(self, mock_client_class, text):
+        mock_client = MagicMock()
+        mock_client.models.generate_content.return_value = MagicMock(text=text)
+        mock_client_class.return_value = mock_client
+
+    @patch('news_analyser.tasks.chord')
+    def test_dispatch_builds_chord_of_claimed_news(self, mock_chord):
+        """Test that only newly claimed articles join the search's chord."""
+        News.objects.filter(id=self.news[0].id).update(
+            analysis_status=News.AnalysisStatus.DONE,
+            analysis_version=current_analysis_version()
+        )
+        mock_chord.return_value.return_value.parent.id = 'group-1'
+
+        dispatch_search_job(self.job, self.news)
+
+        header = mock_chord.call_args[0][0]
+        self.assertEqual(sorted(sig.args[0] for sig in header),
+                         [self.news[1].id, self.news[2].id])
+        self.assertTrue(all(sig.kwargs == {'search_job_id': self.job.id} for sig in header))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.total_news, 2)
+        self.assertEqual(self.job.status, SearchJob.Status.RUNNING)
+        self.assertEqual(self.job.celery_group_id, 'group-1')
+
+    @patch('news_analyser.tasks.chord')
+    def test_dispatch_with_nothing_to_analyse(self, mock_chord):
+        """Test that a search with no new work is done immediately."""
+        dispatch_search_job(self.job, [])
+
+        mock_chord.assert_not_called()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, SearchJob.Status.DONE)
+        self.assertTrue(self.job.as_status_dict()['done'])
+
+    @patch('news_analyser.tasks.events.publish')
+    @patch('news_analyser.tasks.genai.Client')
+    def test_tasks_update_counters(self, mock_client_class, mock_publish):
+        """Test that each finished analysis increments the job counters."""
+        SearchJob.objects.filter(id=self.job.id).update(
+            total_news=2, status=SearchJob.Status.RUNNING)
+        self._mock_gemini(mock_client_class, json.dumps({
+            "sentiment": 0.5, "confidence": 0.9, "explanation": "Good",
+            "tickers": ["TCS"], "impact_timeline": "immediate"
+        }))
+        analyse_news_task.apply(args=[self.news[0].id], kwargs={'search_job_id': self.job.id}).get()
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.completed_news, self.job.failed_news), (1, 0))
+        self.assertEqual(self.job.status, SearchJob.Status.RUNNING)
+
+        self._mock_gemini(mock_client_class, "no idea")
+        analyse_news_task.apply(args=[self.news[1].id], kwargs={'search_job_id': self.job.id}).get()
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.completed_news, self.job.failed_news), (2, 1))
+        self.assertEqual(self.job.status, SearchJob.Status.DONE)
+        self.assertIsNotNone(self.job.finished_at)
+
+        published = [c.args[1] for c in mock_publish.call_args_list]
+        self.assertEqual(published, ['article', 'article', 'done'])
+        first_article = mock_publish.call_args_list[0].args[2]
+        self.assertEqual(first_article['sentiment'], 0.5)
+        self.assertEqual(first_article['title'], 'TCS update 0')
+
+    def test_finalize_is_idempotent(self):
+        """Test that the chord callback and counters complete a job once."""
+        SearchJob.objects.filter(id=self.job.id).update(status=SearchJob.Status.RUNNING)
+
+        self.assertTrue(SearchJob.finish(self.job.id))
+        self.assertFalse(SearchJob.finish(self.job.id))
+        result = finalize_search_job([], self.job.id)
+        self.assertEqual(result['status'], SearchJob.Status.DONE)
+
+    def test_job_status_view(self):
+        """Test that the status endpoint reports the job's counters."""
+        SearchJob.objects.filter(id=self.job.id).update(
+            total_news=3, completed_news=1, status=SearchJob.Status.RUNNING)
+        self.client.login(username='searcher', password='pass123')
+
+        response = self.client.get(reverse('news_analyser:search_job_status', args=[self.job.id]))
+
+        self.assertEqual(response.json(), {
+            'job_id': self.job.id, 'status': 'running', 'total_news': 3,
+            'analysed_news': 1, 'failed_news': 0, 'done': False
+        })
+
+    def test_job_status_view_is_per_user(self):
+        """Test that users cannot read other users' search jobs."""
+        User.objects.create_user('other', 'other@example.com', 'pass123')
+        self.client.login(username='other', password='pass123')
+
+        response = self.client.get(reverse('news_analyser:search_job_status', args=[self.job.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class RunSearchJobTest(TestCase):
+    """Test cases for background search submission."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user('submitter', 'submit@example.com', 'pass123')
+        self.job = SearchJob.objects.create(user=self.user, query="TCS")
+
+    @patch('news_analyser.views.run_search_job')
+    def test_search_post_returns_immediately(self, mock_task):
+        """Test that submitting a search only creates a job and queues it."""
+        self.client.login(username='submitter', password='pass123')
+
+        response = self.client.post(reverse('news_analyser:search'), {
+            'search_type': 'keyword', 'keyword': 'TCS,INFY'
+        })
+
+        job = SearchJob.objects.latest('created_at')
+        self.assertRedirects(
+            response, reverse('news_analyser:search_job_loading', args=[job.id]),
+            fetch_redirect_response=False)
+        mock_task.delay.assert_called_once_with(job.id, ['TCS', 'INFY'])
+        self.assertEqual(job.status, SearchJob.Status.PENDING)
+
+    @patch('news_analyser.tasks.chord')
+    @patch('news_analyser.tasks.check_keywords')
+    def test_run_search_job_ingests_and_dispatches(self, mock_check, mock_chord):
+        """Test that the task ingests feed entries and dispatches analyses."""
+        mock_check.return_value = {'TCS': [{
+            'title': 'TCS shares rally after strong quarterly earnings',
+            'summary': 'Investors cheer profit growth',
+            'link': 'https://example.com/tcs-run',
+            'published': 'Thu, 15 Nov 2025 10:00:00 GMT'
+        }]}
+        mock_chord.return_value.return_value.parent.id = 'group-1'
+
+        result = run_search_job(self.job.id, ['TCS'])
+
+        keyword = Keyword.objects.get(name='TCS')
+        self.assertIn(keyword, self.user.profile.searches.all())
+        self.assertIn(keyword, self.job.keywords.all())
+        self.assertEqual(result['status'], SearchJob.Status.RUNNING)
+        self.assertEqual(result['total_news'], 1)
+
+    @patch('news_analyser.tasks.chord')
+    @patch('news_analyser.tasks.check_keywords')
+    def test_run_search_job_expands_stock_aliases(self, mock_check, mock_chord):
+        """Test that stock searches also look for each stock's company names."""
+        SearchJob.objects.filter(id=self.job.id).update(search_type='stock')
+        mock_check.return_value = {}
+
+        run_search_job(self.job.id, ['RELIANCE'])
+
+        aliases = mock_check.call_args.kwargs['aliases']
+        self.assertIn('reliance industries', aliases['RELIANCE'])
+
+    @patch('news_analyser.tasks.check_keywords')
+    def test_run_search_job_marks_failure(self, mock_check):
+        """Test that a fetch error finishes the job as failed."""
+        mock_check.side_effect = RuntimeError("feeds down")
+
+        result = run_search_job(self.job.id, ['TCS'])
+
+        self.assertEqual(result['status'], SearchJob.Status.FAILED)
+        self.assertTrue(result['done'])
+
+
+class SearchJobEventsTest(TestCase):
+    """Test cases for the server-sent events progress stream."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user('listener', 'listen@example.com', 'pass123')
+        self.job = SearchJob.objects.create(user=self.user, query="TCS")
+
+    async def _read_stream(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('news_analyser:search_job_events', args=[self.job.id]))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+    async def test_finished_job_sends_done(self):
+        """Test that a finished job streams a single done event."""
+        await SearchJob.objects.filter(id=self.job.id).aupdate(
+            status=SearchJob.Status.DONE, total_news=2, completed_news=2)
+
+        body = await self._read_stream()
+
+        self.assertTrue(body.startswith('event: done\n'))
+        self.assertEqual(json.loads(body.split('data: ')[1])['analysed_news'], 2)
+
+    @override_settings(REDIS_URL='redis://127.0.0.1:1/0')
+    async def test_stream_closes_when_redis_unavailable(self):
+        """Test that the stream ends cleanly so the page can fall back to polling."""
+        await SearchJob.objects.filter(id=self.job.id).aupdate(status=SearchJob.Status.RUNNING)
+
+        body = await self._read_stream()
+
+        self.assertEqual(body, '')
+
+    @override_settings(REDIS_URL='redis://127.0.0.1:1/0')
+    def test_publish_without_redis_is_dropped(self):
+        """Test that publishing never fails the analysis when Redis is down."""
+        with patch('news_analyser.events._client', None):
+            self.assertEqual(events.publish(self.job.id, events.DONE_EVENT, {}), 0)
+
+
+class ContentExtractionTest(TestCase):
+    """Test cases for queued browser content extraction."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pass123')
+        source = Source.objects.create(id_name="ET", name="Economic Times", url="https://economictimes.indiatimes.com")
+        self.news = News.objects.create(
+            title="TCS Wins Major Contract",
+            link="https://example.com/tcs-contract",
+            keyword=Keyword.objects.create(name="TCS"),
+            source=source,
+        )
+
+    @patch('news_analyser.tasks.extract_content_task.delay')
+    def test_post_queues_extraction_once(self, mock_delay):
+        """Test that the view answers 202 and does not queue a second fetch."""
+        url = reverse('news_analyser:get_content', args=[self.news.id])
+
+        first = self.client.post(url)
+        second = self.client.post(url)
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first.json()['status'], 'queued')
+        self.assertEqual(second.json()['status'], 'in_progress')
+        mock_delay.assert_called_once_with(self.news.id)
+
+    @patch('news_analyser.tasks.extract_content_task.delay')
+    def test_post_with_content_returns_it(self, mock_delay):
+        """Test that stored content is returned without queueing a fetch."""
+        News.objects.filter(id=self.news.id).update(content="Full article")
+
+        response = self.client.post(reverse('news_analyser:get_content', args=[self.news.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['content'], "Full article")
+        mock_delay.assert_not_called()
+
+    @patch('news_analyser.tasks.extract_content_task.delay')
+    def test_post_reuses_stored_article(self, mock_delay):
+        """Test that an article already in the content store is not fetched again."""
+        store_browser_content(self.news.link, "Stored article")
+
+        response = self.client.post(reverse('news_analyser:get_content', args=[self.news.id]))
+
+        self.assertEqual(response.json()['content'], "Stored article")
+        mock_delay.assert_not_called()
+
+    @patch('news_analyser.tasks.events.publish_news')
+    @patch('news_analyser.tasks.get_browser_pool')
+    def test_task_stores_content_and_publishes(self, mock_pool, mock_publish):
+        """Test that extracted content is saved and announced on the article channel."""
+        mock_pool.return_value.run_with_context.return_value = {'content': "Full article"}
+        with patch('news_analyser.tasks.extract_content_task.delay'):
+            request_content_extraction(self.news)
+
+        result = browser_extract_content_task(self.news.id)
+
+        self.assertEqual(result['status'], 'success')
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.content, "Full article")
+        mock_publish.assert_called_once_with(
+            self.news.id, events.CONTENT_EVENT, {'status': 'done', 'length': 12})
+        # The lock is released so the article can be fetched again later
+        with patch('news_analyser.tasks.extract_content_task.delay') as mock_delay:
+            self.assertTrue(request_content_extraction(self.news))
+            mock_delay.assert_called_once()
+
+    @patch('news_analyser.tasks.events.publish_news')
+    @patch('news_analyser.tasks.get_browser_pool')
+    def test_task_failure_publishes_failed(self, mock_pool, mock_publish):
+        """Test that a browser failure is reported instead of raised."""
+        mock_pool.return_value.run_with_context.side_effect = TimeoutError("slow page")
+
+        result = browser_extract_content_task(self.news.id)
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(mock_publish.call_args[0][2]['status'], 'failed')
+
+    @patch('news_analyser.tasks.browser_extract_content_task.delay')
+    @patch('news_analyser.tasks.events.publish_news')
+    @patch('news_analyser.tasks.fetch_article')
+    def test_fast_path_skips_browser(self, mock_extract, mock_publish, mock_browser):
+        """Test that pages the HTTP extractor handles never reach the browser."""
+        mock_extract.return_value = ExtractedArticle("Full article", "profile:ET")
+
+        result = extract_content_task(self.news.id)
+
+        self.assertEqual(result['method'], 'profile:ET')
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.content, "Full article")
+        mock_browser.assert_not_called()
+
+    @patch('news_analyser.tasks.browser_extract_content_task.delay')
+    @patch('news_analyser.tasks.fetch_article')
+    def test_fast_path_failure_escalates_to_browser(self, mock_extract, mock_browser):
+        """Test that the browser task is queued when HTTP extraction fails."""
+        mock_extract.side_effect = ContentExtractionError("No article body found")
+
+        result = extract_content_task(self.news.id)
+
+        self.assertEqual(result['status'], 'escalated')
+        mock_browser.assert_called_once_with(self.news.id)
+
+    @patch('news_analyser.tasks.browser_extract_content_task.delay')
+    @patch('news_analyser.tasks.fetch_article')
+    def test_throttled_host_is_retried_not_escalated(self, mock_extract, mock_browser):
+        """Test that a rate-limited publisher defers the task instead of using the browser."""
+        mock_extract.side_effect = HostThrottledError("busy", retry_after=12.5)
+
+        with patch.object(extract_content_task, 'retry', side_effect=Retry()) as mock_retry:
+            with self.assertRaises(Retry):
+                extract_content_task(self.news.id)
+
+        self.assertEqual(mock_retry.call_args.kwargs['countdown'], 13)
+        mock_browser.assert_not_called()
+
+    async def test_event_stream_sends_existing_content(self):
+        """Test that the stream reports content that landed before subscribing."""
+        await News.objects.filter(id=self.news.id).aupdate(content="Full article")
+        await self.async_client.aforce_login(self.user)
+
+        async def subscribed(channel):
+            yield None
+
+        with patch('news_analyser.views.events.subscribe', subscribed):
+            response = await self.async_client.get(
+                reverse('news_analyser:news_content_events', args=[self.news.id]))
+            body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+        self.assertTrue(body.startswith('event: content\n'))
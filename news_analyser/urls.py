@@ -1,18 +1,31 @@
-from django.urls import path
+from django.urls import include, path
 from .views import *
+from . import api
 app_name = "news_analyser"
 urlpatterns = [
     path("", SearchView.as_view(), name="search"),
     path("search/<int:news_id>/", search_result, name="search_results"),
     path("all_searches/", all_searches, name="all_searches"),
+    path("query/", query_view, name="query"),
     path("loading/<int:keyword_id>/", loading, name="loading"),
     path("status/<int:keyword_id>/", task_status, name="task_status"),
+    path("jobs/<int:job_id>/", search_job_loading, name="search_job_loading"),
+    path("jobs/<int:job_id>/status/", search_job_status, name="search_job_status"),
+    path("jobs/<int:job_id>/events/", search_job_events, name="search_job_events"),
+    path("jobs/<int:job_id>/results/", search_job_results, name="search_job_results"),
     path("sector/", SectorView.as_view(), name="sector"),
     path("news_analysis/<int:news_id>/",
          NewsAnalysisView.as_view(), name="news_analysis"),
     path("news_analysis/<int:news_id>/get_content/",
          get_content, name="get_content"),
+    path("news_analysis/<int:news_id>/content/events/",
+         news_content_events, name="news_content_events"),
     path("settings/", user_settings, name="user_settings"),
     path("past_searches/", past_searches, name="past_searches"),
     path("add_stocks/", add_stocks, name="add_stocks"),
+    path("portfolio/", portfolio_view, name="portfolio"),
+    path("alerts/", alerts_view, name="alerts"),
+    path("stocks/typeahead/", stock_typeahead, name="stock_typeahead"),
+    path("metrics/", metrics_view, name="metrics"),
+    path("api/v1/", include((api.urlpatterns, "api"))),
 ]
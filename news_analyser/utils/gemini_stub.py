@@ -0,0 +1,267 @@
+"""
+Local stand-in for the Gemini ``generateContent`` REST endpoint.
+
+Load testing ``analyse_news_task`` against the real API burns quota, and
+mocking ``genai.Client`` hides everything between the SDK and the network.
+This module runs a small threaded HTTP server that speaks the same wire
+protocol as ``generativelanguage.googleapis.com``: it accepts
+``POST /v1beta/models/<model>:generateContent`` and answers with a
+well-formed candidate carrying valid analysis JSON.
+
+Latency and failures are injected according to a ``GeminiStubConfig``:
+
+- latency drawn from a fixed, uniform, normal or log-normal distribution
+- configurable 429 (quota), 403 (auth) and 500 (server) error rates
+- a rate of malformed model output (truncated JSON, prose, markdown fences)
+- a set of API keys that are always rate limited, to exercise key failover
+
+Point the app at it with ``GEMINI_BASE_URL=http://127.0.0.1:8089`` and run
+it with ``python manage.py run_gemini_stub``.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import FrozenSet, Optional
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+IMPACT_TIMELINES = ('immediate', 'short-term', 'medium-term', 'long-term')
+
+_GENERATE_PATH_RE = re.compile(r'^/(v1\w*)/models/([^/:]+):generateContent$')
+_TITLE_RE = re.compile(r'^Title:\s*(.*)$', re.MULTILINE)
+_TICKER_RE = re.compile(r'\b[A-Z][A-Z0-9&]{2,19}\b')
+
+_ERRORS = {
+    429: ('RESOURCE_EXHAUSTED', 'Resource has been exhausted (e.g. check quota).'),
+    403: ('PERMISSION_DENIED', 'Method doesn\'t allow unregistered callers.'),
+    500: ('INTERNAL', 'An internal error has occurred.'),
+}
+
+
+@dataclass
+class GeminiStubConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Attributes:
+        latency (str): One of ``LATENCY_DISTRIBUTIONS``
+        latency_ms (float): Fixed latency, or the mean for normal/lognormal
+        latency_jitter_ms (float): Spread (uniform half-width or std dev)
+        rate_429 (float): Probability of a quota error
+        rate_403 (float): Probability of an authentication error
+        rate_500 (float): Probability of an internal server error
+        rate_malformed (float): Probability of unparseable model output
+        exhausted_keys (frozenset): API keys that always receive a 429
+        seed (int): Optional seed for reproducible runs
+    """
+    latency: str = 'fixed'
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_403: float = 0.0
+    rate_500: float = 0.0
+    rate_malformed: float = 0.0
+    exhausted_keys: FrozenSet[str] = field(default_factory=frozenset)
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {self.latency!r}, "
+                f"expected one of {LATENCY_DISTRIBUTIONS}"
+            )
+        total = self.rate_429 + self.rate_403 + self.rate_500
+        if not 0 <= total <= 1:
+            raise ValueError(f"Error rates must sum to a value in [0, 1], got {total}")
+
+
+class GeminiStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stub configuration and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config=None):
+        super().__init__(address, GeminiStubHandler)
+        self.config = config or GeminiStubConfig()
+        self.rng = random.Random(self.config.seed)
+        self.rng_lock = threading.Lock()
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, outcome):
+        with self.stats_lock:
+            self.stats[outcome] += 1
+
+    def sample_latency(self):
+        """Draw a response delay in seconds from the configured distribution."""
+        cfg = self.config
+        with self.rng_lock:
+            if cfg.latency == 'uniform':
+                ms = self.rng.uniform(cfg.latency_ms - cfg.latency_jitter_ms,
+                                      cfg.latency_ms + cfg.latency_jitter_ms)
+            elif cfg.latency == 'normal':
+                ms = self.rng.gauss(cfg.latency_ms, cfg.latency_jitter_ms)
+            elif cfg.latency == 'lognormal' and cfg.latency_ms > 0:
+                # Parameterise so the distribution has the requested mean/std
+                mean, std = cfg.latency_ms, cfg.latency_jitter_ms
+                sigma2 = math.log(1 + (std / mean) ** 2)
+                mu = math.log(mean) - sigma2 / 2
+                ms = self.rng.lognormvariate(mu, sigma2 ** 0.5)
+            else:
+                ms = cfg.latency_ms
+        return max(ms, 0.0) / 1000.0
+
+    def pick_outcome(self, api_key):
+        """Decide whether this request fails, and how."""
+        if api_key in self.config.exhausted_keys:
+            return 429
+        cfg = self.config
+        with self.rng_lock:
+            roll = self.rng.random()
+            malformed_roll = self.rng.random()
+        for code, rate in ((429, cfg.rate_429), (403, cfg.rate_403), (500, cfg.rate_500)):
+            if roll < rate:
+                return code
+            roll -= rate
+        if malformed_roll < cfg.rate_malformed:
+            return 'malformed'
+        return 200
+
+    def fake_analysis(self, prompt):
+        """Build a deterministic analysis payload for a prompt."""
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        sentiment = round((digest[0] / 255.0) * 2 - 1, 2)
+        confidence = round(0.5 + (digest[1] / 255.0) * 0.5, 2)
+        title_match = _TITLE_RE.search(prompt)
+        title = title_match.group(1).strip() if title_match else ''
+        tickers = sorted(set(_TICKER_RE.findall(title)))[:5]
+        return {
+            'sentiment': sentiment,
+            'confidence': confidence,
+            'explanation': f"Stub analysis for: {title[:80] or 'untitled article'}",
+            'tickers': tickers,
+            'impact_timeline': IMPACT_TIMELINES[digest[2] % len(IMPACT_TIMELINES)],
+        }
+
+    def malformed_text(self, analysis):
+        """Return one of several realistic ways a model breaks JSON output."""
+        body = json.dumps(analysis)
+        with self.rng_lock:
+            variant = self.rng.randrange(3)
+        if variant == 0:
+            return body[: len(body) // 2]
+        if variant == 1:
+            return f"Here is my analysis of the article:\n{body}\nLet me know if you need more."
+        return f"```json\n{body}\n```\nSentiment looks {'positive' if analysis['sentiment'] > 0 else 'negative'}."
+
+
+class GeminiStubHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the ``generateContent`` wire protocol."""
+
+    server_version = 'GeminiStub/1.0'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code):
+        status, message = _ERRORS[code]
+        self._send_json(code, {'error': {'code': code, 'message': message, 'status': status}})
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            with self.server.stats_lock:
+                stats = dict(self.server.stats)
+            self._send_json(200, stats)
+            return
+        self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        match = _GENERATE_PATH_RE.match(path)
+        if not match:
+            self._send_json(404, {'error': {'code': 404, 'message': f'Unknown path {path}', 'status': 'NOT_FOUND'}})
+            return
+        model = match.group(2)
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send_json(400, {'error': {'code': 400, 'message': 'Invalid JSON payload', 'status': 'INVALID_ARGUMENT'}})
+            return
+
+        api_key = self.headers.get('x-goog-api-key', '')
+        time.sleep(self.server.sample_latency())
+
+        outcome = self.server.pick_outcome(api_key)
+        self.server.record(outcome)
+        if outcome in _ERRORS:
+            self._send_error(outcome)
+            return
+
+        prompt = '\n'.join(
+            part.get('text', '')
+            for content in request.get('contents', [])
+            for part in content.get('parts', [])
+        )
+        analysis = self.server.fake_analysis(prompt)
+        text = self.server.malformed_text(analysis) if outcome == 'malformed' else json.dumps(analysis)
+
+        prompt_tokens = max(len(prompt) // 4, 1)
+        output_tokens = max(len(text) // 4, 1)
+        self._send_json(200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+            }],
+            'usageMetadata': {
+                'promptTokenCount': prompt_tokens,
+                'candidatesTokenCount': output_tokens,
+                'totalTokenCount': prompt_tokens + output_tokens,
+            },
+            'modelVersion': model,
+        })
+
+
+def start_stub_server(host='127.0.0.1', port=0, config=None):
+    """
+    Start the stand-in server on a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 picks a free port
+        config (GeminiStubConfig): Latency and error behaviour
+
+    Returns:
+        GeminiStubServer: The running server; call ``shutdown()`` to stop it
+    """
+    server = GeminiStubServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Gemini stub listening on {server.base_url}")
+    return server
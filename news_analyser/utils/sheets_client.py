@@ -1,83 +1,418 @@
+"""
+Batched Google Sheets sync.
 
+Worksheets are built as 2-D arrays and pushed with a single
+``values:batchUpdate`` request. Only cells that differ from the last pushed
+snapshot are sent, so re-syncing unchanged data costs no write at all.
+The previous client wrote one cell per request and slept for a minute
+whenever it ran into the per-minute quota.
 
+A ``SheetsClient`` keeps the snapshot of every region it has pushed. The
+first time a process pushes a region, it reads that region once to seed
+the snapshot. A sync of several worksheets therefore costs at most one
+``values:batchGet`` and one ``values:batchUpdate``. Regions are bounded by
+column, so cells the sync does not own, such as the keywords users keep in
+column B, are never read back as stale or blanked.
 
-import gspread
-from google.oauth2.service_account import Credentials
-import os
-from dotenv import load_dotenv
-import time 
-load_dotenv()
-scopes = [
-    'https://www.googleapis.com/auth/spreadsheets',
-
-]
-creds = Credentials.from_service_account_file('./creds.json', scopes=scopes)
-client = gspread.authorize(creds)
-
-
-def get_details():
-    sheet_id = os.getenv('GOOGLE_SHEET_ID')
-    sheet = client.open_by_key(sheet_id)
-    values = sheet.sheet1.row_values(1)
-    cats = sheet.sheet1.col_values(1)[1:]
-    keywords = sheet.sheet1.col_values(2)[1:]
-    cat_kwd ={} # cat dict of the format: {cat:[kwd1, kwd2, kwd3]}
-
-    for n, i in enumerate(cats):
-        try:
-            cat_kwd[i] = list(keywords[n].split(','))
-        except IndexError:
-            cat_kwd[i] = []
-    return cat_kwd
-
-def write_news(cat_news=None):
-    # takes dict of format {cat:[n1, n2, n3]}
-
-    if cat_news is None:
-        cat_news = {
-    'Technology': ['Apple releases new iPhone', 'Tesla announces new EV', 'Google unveils AI updates'],
-    'Sports': ['Lakers win championship', 'World Cup final results', 'New NBA record set'],
-    'Finance': ['Stock market hits record high', 'Bitcoin surges', 'Fed adjusts interest rates']
+Nothing runs at import time. ``get_sheets_client`` builds the client from
+settings on first use:
+
+- ``GOOGLE_SHEET_ID``: spreadsheet to sync
+- ``GOOGLE_SHEETS_CREDENTIALS``: service-account key file
+- ``SHEETS_BASE_URL``: alternative endpoint, e.g. the local stand-in
+  started with ``python manage.py run_sheets_stub``; no credentials are
+  needed then
+"""
+
+import logging
+import re
+import time
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+
+from ..exceptions import SheetsAPIError, SheetsRateLimitError
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+DEFAULT_BASE_URL = 'https://sheets.googleapis.com'
+
+NEWS_SHEET = None  # The first worksheet
+SOURCES_SHEET = 'Config Data'
+LINKS_SHEET = 'News Links'
+# Last column a worksheet can have
+MAX_COLUMN = 'ZZZ'
+
+_CELL_RE = re.compile(r'^([A-Za-z]+)(\d+)$')
+
+
+def column_letter(column):
+    """
+    Convert a 1-based column number to its letters.
+
+    Args:
+        column (int): Column number, 1 for A
+
+    Returns:
+        str: Column letters, e.g. ``AA`` for 27
+    """
+    letters = ''
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def cell_a1(row, column):
+    """A1 notation of a 1-based cell position."""
+    return f"{column_letter(column)}{row}"
+
+
+def parse_cell(a1):
+    """
+    Parse a cell reference.
+
+    Args:
+        a1 (str): Cell in A1 notation, e.g. ``C2``
+
+    Returns:
+        tuple: ``(row, column)``, 1-based
+
+    Raises:
+        ValueError: If the reference is not a single cell
+    """
+    match = _CELL_RE.match(a1)
+    if not match:
+        raise ValueError(f"Not a cell reference: {a1!r}")
+    column = 0
+    for letter in match.group(1).upper():
+        column = column * 26 + ord(letter) - ord('A') + 1
+    return int(match.group(2)), column
+
+
+def sheet_range(sheet, a1=None):
+    """
+    Build a range, quoting the worksheet title.
+
+    Args:
+        sheet (str): Worksheet title, None for the first worksheet
+        a1 (str): Cells within the worksheet; None for the whole worksheet
+
+    Returns:
+        str: Range such as ``'News Links'!A2:C3``
+    """
+    if sheet is None:
+        return a1 or f'A1:{MAX_COLUMN}'
+    quoted = "'" + sheet.replace("'", "''") + "'"
+    return f"{quoted}!{a1}" if a1 else quoted
+
+
+def split_range(value):
+    """
+    Split a range into worksheet title and cells.
+
+    Args:
+        value (str): Range such as ``'News Links'!A2:C3`` or ``A2``
+
+    Returns:
+        tuple: ``(sheet, cells)``, either of which may be None
+    """
+    if '!' in value:
+        sheet, cells = value.rsplit('!', 1)
+    elif _CELL_RE.match(value.split(':', 1)[0]):
+        sheet, cells = None, value
+    else:
+        sheet, cells = value, None
+    if sheet and sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, cells
+
+
+def _cell_text(value):
+    return '' if value is None else str(value)
+
+
+def normalize_grid(grid):
+    """Rows of cell strings, with trailing empty cells and rows dropped as Sheets returns them."""
+    rows = []
+    for row in grid:
+        cells = [_cell_text(value) for value in row]
+        while cells and cells[-1] == '':
+            cells.pop()
+        rows.append(cells)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def diff_ranges(old, new):
+    """
+    Cells that must be written to turn one grid into another.
+
+    Cells that only ``old`` has are blanked. Runs of adjacent changed cells
+    in a row are merged into a single range.
+
+    Args:
+        old (list): Previously pushed rows
+        new (list): Rows to push
+
+    Returns:
+        list: ``(row_offset, column_offset, values)`` for each run, 0-based
+    """
+    runs = []
+    for row in range(max(len(old), len(new))):
+        before = old[row] if row < len(old) else []
+        after = new[row] if row < len(new) else []
+        run_start = None
+        # One column past the widest row, so a run reaching the edge is closed
+        for column in range(max(len(before), len(after)) + 1):
+            old_value = before[column] if column < len(before) else ''
+            new_value = after[column] if column < len(after) else ''
+            if old_value != new_value:
+                if run_start is None:
+                    run_start = column
+            elif run_start is not None:
+                runs.append((row, run_start, [
+                    after[index] if index < len(after) else '' for index in range(run_start, column)]))
+                run_start = None
+    return runs
+
+
+def parse_region(region):
+    """
+    Parse a column-bounded region.
+
+    Args:
+        region (str): Top-left cell and last column, e.g. ``C2:ZZZ``
+
+    Returns:
+        tuple: ``(top, left, right)``, 1-based
+
+    Raises:
+        ValueError: If the region is not of that form
+    """
+    start, _, end = region.partition(':')
+    top, left = parse_cell(start)
+    _, right = parse_cell(f"{end}1")
+    if right < left:
+        raise ValueError(f"Region ends before it starts: {region!r}")
+    return top, left, right
+
+
+class SheetsClient:
+    """
+    Client for one spreadsheet's values over the Sheets v4 REST API.
+
+    Args:
+        spreadsheet_id (str): Spreadsheet key
+        session (requests.Session): Session that adds credentials, e.g. an
+            ``AuthorizedSession``; a plain session for the stand-in
+        base_url (str): API endpoint
+        max_retries (int): Retries after a rate-limit response
+        retry_backoff (float): First retry delay in seconds, doubled each time
+    """
+
+    def __init__(self, spreadsheet_id, session=None, base_url=None, max_retries=3, retry_backoff=1.0):
+        self.spreadsheet_id = spreadsheet_id
+        self.session = session or requests.Session()
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._snapshots = {}
+
+    def _request(self, method, action, **kwargs):
+        url = f"{self.base_url}/v4/spreadsheets/{quote(self.spreadsheet_id, safe='')}/{action}"
+        for attempt in range(self.max_retries + 1):
+            response = self.session.request(method, url, timeout=30, **kwargs)
+            if response.status_code != 429:
+                break
+            if attempt == self.max_retries:
+                raise SheetsRateLimitError(f"Sheets API still rate limiting after {attempt} retries", 429)
+            retry_after = response.headers.get('Retry-After', '')
+            delay = self.retry_backoff * 2 ** attempt
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            logger.warning(f"Sheets API rate limited; retrying in {delay}s")
+            time.sleep(delay)
+        if response.status_code >= 400:
+            try:
+                message = response.json()['error']['message']
+            except (ValueError, KeyError, TypeError):
+                message = response.text[:200]
+            raise SheetsAPIError(f"Sheets API error {response.status_code}: {message}", response.status_code)
+        return response.json()
+
+    def batch_get(self, ranges):
+        """
+        Read several ranges in one request.
+
+        Args:
+            ranges (list): Ranges in A1 notation
+
+        Returns:
+            list: Rows of cell strings for each range, in order
+        """
+        data = self._request('GET', 'values:batchGet', params={'ranges': list(ranges)})
+        return [value_range.get('values', []) for value_range in data.get('valueRanges', [])]
+
+    def batch_update(self, data):
+        """
+        Write several ranges in one request.
+
+        Args:
+            data (list): ``(range, rows)`` pairs
+
+        Returns:
+            int: Number of cells the API reports as updated
+        """
+        if not data:
+            return 0
+        response = self._request('POST', 'values:batchUpdate', json={
+            'valueInputOption': 'RAW',
+            'data': [{'range': a1, 'majorDimension': 'ROWS', 'values': rows} for a1, rows in data],
+        })
+        return response.get('totalUpdatedCells', 0)
+
+    def sync(self, grids, refresh=False):
+        """
+        Push worksheet regions, sending only the cells that changed.
+
+        Each region is a column-bounded range such as ``C1:C`` (column C
+        from row 1 down) or ``C2:ZZZ`` (everything right of B from row 2).
+        Only cells inside it are read, compared and written, so columns
+        the sync does not own are never touched.
+
+        Args:
+            grids (dict): ``(sheet, region)`` to the rows to place with their
+                top-left cell at the start of ``region``
+            refresh (bool): Re-read the sheet instead of trusting snapshots,
+                e.g. after it was edited by hand
+
+        Returns:
+            int: Number of cells written
+
+        Raises:
+            ValueError: If a grid is wider than its region
+        """
+        grids = {key: normalize_grid(rows) for key, rows in grids.items()}
+        for (sheet, region), rows in grids.items():
+            _, left, right = parse_region(region)
+            if any(len(row) > right - left + 1 for row in rows):
+                raise ValueError(f"Rows do not fit in {sheet_range(sheet, region)}")
+
+        unknown = [key for key in grids if refresh or key not in self._snapshots]
+        if unknown:
+            current = self.batch_get([sheet_range(sheet, region) for sheet, region in unknown])
+            for key, rows in zip(unknown, current):
+                self._snapshots[key] = normalize_grid(rows)
+
+        updates = []
+        for (sheet, region), rows in grids.items():
+            top, left, _ = parse_region(region)
+            for row_offset, column_offset, values in diff_ranges(self._snapshots[(sheet, region)], rows):
+                row = top + row_offset
+                first = left + column_offset
+                updates.append((sheet_range(sheet, f"{cell_a1(row, first)}:{cell_a1(row, first + len(values) - 1)}"),
+                                [values]))
+
+        written = self.batch_update(updates)
+        self._snapshots.update(grids)
+        logger.info(f"Synced {len(grids)} ranges to sheet {self.spreadsheet_id}: "
+                    f"{len(updates)} changed runs, {written} cells written")
+        return written
+
+
+_client = None
+
+
+def get_sheets_client():
+    """
+    Return the process's client for ``GOOGLE_SHEET_ID``, creating it on first use.
+
+    Returns:
+        SheetsClient: The shared client
+    """
+    global _client
+    if _client is None:
+        if settings.SHEETS_BASE_URL:
+            session = requests.Session()
+        else:
+            from google.auth.transport.requests import AuthorizedSession
+            from google.oauth2.service_account import Credentials
+
+            session = AuthorizedSession(Credentials.from_service_account_file(
+                settings.GOOGLE_SHEETS_CREDENTIALS, scopes=SCOPES))
+        _client = SheetsClient(settings.GOOGLE_SHEET_ID, session=session,
+                               base_url=settings.SHEETS_BASE_URL,
+                               max_retries=settings.SHEETS_MAX_RETRIES)
+    return _client
+
+
+def category_regions(sheet, cat_items):
+    """
+    Lay out ``{category: [item, ...]}`` one category per row from row 2.
+
+    Categories go in column A and their items from column C on, the layout
+    of the news and links worksheets. Column B holds the keywords users
+    maintain by hand and is left alone.
+
+    Returns:
+        dict: Regions for ``SheetsClient.sync``
+    """
+    return {
+        (sheet, 'A2:A'): [[category] for category in cat_items],
+        (sheet, f'C2:{MAX_COLUMN}'): [list(items) for items in cat_items.values()],
     }
-    sheet_id = os.getenv('GOOGLE_SHEET_ID')
-    sheet = client.open_by_key(sheet_id)
-    #! sheet.sheet1.update_cell(1, 1, 'Category'), 1, 1 = first row, first column
-
-    for en, cat in enumerate(cat_news.keys()):
-        sheet.sheet1.update_cell(en+2, 1, cat)
-        for e, i in enumerate(cat_news[cat]):
-            sheet.sheet1.update_cell(en+2, e+3, i)
-        # sheet.sheet1.updatde_cell(en+t)
-        # sheet.sheet1.update__cell(en+1, 1, cat)
-    #     for n in news:
-    #         sheet.sheet1.append_row(['', n])
-
-
-write_news()
-
-def update_sources(sources):
-    sheet_id = os.getenv('GOOGLE_SHEET_ID')
-    wb = client.open_by_key(sheet_id)
-    sheet = wb.worksheet('Config Data')
-    sheet.update_cell(1, 3, 'Sources')
-    for n, source in enumerate(sources.keys()):
-        try:
-            sheet.update_cell(n+2,3, source)
-        except gspread.exceptions.APIError:
-            print("Pausing due to API Limit")
-            time.sleep(60)
-            sheet.update_cell(n+2,3, source)
-            continue
-
-    return True
-
-
-def write_links(kw_link):
-    sheet_id = os.getenv('GOOGLE_SHEET_ID')
-    wb = client.open_by_key(sheet_id)
-    sheet = wb.worksheet('News Links')
-
-    for en, cat in enumerate(kw_link.keys()):
-        sheet.update_cell(en+2, 1, cat)
-        for e, i in enumerate(kw_link[cat]):
-            sheet.update_cell(en+2, e+3, i)
+
+
+def get_details(client=None):
+    """
+    Read the categories and their keywords from the first worksheet.
+
+    Args:
+        client (SheetsClient): Client to use; defaults to ``get_sheets_client()``
+
+    Returns:
+        dict: ``{category: [keyword, ...]}``
+    """
+    client = client or get_sheets_client()
+    [rows] = client.batch_get([sheet_range(NEWS_SHEET, 'A2:B')])
+    return {
+        row[0]: [keyword for keyword in row[1].split(',')] if len(row) > 1 else []
+        for row in rows if row and row[0]
+    }
+
+
+def write_news(cat_news, client=None):
+    """
+    Write ``{category: [headline, ...]}`` to the first worksheet from row 2.
+
+    Returns:
+        int: Number of cells written
+    """
+    client = client or get_sheets_client()
+    return client.sync(category_regions(NEWS_SHEET, cat_news))
+
+
+def write_links(kw_link, client=None):
+    """
+    Write ``{keyword: [link, ...]}`` to the links worksheet from row 2.
+
+    Returns:
+        int: Number of cells written
+    """
+    client = client or get_sheets_client()
+    return client.sync(category_regions(LINKS_SHEET, kw_link))
+
+
+def update_sources(sources, client=None):
+    """
+    Write the source names under a ``Sources`` header in column C of the config worksheet.
+
+    Returns:
+        int: Number of cells written
+    """
+    client = client or get_sheets_client()
+    return client.sync({(SOURCES_SHEET, 'C1:C'): [['Sources']] + [[source] for source in sources]})
@@ -0,0 +1,243 @@
+"""
+Local stand-in for the Google Sheets v4 values API.
+
+Testing the Sheets sync against a real spreadsheet needs credentials and
+burns the per-minute write quota, and mocking the client hides the
+requests it actually sends. This module runs a small threaded HTTP server
+that keeps spreadsheets in memory and speaks the parts of the wire
+protocol ``SheetsClient`` uses:
+
+- ``GET /v4/spreadsheets/<id>/values:batchGet?ranges=...``
+- ``POST /v4/spreadsheets/<id>/values:batchUpdate``
+
+Spreadsheets and worksheets are created on first use. ``GET /stats`` counts
+the requests served by kind, so a test can assert how many API calls a
+sync made. Setting ``fail_next`` answers that many requests with a 429.
+
+Point the app at it with ``SHEETS_BASE_URL=http://127.0.0.1:8090`` and run
+it with ``python manage.py run_sheets_stub``.
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .sheets_client import cell_a1, sheet_range, split_range
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHEET = 'Sheet1'
+
+_PATH_RE = re.compile(r'^/v4/spreadsheets/([^/]+)/values:(batchGet|batchUpdate)$')
+_BOUND_RE = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def _bound(a1):
+    """Parse one end of a range into ``(row, column)``, None where open-ended."""
+    match = _BOUND_RE.match(a1 or '')
+    if not match:
+        raise ValueError(f"Unable to parse range: {a1}")
+    letters, digits = match.groups()
+    column = 0
+    for letter in letters.upper():
+        column = column * 26 + ord(letter) - ord('A') + 1
+    return (int(digits) if digits else None), (column or None)
+
+
+class SheetsStubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding spreadsheets in memory.
+
+    Args:
+        address (tuple): ``(host, port)`` to bind
+        fail_next (int): Number of upcoming requests to rate limit
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, fail_next=0):
+        super().__init__(address, SheetsStubHandler)
+        self.fail_next = fail_next
+        # spreadsheet ID -> worksheet title -> {(row, column): value}
+        self.spreadsheets = {}
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _worksheet(self, spreadsheet_id, sheet):
+        sheets = self.spreadsheets.setdefault(spreadsheet_id, {})
+        if sheet is None:
+            sheet = next(iter(sheets), DEFAULT_SHEET)
+        return sheet, sheets.setdefault(sheet, {})
+
+    def _resolve(self, spreadsheet_id, value):
+        sheet, cells = split_range(value)
+        sheet, cells_by_position = self._worksheet(spreadsheet_id, sheet)
+        start, _, end = (cells or '').partition(':')
+        top, left = _bound(start)
+        bottom, right = _bound(end or start) if (end or start) else (None, None)
+        return sheet, cells_by_position, (top or 1, left or 1, bottom, right)
+
+    def read(self, spreadsheet_id, value):
+        """
+        Values of a range, trimmed of trailing empty cells and rows like the real API.
+
+        Returns:
+            tuple: ``(range, rows)``
+        """
+        with self.lock:
+            sheet, cells, (top, left, bottom, right) = self._resolve(spreadsheet_id, value)
+            last_row = max((row for row, _ in cells), default=top)
+            last_column = max((column for _, column in cells), default=left)
+            bottom, right = bottom or last_row, right or last_column
+            rows = []
+            # Nothing lies beyond the last filled cell, however wide the range
+            for row in range(top, min(bottom, last_row) + 1):
+                values = [cells.get((row, column), '') for column in range(left, min(right, last_column) + 1)]
+                while values and values[-1] == '':
+                    values.pop()
+                rows.append(values)
+        while rows and not rows[-1]:
+            rows.pop()
+        return sheet_range(sheet, f"{cell_a1(top, left)}:{cell_a1(bottom, right)}"), rows
+
+    def write(self, spreadsheet_id, value, rows):
+        """
+        Write rows with their top-left cell at the start of a range.
+
+        Returns:
+            int: Number of cells written
+        """
+        written = 0
+        with self.lock:
+            _, cells, (top, left, _, _) = self._resolve(spreadsheet_id, value)
+            for row_offset, values in enumerate(rows):
+                for column_offset, cell in enumerate(values):
+                    position = (top + row_offset, left + column_offset)
+                    if cell in ('', None):
+                        cells.pop(position, None)
+                    else:
+                        cells[position] = str(cell)
+                    written += 1
+        return written
+
+    def values(self, spreadsheet_id, sheet=None):
+        """Every row of a worksheet from A1, for assertions; the first worksheet by default."""
+        with self.lock:
+            sheet = self._worksheet(spreadsheet_id, sheet)[0]
+        return self.read(spreadsheet_id, sheet_range(sheet))[1]
+
+    def record(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def take_failure(self):
+        with self.lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return True
+            return False
+
+
+class SheetsStubHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the values ``batchGet`` and ``batchUpdate`` wire protocol."""
+
+    server_version = 'SheetsStub/1.0'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code, status, message, headers=None):
+        self._send_json(code, {'error': {'code': code, 'message': message, 'status': status}}, headers)
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        if method == 'GET' and url.path.rstrip('/') == '/stats':
+            with self.server.lock:
+                stats = dict(self.server.stats)
+            self._send_json(200, stats)
+            return None
+        match = _PATH_RE.match(url.path)
+        expected = {'batchGet': 'GET', 'batchUpdate': 'POST'}
+        if not match or expected[match.group(2)] != method:
+            self._send_error(404, 'NOT_FOUND', f'Unknown path {url.path}')
+            return None
+        if self.server.take_failure():
+            self.server.record(429)
+            self._send_error(429, 'RESOURCE_EXHAUSTED', 'Quota exceeded.', headers={'Retry-After': '0'})
+            return None
+        self.server.record(match.group(2))
+        return unquote(match.group(1)), parse_qs(url.query)
+
+    def do_GET(self):
+        routed = self._route('GET')
+        if routed is None:
+            return
+        spreadsheet_id, query = routed
+        try:
+            value_ranges = []
+            for value in query.get('ranges', []):
+                a1, rows = self.server.read(spreadsheet_id, value)
+                value_ranges.append({'range': a1, 'majorDimension': 'ROWS', **({'values': rows} if rows else {})})
+        except ValueError as error:
+            self._send_error(400, 'INVALID_ARGUMENT', str(error))
+            return
+        self._send_json(200, {'spreadsheetId': spreadsheet_id, 'valueRanges': value_ranges})
+
+    def do_POST(self):
+        routed = self._route('POST')
+        if routed is None:
+            return
+        spreadsheet_id, _ = routed
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            written = ranges = 0
+            for value_range in request.get('data', []):
+                written += self.server.write(spreadsheet_id, value_range['range'], value_range.get('values', []))
+                ranges += 1
+        except (ValueError, KeyError) as error:
+            self._send_error(400, 'INVALID_ARGUMENT', f'Invalid request: {error}')
+            return
+        self._send_json(200, {
+            'spreadsheetId': spreadsheet_id,
+            'totalUpdatedCells': written,
+            'totalUpdatedRanges': ranges,
+        })
+
+
+def start_stub_server(host='127.0.0.1', port=0, fail_next=0):
+    """
+    Start the stand-in server on a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 picks a free port
+        fail_next (int): Number of upcoming requests to rate limit
+
+    Returns:
+        SheetsStubServer: The running server; call ``shutdown()`` to stop it
+    """
+    server = SheetsStubServer((host, port), fail_next=fail_next)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Sheets stub listening on {server.base_url}")
+    return server
@@ -1,26 +1,168 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.views import View
-from .rss import check_keywords
 from .models import News, Keyword
-from .tasks import analyse_news_task
-from .models import News, Keyword, UserProfile, Stock
+from .tasks import enqueue_analysis, request_content_extraction, run_search_job
+from .models import News, Keyword, UserProfile, Sector, Stock, SearchJob
 from django.utils import timezone
+from django.conf import settings
+from django.db.models import Avg, Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.template.loader import render_to_string
+from .exceptions import InvalidCursorError, QuerySyntaxError
+from .pagination import Page, cursor_for, paginate
+from .cache import get_keyword_results
+from .stock_index import get_stock_index
+from .content_store import stored_content
+from .sectors import sector_sentiment
+from .portfolio import portfolio_summary
+from .scoring import stock_scores
+from .query import is_boolean_query, search as run_query
+from urllib.parse import urlencode
+from . import metrics
+from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
-import asyncio
+from django.http import JsonResponse, StreamingHttpResponse, Http404
+from contextlib import aclosing
+import logging
+import redis
+from . import events
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
-from .forms import UserRegistrationForm, UserSettingsForm
+from .forms import SavedQueryForm, UserRegistrationForm, UserSettingsForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 
+logger = logging.getLogger(__name__)
+
+
+# Columns rendered by result.html; content and raw_gemini_response stay deferred
+RESULT_NEWS_FIELDS = (
+    "id", "keyword_id", "title", "content_summary", "link", "date",
+    "impact_rating", "analysis_status", "analysed_at", "source__name",
+)
+
+
+def group_news_by_keyword(keywords, page_size=None):
+    """
+    Map each keyword to the first page of its news with one query.
+
+    Args:
+        keywords (iterable): Keyword objects, in display order
+        page_size (int): Articles per keyword, defaults to RESULTS_PAGE_SIZE
+
+    Returns:
+        dict: Keyword to Page of News, newest first
+    """
+    page_size = page_size or settings.RESULTS_PAGE_SIZE
+    keywords = list(keywords)
+    by_id = {kwd.id: [] for kwd in keywords}
+    # Number each keyword's news newest first and keep one row past the page,
+    # which tells us whether the keyword has a next page
+    news = (
+        News.objects.filter(keyword_id__in=by_id)
+        .select_related("source")
+        .only(*RESULT_NEWS_FIELDS)
+        .annotate(row_number=Window(
+            RowNumber(), partition_by=F("keyword_id"),
+            order_by=[F("date").desc(), F("id").desc()]))
+        .filter(row_number__lte=page_size + 1)
+        .order_by("keyword_id", "-date", "-id")
+    )
+    for item in news:
+        by_id[item.keyword_id].append(item)
+
+    kw_link = {}
+    for kwd in keywords:
+        rows = by_id[kwd.id]
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            kw_link[kwd] = Page(rows, cursor_for(rows[-1], "date"))
+        else:
+            kw_link[kwd] = Page(rows, None)
+    return kw_link
+
+
+def sentiment_rollups(keywords):
+    """
+    Summarise the analysed sentiment of several keywords in one query.
+
+    Args:
+        keywords (iterable): Keyword objects
+
+    Returns:
+        dict: Keyword ID to counts and average sentiment
+    """
+    rollups = {kwd.id: {"analysed": 0, "avg_sentiment": None, "positive": 0, "negative": 0}
+               for kwd in keywords}
+    rows = (
+        News.objects.filter(keyword_id__in=rollups, analysis_status=News.AnalysisStatus.DONE)
+        .values("keyword_id")
+        .annotate(
+            analysed=Count("id"),
+            avg_sentiment=Avg("impact_rating"),
+            positive=Count("id", filter=Q(impact_rating__gt=0.3)),
+            negative=Count("id", filter=Q(impact_rating__lt=-0.3)),
+        )
+        .order_by()
+    )
+    for row in rows:
+        rollups[row.pop("keyword_id")] = row
+    return rollups
+
+
+def _build_keyword_results(keywords):
+    pages = group_news_by_keyword(keywords)
+    rollups = sentiment_rollups(keywords)
+    return {kwd: {"page": pages[kwd], "rollup": rollups[kwd.id]} for kwd in keywords}
+
+
+def cached_keyword_results(keywords):
+    """
+    First result page and sentiment rollup per keyword, from cache when possible.
+
+    The rollup is attached to each keyword as ``sentiment_rollup``.
+
+    Args:
+        keywords (iterable): Keyword objects, in display order
+
+    Returns:
+        dict: Keyword to Page of News
+    """
+    results = get_keyword_results(list(keywords), _build_keyword_results)
+    kw_link = {}
+    for kwd, data in results.items():
+        kwd.sentiment_rollup = data["rollup"]
+        kw_link[kwd] = data["page"]
+    return kw_link
+
+
+def _news_page_fragment(kwd, page):
+    html = render_to_string("news_analyser/_news_rows.html", {"news_list": page.object_list})
+    next_url = None
+    if page.next_cursor:
+        next_url = reverse("news_analyser:search_results", args=[kwd.id]) + \
+            f"?format=json&cursor={page.next_cursor}"
+    return JsonResponse({"html": html, "next_cursor": page.next_cursor, "next_url": next_url})
+
 
 @login_required
 def search_result(request, news_id=None):
     kwd = Keyword.objects.get(id=news_id)
-    kw_link = {kwd: kwd.news.all()}
+    cursor = request.GET.get("cursor")
+    if cursor or request.GET.get("format") == "json":
+        # Infinite-scroll fragment for the rows after the cursor
+        news = kwd.news.select_related("source").only(*RESULT_NEWS_FIELDS)
+        try:
+            page = paginate(news, cursor, settings.RESULTS_PAGE_SIZE)
+        except InvalidCursorError:
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+        if request.GET.get("format") == "json":
+            return _news_page_fragment(kwd, page)
+        kw_link = {kwd: page}
+    else:
+        kw_link = cached_keyword_results([kwd])
     if request.GET.get("pending"):
         messages.info(
             request, "Pending, all news are not analysed yet. Pls reload after a while")
@@ -36,90 +178,158 @@ class SearchView(LoginRequiredMixin, View):
     def post(self, request):
         search_type = request.POST.get("search_type")
         if search_type == "keyword":
-            kwds = request.POST.get("keyword").split(",")
+            raw = request.POST.get("keyword", "")
+            if is_boolean_query(raw):
+                # AND/OR/NOT queries run over already ingested news in one pass
+                return redirect(f"{reverse('news_analyser:query')}?{urlencode({'q': raw})}")
+            kwds = raw.split(",")
         else:
             stock_ids = request.POST.getlist("stocks")
             stocks = Stock.objects.filter(id__in=stock_ids)
             kwds = [stock.symbol for stock in stocks]
 
-        print(f"Search Type: {search_type}")
-        print(f"Keywords/Stocks: {kwds}")
-        
-        news = check_keywords(kwds)
-        kwd_link = {}
-        print("news found:", len(news))
-        
-        k_obj = None
-        for k, n in news.items():
-            print(f"Processing keyword: {k}")
-            k_obj, created = Keyword.objects.get_or_create(name=k)
-            request.user.profile.searches.add(k_obj)
-            if created:
-                k_obj.save()
-            for i in n:
-                n_obj = News.parse_news(i, k_obj)
-                kwd_link[k] = [n_obj] + kwd_link.get(k, [])
-
-        for k, n in kwd_link.items():
-            for i in n:
-                analyse_news_task.delay(i.id)
-                # print(i.impact_rating)
-
-        if k_obj:
-            print(f"Redirecting to results for keyword ID: {k_obj.id}")
-            return redirect(reverse("news_analyser:search_results", args=[k_obj.id]))
-        elif kwds and len(kwds) > 0:
-             # If we have keywords but no news found, we might still want to redirect 
-             # to a result page that says "No news found" or similar, 
-             # OR if we want to show the 'Analyzing' page, we need a valid k_obj.
-             # For now, let's try to find if the keyword object already exists even if no new news.
-             try:
-                 # Use the first keyword/stock symbol to find/create the object
-                 first_kwd = kwds[0]
-                 k_obj, _ = Keyword.objects.get_or_create(name=first_kwd)
-                 print(f"No new news, but redirecting to existing/new keyword ID: {k_obj.id}")
-                 return redirect(reverse("news_analyser:search_results", args=[k_obj.id]))
-             except Exception as e:
-                 print(f"Error getting keyword object: {e}")
-                 messages.info(request, "No news found for the given keywords.")
-                 return redirect(reverse("news_analyser:search"))
-        else:
-            print("No news found and no keywords provided.")
+        kwds = [k for k in kwds if k]
+        logger.debug(f"Search type {search_type}, keywords/stocks: {kwds}")
+
+        if not kwds:
+            logger.info("Search submitted without keywords")
             messages.info(request, "No news found for the given keywords.")
             return redirect(reverse("news_analyser:search"))
-# if there are multiple keywords, then the news should be the intersection of the news
+
+        # Feed fetching and ingest run in Celery so this request returns at once
+        job = SearchJob.objects.create(
+            user=request.user, query=",".join(kwds), search_type=search_type or "keyword")
+        run_search_job.delay(job.id, kwds)
+
+        logger.info(f"Queued search job {job.id} for {len(kwds)} keywords")
+        return redirect(reverse("news_analyser:search_job_loading", args=[job.id]))
 # implement asyn
 
 
+@login_required
+def query_view(request):
+    text = request.GET.get("q", "").strip()
+    results, error = [], None
+    if text:
+        try:
+            results = run_query(text)
+        except QuerySyntaxError as e:
+            error = str(e)
+    return render(request, "news_analyser/query.html", {"query": text, "results": results, "error": error})
+
+
 @login_required
 def all_searches(request):
-    kwds = request.user.profile.searches.all()
-    searches = {}
-    for kwd in kwds:
-        searches[kwd] = kwd.news.all()
-    return render(request, "news_analyser/result.html", {"kw_link": searches})
+    try:
+        history = paginate(
+            request.user.profile.searches.all(), request.GET.get("cursor"),
+            settings.HISTORY_PAGE_SIZE, field="create_date")
+    except InvalidCursorError:
+        return redirect(reverse("news_analyser:all_searches"))
+    searches = cached_keyword_results(history.object_list)
+    return render(request, "news_analyser/result.html", {
+        "kw_link": searches, "next_history_cursor": history.next_cursor})
 
 
 def loading(request, keyword_id):
-    return render(request, "news_analyser/loading.html", {"keyword_id": keyword_id})
+    return render(request, "news_analyser/loading.html", {
+        "status_url": reverse("news_analyser:task_status", args=[keyword_id]),
+        "results_url": reverse("news_analyser:search_results", args=[keyword_id]),
+    })
+
+
+@login_required
+def search_job_loading(request, job_id):
+    job = get_object_or_404(SearchJob, id=job_id, user=request.user)
+    return render(request, "news_analyser/loading.html", {
+        "status_url": reverse("news_analyser:search_job_status", args=[job.id]),
+        "events_url": reverse("news_analyser:search_job_events", args=[job.id]),
+        "results_url": reverse("news_analyser:search_job_results", args=[job.id]),
+    })
+
+
+@login_required
+def search_job_status(request, job_id):
+    # A single primary-key read; the counters are maintained by the tasks
+    job = get_object_or_404(SearchJob, id=job_id, user=request.user)
+    return JsonResponse(job.as_status_dict())
+
+
+async def _search_job_stream(job):
+    if job.is_finished:
+        yield events.format_sse(events.DONE_EVENT, job.as_status_dict())
+        return
+    try:
+        async with aclosing(events.subscribe(events.channel_name(job.id))) as stream:
+            async for item in stream:
+                if item is None:
+                    # Subscribed or idle: resync from the job row
+                    job = await SearchJob.objects.aget(pk=job.pk)
+                    event = events.DONE_EVENT if job.is_finished else events.PROGRESS_EVENT
+                    yield events.format_sse(event, job.as_status_dict())
+                else:
+                    event, data = item
+                    yield events.format_sse(event, data)
+                if event == events.DONE_EVENT:
+                    return
+    except redis.RedisError as e:
+        # Closing the stream makes the page fall back to polling
+        logger.warning(f"Event stream for search job {job.pk} unavailable: {e}")
+
+
+@login_required
+async def search_job_events(request, job_id):
+    user = await request.auser()
+    job = await SearchJob.objects.filter(id=job_id, user=user).afirst()
+    if job is None:
+        raise Http404("Search job not found")
+    response = StreamingHttpResponse(
+        _search_job_stream(job), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+def search_job_results(request, job_id):
+    job = get_object_or_404(SearchJob, id=job_id, user=request.user)
+    kw_link = cached_keyword_results(job.keywords.all())
+    return render(request, "news_analyser/result.html", {"kw_link": kw_link})
 
 
 def task_status(request, keyword_id):
-    keyword = Keyword.objects.get(id=keyword_id)
-    news = keyword.news.all()
+    news = News.objects.filter(keyword_id=keyword_id)
     total_news = news.count()
-    analysed_news = news.exclude(impact_rating=0).count()
+    # Served by the partial index on rows still waiting for analysis
+    unfinished_news = news.filter(analysis_status__in=News.UNFINISHED_STATUSES).count()
+    analysed_news = total_news - unfinished_news
     return JsonResponse({"total_news": total_news, "analysed_news": analysed_news})
 
 
 class SectorView(LoginRequiredMixin, View):
     def get(self, request):
-        return render(request, "news_analyser/sector.html")
+        context = {"sectors": Sector.objects.all()}
+        sector_id = request.GET.get("sector")
+        if sector_id:
+            sector = get_object_or_404(Sector, id=sector_id)
+            # Precomputed per-day rows; see sectors.index_news
+            daily = list(sector_sentiment(sector))
+            total = sum(row.news_count for row in daily)
+            context.update({
+                "sector": sector,
+                "daily": daily,
+                "total_news": total,
+                "avg_sentiment": sum(row.sentiment_sum for row in daily) / total if total else None,
+                "recent_news": News.objects.filter(
+                    sector_matches__sector=sector,
+                    analysis_status=News.AnalysisStatus.DONE,
+                ).select_related("source").only(*RESULT_NEWS_FIELDS).order_by('-date')[:settings.RESULTS_PAGE_SIZE],
+            })
+        return render(request, "news_analyser/sector.html", context)
 
     def post(self, request):
-        sector = request.POST.get("sector")
-        print(sector)
-        return render(request, "news_analyser/sector.html")
+        sector = get_object_or_404(Sector, id=request.POST.get("sector") or 0)
+        return redirect(f"{reverse('news_analyser:sector')}?sector={sector.id}")
 
 
 class NewsAnalysisView(LoginRequiredMixin, View):
@@ -129,21 +339,66 @@ class NewsAnalysisView(LoginRequiredMixin, View):
 
     def post(self, request, news_id):
         news = News.objects.get(id=news_id)
-        analyse_news_task.delay(news.id)
+        enqueue_analysis(news, force=True)
         return render(request, "news_analyser/news_analysis.html", {"news": news})
 
 
+def _content_status(news, queued=None):
+    status = 'done' if news.content else (queued or 'pending')
+    return {
+        "status": status,
+        "content": news.content,
+        "events_url": reverse('news_analyser:news_content_events', args=[news.id]),
+    }
+
+
 @csrf_exempt
 def get_content(request, news_id):
+    news = get_object_or_404(News, id=news_id)
     if request.method == "POST":
-        news = News.objects.get(id=news_id)
-        content = asyncio.run(news.get_content())
-        print(content['content'])
-        news.content = content['content']
-        news.save()
-        return JsonResponse({"message": "Content fetched successfully", "content": content})
-    else:
-        return render(request, "news_analyser/news_analysis.html", {"news": news})
+        if not news.content:
+            # Fetched recently for another article row or before a remove
+            content = stored_content(news.link)
+            if content:
+                news.content = content
+                news.save(update_fields=['content', 'updated_at'])
+        if news.content:
+            return JsonResponse(_content_status(news))
+        # Extraction runs on the content workers; the page listens for the result
+        queued = request_content_extraction(news)
+        return JsonResponse(
+            _content_status(news, 'queued' if queued else 'in_progress'), status=202)
+    return JsonResponse(_content_status(news))
+
+
+async def _news_content_stream(news_id):
+    try:
+        async with aclosing(events.subscribe(events.news_channel_name(news_id))) as stream:
+            async for item in stream:
+                if item is None:
+                    # Subscribed or idle: the content may have landed already
+                    news = await News.objects.only('content').aget(pk=news_id)
+                    if not news.content:
+                        yield ": waiting\n\n"
+                        continue
+                    data = {'status': 'done', 'length': len(news.content)}
+                else:
+                    _, data = item
+                yield events.format_sse(events.CONTENT_EVENT, data)
+                return
+    except redis.RedisError as e:
+        logger.warning(f"Content stream for news {news_id} unavailable: {e}")
+
+
+@login_required
+async def news_content_events(request, news_id):
+    if not await News.objects.filter(id=news_id).aexists():
+        raise Http404("News not found")
+    response = StreamingHttpResponse(
+        _news_content_stream(news_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def remove_content(request, news_id):
@@ -198,6 +453,70 @@ def add_stocks(request):
         messages.success(request, 'Your stock portfolio has been updated.')
         return redirect('news_analyser:add_stocks')
 
-    stocks = Stock.objects.all()
-    user_stocks = request.user.profile.stocks.values_list('id', flat=True)
-    return render(request, 'news_analyser/add_stocks.html', {'stocks': stocks, 'user_stocks': user_stocks})
+    # Only the portfolio is rendered; other stocks are found via the typeahead
+    user_stocks = request.user.profile.stocks.only('id', 'symbol', 'name')
+    return render(request, 'news_analyser/add_stocks.html', {'user_stocks': user_stocks})
+
+
+@login_required
+def portfolio_view(request):
+    summary = portfolio_summary(request.user)
+    scores = stock_scores(stock['id'] for stock in summary['stocks'])
+    for stock in summary['stocks']:
+        stock['signal'] = scores.get(stock['id'], {}).get('score')
+    if request.GET.get('format') == 'json':
+        return JsonResponse(summary)
+    return render(request, 'news_analyser/portfolio.html', {'summary': summary})
+
+
+@login_required
+def alerts_view(request):
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'read':
+            request.user.alerts.filter(read_at__isnull=True).update(read_at=timezone.now())
+        elif action == 'delete':
+            request.user.saved_queries.filter(id=request.POST.get('query_id')).delete()
+            messages.success(request, 'Saved query deleted.')
+        else:
+            form = SavedQueryForm(request.POST)
+            if form.is_valid():
+                query = form.save(commit=False)
+                query.user = request.user
+                query.save()
+                messages.success(request, f'Saved query "{query.name}" created.')
+            else:
+                for error in form.errors.values():
+                    messages.error(request, error.as_text())
+        return redirect('news_analyser:alerts')
+
+    try:
+        page = paginate(
+            request.user.alerts.select_related('news', 'saved_query'),
+            request.GET.get("cursor"), settings.ALERTS_PAGE_SIZE, field="created_at")
+    except InvalidCursorError:
+        return redirect('news_analyser:alerts')
+    return render(request, 'news_analyser/alerts.html', {
+        'alerts': page.object_list,
+        'next_cursor': page.next_cursor,
+        'unread': request.user.alerts.filter(read_at__isnull=True).count(),
+        'saved_queries': request.user.saved_queries.select_related('sector'),
+        'sectors': Sector.objects.only('id', 'name'),
+        'form': SavedQueryForm(),
+    })
+
+
+@login_required
+def stock_typeahead(request):
+    query = request.GET.get('q', '')
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), 50))
+    except ValueError:
+        limit = 10
+    results = get_stock_index().search(query, limit)
+    return JsonResponse({'query': query, 'results': [stock._asdict() for stock in results]})
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse(metrics.get_counts(*metrics.ALL_COUNTERS))